@@ -1,15 +1,30 @@
-from flask import Flask, request, jsonify
+from flask import Flask, request, jsonify, Response, stream_with_context
 from flask_cors import CORS
 from nqueens_env import NQueensEnv
-from qlearning import QLearningAgent
+from genetic import GeneticSolver
+from game_events import GameEventBroker
+from board_state import BoardState
+from opening_book import OpeningBooks
+from sessions import SessionRegistry, SessionLimitError
+from result_cache import ResultCache
+from solver_pool import SolverPool
+from jobs import JobManager, JobLimitError
+from solver_tasks import (SOLVERS, create_agent, qlearning_solver, run_qlearning, run_genetic,
+                          run_backtracking, run_minconflicts, run_backtracking_enumerate,
+                          solve_args, enumerate_args, cache_key, result_cost, format_result,
+                          ENUMERATE_MODES)
+from solver_frames import (backtracking_frames, genetic_frames, qlearning_frames,
+                           frame_score, frame_solved, sample_frames)
 import config
 import time
 import logging
 from json import JSONEncoder
 import numpy as np
 import random
-import tracemalloc
+import threading
+import json
 import uuid
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime
 
 class CustomJSONEncoder(JSONEncoder):
@@ -30,7 +45,8 @@ CORS(app, resources={
     r"/*": {
         "origins": ["http://localhost:5173", "http://127.0.0.1:5173"],
         "methods": ["GET", "POST", "OPTIONS", "PUT", "DELETE"],
-        "allow_headers": ["Content-Type", "Authorization"],
+        "allow_headers": ["Content-Type", "Authorization", config.SESSION_HEADER],
+        "expose_headers": [config.SESSION_HEADER],
         "supports_credentials": True
     }
 })
@@ -38,7 +54,7 @@ CORS(app, resources={
 @app.after_request
 def after_request(response):
     response.headers.add('Access-Control-Allow-Origin', 'http://localhost:5173')
-    response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
+    response.headers.add('Access-Control-Allow-Headers', f'Content-Type,Authorization,{config.SESSION_HEADER}')
     response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
     response.headers.add('Access-Control-Allow-Credentials', 'true')
     return response
@@ -46,13 +62,61 @@ def after_request(response):
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Global state
-env = None
-agent = None
-current_state = None
-history = []
-action_log = []
-start_time = None
+# Per-user simulations for /api/reset, /api/start and /api/step
+sessions = SessionRegistry()
+
+# Memoized solve results; only deterministic or explicitly seeded runs are cached
+result_cache = ResultCache()
+
+# Worker processes behind /api/jobs (and ASGI-mode solves), started on first use
+solver_pool = None
+job_manager = None
+_pool_lock = threading.Lock()
+
+def get_job_manager():
+    global solver_pool, job_manager
+    with _pool_lock:
+        if job_manager is None:
+            solver_pool = SolverPool()
+            job_manager = JobManager(solver_pool)
+        return job_manager
+
+def request_session_id():
+    """Session ID from the X-Session-ID header, the JSON body or the cookie"""
+    data = request.get_json(silent=True) or {}
+    return (request.headers.get(config.SESSION_HEADER) or data.get('sessionId')
+            or request.cookies.get(config.SESSION_COOKIE))
+
+def request_owner():
+    """Owner of pooled work: the caller's session if it exists in the
+    registry, otherwise its address, so made-up session IDs don't help"""
+    session = sessions.get(request_session_id())
+    return session.id if session is not None else request.remote_addr
+
+def pooled_solve(algorithm, kwargs):
+    """Run a solve in the shared worker pool and wait for it; the worker is
+    freed and FutureTimeoutError raised after SOLVE_TIMEOUT_SECONDS"""
+    pool = get_job_manager().pool
+    task = pool.submit(algorithm, kwargs, owner=request_owner())
+    try:
+        return task.wait(config.SOLVE_TIMEOUT_SECONDS)
+    except FutureTimeoutError:
+        pool.cancel(task)
+        raise
+
+def session_response(payload, session, status=200):
+    """JSON response that hands the session ID back in the body, header and cookie"""
+    response = jsonify(dict(payload, sessionId=session.id))
+    response.status_code = status
+    response.headers[config.SESSION_HEADER] = session.id
+    response.set_cookie(config.SESSION_COOKIE, session.id, max_age=int(config.SESSION_TTL_SECONDS),
+                        httponly=True, samesite='Lax')
+    return response
+
+def attacked_squares(env, data):
+    """Attacked squares in the format the client asked for: the default
+    {"r-c": true} dict, or one bitmask per row with attackedFormat='bitset'"""
+    return env.get_attacked_squares(compact=data.get('attackedFormat') == 'bitset')
 
 @app.route('/')
 def home():
@@ -64,10 +128,16 @@ def home():
             '/api/reset': 'POST - Reset simulation',
             '/api/start': 'POST - Start simulation',
             '/api/step': 'POST - Perform step',
+            '/api/steps': 'POST - Perform several steps in one request',
             '/api/config': 'GET - Get configuration',
             '/api/solve/qlearning': 'GET - Q-Learning solver',
             '/api/solve/genetic': 'GET - Genetic algorithm solver',
-            '/api/solve/backtracking': 'GET - Backtracking solver'
+            '/api/solve/backtracking': 'GET - Backtracking solver',
+            '/api/solve/minconflicts': 'GET - Min-conflicts solver for large boards',
+            '/api/solve/<algorithm>/stream': 'GET - Stream solver frames (NDJSON or SSE)',
+            '/api/multiplayer/events/<game_id>': 'GET - Game state push channel (SSE)',
+            '/api/jobs': 'POST - Queue a solve job',
+            '/api/jobs/<job_id>': 'GET - Job progress/result, DELETE - Cancel job'
         }
     })
 
@@ -86,7 +156,8 @@ def get_config():
         'BOARD_SIZE_MAX': config.BOARD_SIZE_MAX,
         'LEARNING_RATE': config.LEARNING_RATE,
         'DISCOUNT_FACTOR': config.DISCOUNT_FACTOR,
-        'EXPLORATION_RATE': config.EXPLORATION_RATE
+        'EXPLORATION_RATE': config.EXPLORATION_RATE,
+        'MIN_CONFLICTS_SIZE_MAX': config.MIN_CONFLICTS_SIZE_MAX
     })
 
 @app.route('/api/reset', methods=['POST', 'OPTIONS'])
@@ -94,38 +165,36 @@ def reset_simulation():
     if request.method == 'OPTIONS':
         return jsonify({'status': 'ok'}), 200
         
-    global env, agent, current_state, history, action_log, start_time
-    
     try:
-        data = request.get_json() or {}
+        data = request.get_json(silent=True) or {}
         board_size = data.get('size', config.BOARD_SIZE_MIN)
         board_size = max(config.BOARD_SIZE_MIN, min(board_size, config.BOARD_SIZE_MAX))
         
-        env = NQueensEnv(board_size)
-        agent = QLearningAgent(
-            state_space_size=board_size,
-            action_space_size=board_size,
-            learning_rate=config.LEARNING_RATE,
-            discount_factor=config.DISCOUNT_FACTOR,
-            exploration_rate=config.EXPLORATION_RATE
-        )
-        current_state = env.reset()
-        history = []
-        action_log = []
-        start_time = time.time()
-        
-        logger.info(f"Reset board: size={board_size}, queens={current_state}")
-        
-        return jsonify({
-            'status': 'reset',
-            'boardSize': board_size,
-            'queens': current_state,
-            'conflicts': env.get_conflicts(),
-            'attackedSquares': env.get_attacked_squares(),
-            'message': f'Reset successful for {board_size}x{board_size} board',
-            'step': 0
-        })
+        session = sessions.get_or_create(request_session_id())
+        with session.lock:
+            env = NQueensEnv(board_size)
+            agent = create_agent(
+                board_size, env,
+                learning_rate=config.LEARNING_RATE,
+                discount_factor=config.DISCOUNT_FACTOR,
+                exploration_rate=config.EXPLORATION_RATE
+            )
+            current_state = session.start(env, agent)
+            
+            logger.info(f"Reset board [{session.id}]: size={board_size}, queens={current_state}")
+            
+            return session_response({
+                'status': 'reset',
+                'boardSize': board_size,
+                'queens': current_state,
+                'conflicts': env.get_conflicts(),
+                'attackedSquares': attacked_squares(env, data),
+                'message': f'Reset successful for {board_size}x{board_size} board',
+                'step': 0
+            }, session)
         
+    except SessionLimitError as e:
+        return jsonify({'error': str(e), 'message': 'Reset failed'}), 503
     except Exception as e:
         logger.error(f"Reset error: {str(e)}")
         return jsonify({
@@ -136,8 +205,6 @@ def reset_simulation():
 
 @app.route('/api/start', methods=['POST'])
 def start_simulation():
-    global env, agent, current_state, history, start_time
-    
     try:
         data = request.get_json()
         board_size = data.get('boardSize', config.BOARD_SIZE_MIN)
@@ -147,29 +214,29 @@ def start_simulation():
 
         board_size = max(config.BOARD_SIZE_MIN, min(board_size, config.BOARD_SIZE_MAX))
 
-        env = NQueensEnv(board_size)
-        agent = QLearningAgent(
-            state_space_size=board_size,
-            action_space_size=board_size,
-            learning_rate=learning_rate,
-            discount_factor=discount_factor,
-            exploration_rate=exploration_rate
-        )
-        agent.env = env
-        current_state = env.reset()
-        start_time = time.time()
-        history = []
-
-        logger.info(f"Started simulation: size={board_size}, queens={current_state}")
-        
-        return jsonify({
-            'queens': current_state,
-            'conflicts': env.get_conflicts(),
-            'attackedSquares': env.get_attacked_squares(),
-            'message': f'Started {board_size}x{board_size} board',
-            'step': 0,
-            'done': False
-        })
+        session = sessions.get_or_create(request_session_id())
+        with session.lock:
+            env = NQueensEnv(board_size)
+            agent = create_agent(
+                board_size, env,
+                learning_rate=learning_rate,
+                discount_factor=discount_factor,
+                exploration_rate=exploration_rate
+            )
+            current_state = session.start(env, agent)
+
+            logger.info(f"Started simulation [{session.id}]: size={board_size}, queens={current_state}")
+            
+            return session_response({
+                'queens': current_state,
+                'conflicts': env.get_conflicts(),
+                'attackedSquares': attacked_squares(env, data),
+                'message': f'Started {board_size}x{board_size} board',
+                'step': 0,
+                'done': False
+            }, session)
+    except SessionLimitError as e:
+        return jsonify({'error': str(e)}), 503
     except Exception as e:
         logger.error(f"Start error: {str(e)}")
         return jsonify({'error': str(e)}), 500
@@ -179,62 +246,138 @@ def step_simulation():
     if request.method == 'OPTIONS':
         return jsonify({'status': 'ok'}), 200
         
-    global current_state, history, action_log
-    
-    if env is None or agent is None:
+    session = sessions.get(request_session_id())
+    if session is None or not session.initialized:
         logger.error("Step attempted without initialization")
         return jsonify({'error': 'Simulation not initialized'}), 400
 
+    data = request.get_json(silent=True) or {}
     try:
-        logger.info(f"Current state before step: {current_state}")
-        old_conflicts = env.get_conflicts()
-        
-        action = agent.choose_action(current_state)
-        logger.info(f"Chosen action: {action}")
-        
-        new_state, reward, done = env.step(action)
-        logger.info(f"New state: {new_state}, reward: {reward}, done: {done}")
+        with session.lock:
+            logger.debug(f"Current state before step: {session.current_state}")
+            record = advance_session(session)
+            env = session.env
+            logger.debug(f"Step {record['step']} completed: action={record['action']}, "
+                        f"queens={env.queens}, conflicts={record['conflicts']}, done={record['done']}")
+            
+            return session_response({
+                'queens': env.queens,
+                'conflicts': record['conflicts'],
+                'attackedSquares': attacked_squares(env, data),
+                'step': record['step'],
+                'reward': record['reward'],
+                'done': record['done'],
+                'message': record['message'],
+                'solutionFound': record['done'],
+                'timeElapsed': record['time_elapsed']
+            }, session)
 
-        agent.learn(current_state, action, reward, new_state, done)
-        current_state = new_state
+    except Exception as e:
+        logger.error(f"Step error: {str(e)}", exc_info=True)
+        return jsonify({'error': str(e)}), 500
 
-        step = len(history) + 1
-        time_elapsed = round(time.time() - start_time, 2)
-        new_conflicts = env.get_conflicts()
-        
-        message = (
-            f"Étape {step}: "
-            f"Déplacé reine rangée {action[0]} vers colonne {action[1]}. "
-            f"Conflits: {old_conflicts} → {new_conflicts}. "
-            f"Récompense: {reward:.2f}"
-        )
-
-        history.append({
-            'step': step,
-            'conflicts': new_conflicts,
-            'queens': env.queens.copy(),
-            'reward': reward,
-            'time_elapsed': time_elapsed,
-            'message': message
-        })
-        action_log.append(message)
+def advance_session(session):
+    """One learning step of a session's agent; caller holds session.lock"""
+    env, agent = session.env, session.agent
+    old_conflicts = env.get_conflicts()
+    
+    action = agent.choose_action(session.current_state)
+    new_state, reward, done = env.step(action)
+    agent.learn(session.current_state, action, reward, new_state, done)
+    session.current_state = new_state
+
+    step = len(session.history) + 1
+    time_elapsed = round(time.time() - session.start_time, 2)
+    new_conflicts = env.get_conflicts()
+    
+    message = (
+        f"Étape {step}: "
+        f"Déplacé reine rangée {action[0]} vers colonne {action[1]}. "
+        f"Conflits: {old_conflicts} → {new_conflicts}. "
+        f"Récompense: {reward:.2f}"
+    )
+
+    session.history.append({
+        'step': step,
+        'conflicts': new_conflicts,
+        'queens': env.queens.copy(),
+        'reward': reward,
+        'time_elapsed': time_elapsed,
+        'message': message
+    })
+    session.action_log.append(message)
+    return {
+        'step': step,
+        'action': action,
+        'reward': reward,
+        'done': done,
+        'conflicts': new_conflicts,
+        'time_elapsed': time_elapsed,
+        'message': message
+    }
+
+@app.route('/api/steps', methods=['POST', 'OPTIONS'])
+def steps_simulation():
+    """Advance a session by several steps in one request.
 
-        logger.info(f"Step {step} completed: action={action}, queens={env.queens}, conflicts={new_conflicts}")
+    Body: k (steps, capped at STEPS_BATCH_MAX), untilSolved (run up to the
+    cap), timeBudgetMs (wall-clock budget), attackedSquares ('final' or
+    'none') and attackedFormat ('bitset' for per-row masks). Stops early
+    once the board is solved. Each step is returned as a [row, col] move
+    plus its conflicts and reward; the full board and attacked squares are
+    only sent for the final state.
+    """
+    if request.method == 'OPTIONS':
+        return jsonify({'status': 'ok'}), 200
         
-        return jsonify({
-            'queens': env.queens,
-            'conflicts': new_conflicts,
-            'attackedSquares': env.get_attacked_squares(),
-            'step': step,
-            'reward': reward,
-            'done': done,
-            'message': message,
-            'solutionFound': done,
-            'timeElapsed': time_elapsed
-        })
+    session = sessions.get(request_session_id())
+    if session is None or not session.initialized:
+        return jsonify({'error': 'Simulation not initialized'}), 400
+
+    data = request.get_json(silent=True) or {}
+    try:
+        k = config.STEPS_BATCH_MAX if data.get('untilSolved') else data.get('k', config.STEPS_BATCH_DEFAULT)
+        k = max(1, min(int(k), config.STEPS_BATCH_MAX))
+        budget_ms = min(float(data.get('timeBudgetMs', config.STEPS_TIME_BUDGET_MAX_MS)),
+                        config.STEPS_TIME_BUDGET_MAX_MS)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'k and timeBudgetMs must be numbers'}), 400
+    attacked = data.get('attackedSquares', 'final')
+
+    try:
+        with session.lock:
+            deadline = time.monotonic() + budget_ms / 1000
+            moves, conflicts, rewards = [], [], []
+            record = None
+            for _ in range(k):
+                record = advance_session(session)
+                moves.append(list(record['action']))
+                conflicts.append(record['conflicts'])
+                rewards.append(record['reward'])
+                if record['done'] or time.monotonic() >= deadline:
+                    break
+            env = session.env
+            logger.info(f"Steps [{session.id}]: {len(moves)} steps to {record['step']}, "
+                        f"conflicts={record['conflicts']}, done={record['done']}")
+
+            result = {
+                'moves': moves,
+                'conflicts': conflicts,
+                'rewards': rewards,
+                'stepsTaken': len(moves),
+                'step': record['step'],
+                'queens': env.queens,
+                'done': record['done'],
+                'solutionFound': record['done'],
+                'message': record['message'],
+                'timeElapsed': record['time_elapsed']
+            }
+            if attacked == 'final':
+                result['attackedSquares'] = attacked_squares(env, data)
+            return session_response(result, session)
 
     except Exception as e:
-        logger.error(f"Step error: {str(e)}", exc_info=True)
+        logger.error(f"Steps error: {str(e)}", exc_info=True)
         return jsonify({'error': str(e)}), 500
 
 def count_conflicts(queens):
@@ -246,122 +389,26 @@ def count_conflicts(queens):
                 conflicts += 1
     return conflicts
 
-# Update the genetic_solve function
-def genetic_solve(n, population_size=100, max_generations=1000):
-    def fitness(individual):
-        return n - count_conflicts(individual)
-    
-    history = []
-    population = [random.sample(range(n), n) for _ in range(population_size)]
-    
-    for generation in range(max_generations):
-        # Track best individual each generation
-        best_individual = max(population, key=fitness)
-        history.append(best_individual.copy())
-        
-        if fitness(best_individual) == n:
-            return best_individual, generation+1, history
-            
-        # Selection and crossover
-        new_population = []
-        for _ in range(population_size):
-            parents = random.choices(
-                population,
-                weights=[fitness(ind) for ind in population],
-                k=2
-            )
-            crossover_point = random.randint(1, n-1)
-            child = parents[0][:crossover_point] + [
-                gene for gene in parents[1] if gene not in parents[0][:crossover_point]
-            ]
-            
-            # Mutation
-            if random.random() < 0.1:
-                i, j = random.sample(range(n), 2)
-                child[i], child[j] = child[j], child[i]
-                
-            new_population.append(child)
-            
-        population = new_population
-    
-    best_individual = max(population, key=fitness)
-    return best_individual, max_generations, history
+def cached_solve(algorithm, kwargs, compute):
+    """Run `compute` through the result cache when the result is reproducible.
 
-# Update the backtracking_solve function
-def backtracking_solve(n):
-    history = []
-    stack = [(0, [-1]*n, 0)]  # (row, queens, steps)
-    
-    while stack:
-        row, queens, steps = stack.pop()
-        history.append(queens.copy())
-        
-        if row == n:
-            return queens, steps, history
-            
-        for col in range(n-1, -1, -1):  # Try columns in reverse order
-            if all(col != queens[r] and abs(col - queens[r]) != abs(row - r) 
-                   for r in range(row)):
-                new_queens = queens.copy()
-                new_queens[row] = col
-                stack.append((row + 1, new_queens, steps + 1))
-    
-    return None, len(history), history
+    Returns (result, cached?). Unseeded stochastic runs always recompute.
+    """
+    key = cache_key(algorithm, kwargs)
+    if key is None:
+        return compute(), False
+    return result_cache.get_or_compute(key, compute,
+                                       cost=lambda result: result_cost(result, kwargs['n']))
 
 @app.route('/api/solve/qlearning', methods=['GET'])
 def solve_qlearning():
     try:
-        n = request.args.get('n', default=8, type=int)
-        n = max(config.BOARD_SIZE_MIN, min(n, config.BOARD_SIZE_MAX))
-
-        tracemalloc.start()
-        start_time = time.time()
-
-        # Initialize environment and agent
-        env = NQueensEnv(n)
-        agent = QLearningAgent(
-            state_space_size=n,
-            action_space_size=n,
-            learning_rate=config.LEARNING_RATE,
-            discount_factor=config.DISCOUNT_FACTOR,
-            exploration_rate=config.EXPLORATION_RATE
-        )
-        
-        # Add environment to agent if needed
-        if not hasattr(agent, 'env'):
-            agent.env = env
-
-        solution_history = [env.queens.copy()]
-        current_state = env.reset()
-        steps = 0
-        done = False
-        max_steps = 1000  # Prevent infinite loops
-
-        while not done and steps < max_steps:
-            action = agent.choose_action(current_state)
-            new_state, reward, done = env.step(action)
-            agent.learn(current_state, action, reward, new_state, done)
-            current_state = new_state
-            solution_history.append(env.queens.copy())
-            steps += 1
-
-            # Early exit if solution found
-            if env.get_conflicts() == 0:
-                done = True
-
-        current, peak = tracemalloc.get_traced_memory()
-        tracemalloc.stop()
-
-        return jsonify({
-            'solution': env.queens,
-            'solutionHistory': solution_history,
-            'steps': steps,
-            'time': round((time.time() - start_time) * 1000, 2),
-            'memory': round(peak / 1024, 2),
-            'conflicts': env.get_conflicts(),
-            'algorithm': 'Q-Learning',
-            'success': env.get_conflicts() == 0
-        })
+        try:
+            kwargs = solve_args('qlearning', request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e), 'success': False}), 400
+        result, cached = cached_solve('qlearning', kwargs, lambda: run_qlearning(**kwargs))
+        return jsonify(format_result('qlearning', result, cached, request.args))
 
     except Exception as e:
         logger.error(f"Q-Learning solve error: {str(e)}", exc_info=True)
@@ -375,26 +422,23 @@ def solve_qlearning():
 @app.route('/api/solve/genetic', methods=['GET'])
 def solve_genetic():
     try:
-        n = request.args.get('n', default=8, type=int)
-        tracemalloc.start()
-        start_time = time.time()
-        
-        solution, steps, history = genetic_solve(n)
-        conflicts = count_conflicts(solution) if solution else n*n
-        
-        current, peak = tracemalloc.get_traced_memory()
-        tracemalloc.stop()
-        
+        try:
+            kwargs = solve_args('genetic', request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e), 'success': False}), 400
+        if kwargs['islands'] > 1:
+            # Never fork island processes from this threaded server: the pool
+            # bounds them across requests and runs the islands in-process
+            compute = lambda: pooled_solve('genetic', kwargs)
+        else:
+            compute = lambda: run_genetic(**kwargs)
+        result, cached = cached_solve('genetic', kwargs, compute)
+        return jsonify(format_result('genetic', result, cached, request.args))
+    except FutureTimeoutError:
         return jsonify({
-            'solution': solution,
-            'solutionHistory': history,
-            'steps': steps,
-            'time': round((time.time() - start_time) * 1000, 2),
-            'memory': peak / 1024,
-            'conflicts': conflicts,
-            'algorithm': 'Genetic',
-            'success': conflicts == 0
-        })
+            'error': f'Solve exceeded {config.SOLVE_TIMEOUT_SECONDS}s',
+            'success': False
+        }), 504
     except Exception as e:
         return jsonify({
             'error': str(e),
@@ -406,26 +450,19 @@ def solve_genetic():
 @app.route('/api/solve/backtracking', methods=['GET'])
 def solve_backtracking():
     try:
-        n = request.args.get('n', default=8, type=int)
-        tracemalloc.start()
-        start_time = time.time()
-        
-        solution, steps, history = backtracking_solve(n)
-        conflicts = 0 if solution else n*n
-        
-        current, peak = tracemalloc.get_traced_memory()
-        tracemalloc.stop()
-        
-        return jsonify({
-            'solution': solution if solution else [-1]*n,
-            'solutionHistory': history,
-            'steps': steps,
-            'time': round((time.time() - start_time) * 1000, 2),
-            'memory': peak / 1024,
-            'conflicts': conflicts,
-            'algorithm': 'Backtracking',
-            'success': conflicts == 0
-        })
+        mode = request.args.get('mode', default='first')
+        try:
+            if mode in ENUMERATE_MODES:
+                kwargs = enumerate_args(request.args)
+            else:
+                kwargs = solve_args('backtracking', request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e), 'success': False}), 400
+        if mode in ENUMERATE_MODES:
+            return jsonify(run_backtracking_enumerate(**kwargs))
+
+        result, cached = cached_solve('backtracking', kwargs, lambda: run_backtracking(**kwargs))
+        return jsonify(format_result('backtracking', result, cached, request.args))
     except Exception as e:
         return jsonify({
             'error': str(e),
@@ -433,21 +470,190 @@ def solve_backtracking():
             'success': False
         }), 500
 
+def encode_frame(frame, event, fmt):
+    payload = json.dumps(frame, cls=CustomJSONEncoder)
+    if fmt == 'sse':
+        return f"event: {event}\ndata: {payload}\n\n"
+    return payload + "\n"
+
+@app.route('/api/solve/<algorithm>/stream', methods=['GET'])
+def stream_solve(algorithm):
+    """Stream solver frames as they are produced instead of a full history.
+
+    Query parameters: every (keep every k-th frame), only_improvements
+    (keep frames that lower conflicts / unplaced rows), format (ndjson or
+    sse). The last frame is always sent, followed by a summary with done=true.
+    """
+    fmt = request.args.get('format', default='ndjson')
+    every = max(1, request.args.get('every', default=1, type=int))
+    only_improvements = request.args.get(
+        'only_improvements', default=False, type=lambda v: v.lower() in ('1', 'true', 'yes'))
+    if fmt not in ('ndjson', 'sse'):
+        return jsonify({'error': f'Unknown format: {fmt}', 'success': False}), 400
+
+    try:
+        if algorithm == 'qlearning':
+            params = solve_args('qlearning', request.args)
+            n = params['n']
+            env, agent = qlearning_solver(n, params['backend'])
+            frames = qlearning_frames(env, agent, config.QLEARNING_SOLVE_MAX_STEPS)
+            name = 'Q-Learning'
+        elif algorithm == 'genetic':
+            params = solve_args('genetic', request.args)
+            n = params['n']
+            solver = GeneticSolver(n, params['population_size'],
+                                   selection=params['selection'], seed=params['seed'])
+            frames = genetic_frames(solver, params['max_generations'])
+            name = 'Genetic'
+        elif algorithm == 'backtracking':
+            n = solve_args('backtracking', request.args)['n']
+            frames = backtracking_frames(n)
+            name = 'Backtracking'
+        else:
+            return jsonify({'error': f'Unknown algorithm: {algorithm}', 'success': False}), 404
+    except ValueError as e:
+        return jsonify({'error': str(e), 'success': False}), 400
+    except Exception as e:
+        logger.error(f"Stream setup error: {str(e)}", exc_info=True)
+        return jsonify({'error': str(e), 'success': False}), 500
+
+    start_time = time.time()
+
+    def generate():
+        last = None
+        sent = 0
+        for frame in sample_frames(frames, every, only_improvements,
+                                   score=lambda f: frame_score(f, n)):
+            last = frame
+            sent += 1
+            yield encode_frame(frame, 'frame', fmt)
+        summary = {
+            'done': True,
+            'algorithm': name,
+            'solution': None,
+            'steps': 0,
+            'frames': sent,
+            'conflicts': None,
+            'success': False,
+            'time': round((time.time() - start_time) * 1000, 2)
+        }
+        if last is not None:
+            summary.update({
+                'solution': last['queens'],
+                'steps': last['step'],
+                'conflicts': last['conflicts'],
+                'success': frame_solved(last, n)
+            })
+        yield encode_frame(summary, 'done', fmt)
+
+    mimetype = 'text/event-stream' if fmt == 'sse' else 'application/x-ndjson'
+    response = Response(stream_with_context(generate()), mimetype=mimetype)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+@app.route('/api/solve/minconflicts', methods=['GET'])
+def solve_minconflicts():
+    try:
+        try:
+            kwargs = solve_args('minconflicts', request.args)
+        except ValueError as e:
+            return jsonify({'error': str(e), 'success': False}), 400
+        result, cached = cached_solve('minconflicts', kwargs, lambda: run_minconflicts(**kwargs))
+        return jsonify(format_result('minconflicts', result, cached, request.args))
+    except Exception as e:
+        logger.error(f"Min-conflicts solve error: {str(e)}", exc_info=True)
+        return jsonify({
+            'error': str(e),
+            'message': 'Min-conflicts failed',
+            'success': False
+        }), 500
+
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """Queue a solve in the worker pool and return its job ID right away.
+
+    Body: algorithm, n and the algorithm's query parameters (population,
+    generations, seed, ...), plus priority (0-JOBS_PRIORITY_MAX, higher
+    first). Jobs are owned as described in request_owner, so rotating
+    session IDs does not get around the per-owner limits.
+    """
+    data = request.get_json(silent=True) or {}
+    algorithm = data.get('algorithm')
+    if algorithm not in SOLVERS:
+        return jsonify({'error': f'Unknown algorithm: {algorithm}', 'success': False}), 400
+    try:
+        kwargs = solve_args(algorithm, data)
+        priority = max(0, min(int(data.get('priority', 0)), config.JOBS_PRIORITY_MAX))
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e), 'success': False}), 400
+
+    try:
+        job = get_job_manager().submit(algorithm, kwargs, priority, request_owner())
+    except JobLimitError as e:
+        return jsonify({'error': str(e), 'success': False}), 429
+    logger.info(f"Queued job {job.id}: {algorithm} n={kwargs['n']} priority={priority}")
+    response = jsonify(job.describe())
+    response.status_code = 202
+    response.headers['Location'] = f'/api/jobs/{job.id}'
+    return response
+
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Job state and progress; includes the solve result once done
+    (?format=compact applies as on the solve endpoints)"""
+    job = job_manager.get(job_id) if job_manager else None
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    body = job.describe()
+    if job.task.state == 'done':
+        body['result'] = format_result(job.task.algorithm, job.task.future.result(), False,
+                                       request.args)
+    return jsonify(body)
+
+@app.route('/api/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    job = job_manager.cancel(job_id) if job_manager else None
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(job.describe())
+
 
 # Multiplayer Game Endpoints
 active_games = {}
 leaderboard = []
+game_events = GameEventBroker()
+# Placement tables built offline by opening_book.py, mapped per size on first use
+opening_books = OpeningBooks()
+
+def game_snapshot(game):
+    """Client-visible state of a game, as served by /state and pushed by /events"""
+    return {
+        'players': [dict(player) for player in game['players']],
+        'queens': list(game['queens']),
+        'conflicts': game['conflicts'],
+        'current_turn': game['current_turn'],
+        'phase': game['phase'],
+        'placed_queens': game['placed_queens'],
+        'moves': game['moves'],
+        'board_size': game['board_size']
+    }
 
 @app.route('/api/multiplayer/create', methods=['POST'])
 def create_multiplayer_game():
     data = request.get_json()
     game_id = str(uuid.uuid4())
     board_size = data.get('size', 8)
+    board = BoardState(board_size)
     
     active_games[game_id] = {
         'players': [],
         'board_size': board_size,
-        'queens': [-1] * board_size,
+        # Same list as board.queens; only mutate it through `board`
+        'board': board,
+        'queens': board.queens,
         'current_turn': 0,
         'start_time': time.time(),
         'conflicts': 0,
@@ -502,6 +708,7 @@ def join_multiplayer_game(game_id):
     # Set initial turn to human player (0)
     if not is_ai:
         game['current_turn'] = 0
+    game_events.publish(game_id, game_snapshot(game))
     
     return jsonify({
         'player_id': player_id,
@@ -546,46 +753,27 @@ def get_game_state(game_id):
             'message': 'Game has concluded'
         }), 200
     
-    game = active_games[game_id]
-    return jsonify({
-        'players': game['players'],
-        'queens': game['queens'],
-        'conflicts': game['conflicts'],
-        'current_turn': game['current_turn'],
-        'phase': game['phase'],
-        'placed_queens': game['placed_queens'],
-        'moves': game['moves'],
-        'board_size': game['board_size']
-    })
-
-def count_conflicts(queens):
-    """Count the number of conflicts in the current board state"""
-    conflicts = 0
-    n = len(queens)
-    for i in range(n):
-        if queens[i] == -1:
-            continue
-        for j in range(i+1, n):
-            if queens[j] == -1:
-                continue
-            if queens[i] == queens[j] or abs(queens[i] - queens[j]) == abs(i - j):
-                conflicts += 1
-    return conflicts
+    return jsonify(game_snapshot(active_games[game_id]))
 
-
-def is_attacked(row, col, queens):
-    """Check if a square is under attack by any queen"""
-    for r, c in enumerate(queens):
-        if c == -1:
-            continue
-        if r == row or c == col or abs(r - row) == abs(c - col):
-            return True
-    return False
+@app.route('/api/multiplayer/events/<game_id>', methods=['GET'])
+def game_event_stream(game_id):
+    """Server-sent events: a full game_state snapshot, then diffs after every
+    move, then game_over. Replaces polling /api/multiplayer/state."""
+    game = active_games.get(game_id)
+    if game is None:
+        return jsonify({'error': 'Game not found'}), 404
+    subscriber = game_events.subscribe(game_id, game_snapshot(game))
+    response = Response(stream_with_context(game_events.stream(game_id, subscriber)),
+                        mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
 
 def get_ai_move(game_state, difficulty):
     """Generate AI move based on difficulty level"""
     params = ai_difficulties[difficulty]
     is_exploring = random.random() < params['exploration_rate']
+    board = game_state['board']
     
     if game_state['phase'] == 'placement':
         empty_rows = [r for r in range(game_state['board_size']) 
@@ -593,10 +781,24 @@ def get_ai_move(game_state, difficulty):
         
         if not empty_rows:
             return None
+
+        book = None
+        if not is_exploring and params['search_depth'] >= config.OPENING_BOOK_MIN_DEPTH:
+            book = opening_books.get(game_state['board_size'])
+        entry = book.lookup(board) if book else None
+        if entry and entry['move']:
+            row, col = entry['move']
+            return {
+                'type': 'place',
+                'row': row,
+                'col': col,
+                'is_exploring': False,
+                'message': f'AI played book move at ({row}, {col})'
+            }
             
         row = random.choice(empty_rows)
-        safe_cols = [c for c in range(game_state['board_size'])
-                    if not is_attacked(row, c, game_state['queens'])]
+        safe = board.safe_mask(row)
+        safe_cols = [c for c in range(game_state['board_size']) if safe >> c & 1]
         
         if safe_cols:
             col = random.choice(safe_cols)
@@ -607,22 +809,25 @@ def get_ai_move(game_state, difficulty):
                 'is_exploring': True,
                 'message': f'AI placed queen at ({row}, {col})'
             }
-        # Strategic placement
-        best_score = -1
+        # Strategic placement: prefer moves that don't leave an empty row
+        # without a safe square (checked search_depth - 1 placements deep),
+        # then the most safe squares left
+        depth = params['search_depth']
+        best_score = (False, -1)
         best_move = None
         
         for row in empty_rows:
+            safe = board.safe_mask(row)
             for col in range(game_state['board_size']):
-                if not is_attacked(row, col, game_state['queens']):
-                    new_queens = game_state['queens'].copy()
-                    new_queens[row] = col
-                    safe_squares = sum(
-                        1 for r in range(game_state['board_size'])
-                        for c in range(game_state['board_size'])
-                        if new_queens[r] == -1 and not is_attacked(r, c, new_queens)
-                    )
-                    if safe_squares > best_score:
-                        best_score = safe_squares
+                if safe >> col & 1:
+                    viable = True
+                    if depth > 1:
+                        after = board.copy()
+                        after.place(row, col)
+                        viable = after.viable(depth - 2)
+                    score = (viable, board.safe_after_place(row, col))
+                    if score > best_score:
+                        best_score = score
                         best_move = {'row': row, 'col': col}
         
         if best_move:
@@ -638,7 +843,7 @@ def get_ai_move(game_state, difficulty):
         conflicting_queens = [
             r for r in range(game_state['board_size']) 
             if game_state['queens'][r] != -1 and 
-            is_attacked(r, game_state['queens'][r], game_state['queens'])
+            board.is_attacked(r, game_state['queens'][r])
         ]
         
         if not conflicting_queens:
@@ -652,8 +857,9 @@ def get_ai_move(game_state, difficulty):
                     continue
                 if game_state['queens'][to_row] != -1:
                     continue
+                safe = board.safe_mask(to_row)
                 for to_col in range(game_state['board_size']):
-                    if not is_attacked(to_row, to_col, game_state['queens']):
+                    if safe >> to_col & 1:
                         valid_moves.append((to_row, to_col))
             
             if valid_moves:
@@ -677,12 +883,10 @@ def get_ai_move(game_state, difficulty):
                     continue
                 if game_state['queens'][to_row] != -1:
                     continue
+                safe = board.safe_mask(to_row)
                 for to_col in range(game_state['board_size']):
-                    if not is_attacked(to_row, to_col, game_state['queens']):
-                        new_queens = game_state['queens'].copy()
-                        new_queens[from_row] = -1
-                        new_queens[to_row] = to_col
-                        conflicts = count_conflicts(new_queens)
+                    if safe >> to_col & 1:
+                        conflicts = board.conflicts + board.move_delta(from_row, to_row, to_col)
                         if conflicts < best_score:
                             best_score = conflicts
                             best_move = {
@@ -740,13 +944,13 @@ def make_multiplayer_move(game_id):
             return jsonify({'error': 'Invalid position'}), 400
         if game['queens'][row] != -1:
             return jsonify({'error': 'Row already occupied'}), 400
-        if is_attacked(row, col, game['queens']):
+        if game['board'].is_attacked(row, col):
             return jsonify({'error': 'Position under attack'}), 400
         
         # Place the queen
-        game['queens'][row] = col
+        game['board'].place(row, col)
         game['placed_queens'] += 1
-        game['conflicts'] = count_conflicts(game['queens'])
+        game['conflicts'] = game['board'].conflicts
         game['moves'] += 1
         
         response['last_move'] = {
@@ -782,13 +986,12 @@ def make_multiplayer_move(game_id):
             return jsonify({'error': 'No queen in source row'}), 400
         if from_row != to_row and game['queens'][to_row] != -1:
             return jsonify({'error': 'Target row occupied'}), 400
-        if is_attacked(to_row, to_col, game['queens']):
+        if game['board'].is_attacked(to_row, to_col):
             return jsonify({'error': 'Target under attack'}), 400
         
         # Move the queen
-        game['queens'][from_row] = -1
-        game['queens'][to_row] = to_col
-        game['conflicts'] = count_conflicts(game['queens'])
+        game['board'].move(from_row, to_row, to_col)
+        game['conflicts'] = game['board'].conflicts
         game['moves'] += 1
         
         response['last_move'] = {
@@ -825,19 +1028,19 @@ def make_multiplayer_move(game_id):
             'queens': game['queens'],
             'phase': game['phase'],
             'placed_queens': game['placed_queens'],
-            'players': game['players']
+            'players': game['players'],
+            'board': game['board']
         }, difficulty)
         
         if ai_move:
             # Execute AI move
             if ai_move['type'] == 'place':
-                game['queens'][ai_move['row']] = ai_move['col']
+                game['board'].place(ai_move['row'], ai_move['col'])
                 game['placed_queens'] += 1
             else:
-                game['queens'][ai_move['from_row']] = -1
-                game['queens'][ai_move['to_row']] = ai_move['to_col']
+                game['board'].move(ai_move['from_row'], ai_move['to_row'], ai_move['to_col'])
             
-            game['conflicts'] = count_conflicts(game['queens'])
+            game['conflicts'] = game['board'].conflicts
             game['moves'] += 1
             
             response.update({
@@ -889,6 +1092,9 @@ def make_multiplayer_move(game_id):
             'final_time': solve_time,
             'final_moves': game['moves']
         })
+        game_events.finish(game_id, game_snapshot(game), response['winner'])
+    else:
+        game_events.publish(game_id, game_snapshot(game))
     
     return jsonify(response)
 
@@ -907,13 +1113,16 @@ def leave_game(game_id):
     # If no players left, remove the game
     if not game['players']:
         del active_games[game_id]
+        game_events.finish(game_id, game_snapshot(game), None)
         return jsonify({'status': 'game_removed'})
     
     # If human left, end the game
     if not any(not p['is_ai'] for p in game['players']):
         del active_games[game_id]
+        game_events.finish(game_id, game_snapshot(game), None)
         return jsonify({'status': 'game_ended'})
     
+    game_events.publish(game_id, game_snapshot(game))
     return jsonify({'status': 'player_left'})
 
 @app.route('/api/multiplayer/difficulty', methods=['GET'])
@@ -955,7 +1164,8 @@ def process_ai_move(game_id):
         'queens': game['queens'],
         'phase': game['phase'],
         'placed_queens': game['placed_queens'],
-        'players': game['players']
+        'players': game['players'],
+        'board': game['board']
     }, difficulty)
     
     if not ai_move:
@@ -963,13 +1173,12 @@ def process_ai_move(game_id):
     
     # Execute the move
     if ai_move['type'] == 'place':
-        game['queens'][ai_move['row']] = ai_move['col']
+        game['board'].place(ai_move['row'], ai_move['col'])
         game['placed_queens'] += 1
     else:
-        game['queens'][ai_move['from_row']] = -1
-        game['queens'][ai_move['to_row']] = ai_move['to_col']
+        game['board'].move(ai_move['from_row'], ai_move['to_row'], ai_move['to_col'])
     
-    game['conflicts'] = count_conflicts(game['queens'])
+    game['conflicts'] = game['board'].conflicts
     game['moves'] += 1
     
     # Check win conditions
@@ -1002,6 +1211,10 @@ def process_ai_move(game_id):
         })
     
     game['current_turn'] = 0  # Switch back to player
+    if response.get('done'):
+        game_events.finish(game_id, game_snapshot(game), response['winner'])
+    else:
+        game_events.publish(game_id, game_snapshot(game))
     
     return jsonify(response)
 
@@ -0,0 +1,194 @@
+# asgi.py
+"""ASGI serving mode.
+
+    uvicorn asgi:app --host 0.0.0.0 --port 5000
+
+Solver endpoints, including the backtracking count/all/canonical modes,
+are dispatched to a bounded SolverPool of worker processes with a
+per-request timeout (?timeout=, capped at SOLVE_TIMEOUT_MAX_SECONDS) and
+are cancelled when the client goes away. Pooled solves are owned by the
+caller's session (or address), so SOLVER_POOL_MAX_PER_OWNER applies as it
+does to /api/jobs. Cheap endpoints (/api/health, /api/multiplayer/state)
+and the /api/multiplayer/events push channel are served on the event
+loop, so open viewers don't hold Flask threads; everything else
+falls through to the Flask app, which runs in a thread pool. Run a single
+uvicorn worker: sessions and multiplayer games live in this process.
+
+Known gap: /api/solve/<algorithm>/stream and /api/steps still compute in
+those Flask threads, holding the GIL next to the event loop. Steps are
+bounded by STEPS_TIME_BUDGET_MAX_MS; streams are not, so put heavy
+streaming behind a separate process if cheap-endpoint latency matters.
+"""
+import asyncio
+import contextlib
+import time
+
+from a2wsgi import WSGIMiddleware
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Mount, Route
+
+import config
+import app as flask_app
+from solver_pool import SolverCancelled, SolverError
+from solver_tasks import (ENUMERATE_MODES, SOLVERS, cache_key, enumerate_args, format_result,
+                          result_cost, solve_args)
+
+wsgi = WSGIMiddleware(flask_app.app)
+# Shared with /api/jobs so both draw on the same solver capacity
+solver_pool = None
+
+
+class ClientDisconnected(Exception):
+    pass
+
+
+def with_cors(response: Response) -> Response:
+    """Same CORS headers as the Flask app's after_request hook"""
+    response.headers['Access-Control-Allow-Origin'] = 'http://localhost:5173'
+    response.headers['Access-Control-Allow-Headers'] = f'Content-Type,Authorization,{config.SESSION_HEADER}'
+    response.headers['Access-Control-Allow-Methods'] = 'GET,PUT,POST,DELETE,OPTIONS'
+    response.headers['Access-Control-Allow-Credentials'] = 'true'
+    return response
+
+
+def request_owner(request: Request):
+    """Pool owner of a request: its session if registered, else its address
+    (the same rule as /api/jobs, so made-up session IDs don't help)"""
+    session = flask_app.sessions.get(request.headers.get(config.SESSION_HEADER) or
+                                     request.cookies.get(config.SESSION_COOKIE))
+    if session is not None:
+        return session.id
+    return request.client.host if request.client else None
+
+
+async def run_solver(request: Request, algorithm: str, kwargs, timeout: float):
+    """Await a pooled solve; cancel it on timeout or client disconnect"""
+    task = solver_pool.submit(algorithm, kwargs, owner=request_owner(request))
+    result = asyncio.wrap_future(task.future)
+    deadline = time.monotonic() + timeout
+    try:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise asyncio.TimeoutError
+            done, _ = await asyncio.wait({result}, timeout=min(remaining, 0.25))
+            if done:
+                return result.result()
+            if await request.is_disconnected():
+                raise ClientDisconnected
+    except BaseException:
+        # Timeout, disconnect or the request being cancelled: free the worker
+        solver_pool.cancel(task)
+        result.cancel()
+        raise
+
+
+async def solve(request: Request, algorithm: str) -> Response:
+    args = request.query_params
+    try:
+        if algorithm == 'backtracking' and args.get('mode', 'first') in ENUMERATE_MODES:
+            algorithm, kwargs = 'backtracking_enumerate', enumerate_args(args)
+        else:
+            kwargs = solve_args(algorithm, args)
+    except ValueError as e:
+        return JSONResponse({'error': str(e), 'success': False}, status_code=400)
+    try:
+        timeout = float(args.get('timeout', config.SOLVE_TIMEOUT_SECONDS))
+    except ValueError:
+        timeout = config.SOLVE_TIMEOUT_SECONDS
+    timeout = min(timeout, config.SOLVE_TIMEOUT_MAX_SECONDS)
+
+    key = cache_key(algorithm, kwargs)
+    result = flask_app.result_cache.get(key) if key else None
+    if result is not None:
+        return JSONResponse(format_result(algorithm, result, True, args))
+
+    try:
+        result = await run_solver(request, algorithm, kwargs, timeout)
+    except asyncio.TimeoutError:
+        return JSONResponse({'error': f'Solve exceeded {timeout}s', 'success': False},
+                            status_code=504)
+    except ClientDisconnected:
+        return Response(status_code=499)
+    except SolverCancelled as e:
+        return JSONResponse({'error': str(e), 'success': False}, status_code=503)
+    except SolverError as e:
+        flask_app.logger.error(f"{algorithm} solve error: {e}")
+        return JSONResponse({'error': str(e), 'success': False}, status_code=500)
+
+    if key:
+        flask_app.result_cache.put(key, result, result_cost(result, kwargs['n']))
+    return JSONResponse(format_result(algorithm, result, False, args))
+
+
+class SolveEndpoint:
+    """/api/solve/<algorithm> through the pool; unknown algorithms go to Flask"""
+
+    async def __call__(self, scope, receive, send):
+        request = Request(scope, receive)
+        algorithm = request.path_params['algorithm']
+        if algorithm not in SOLVERS:
+            await wsgi(scope, receive, send)
+            return
+        response = with_cors(await solve(request, algorithm))
+        await response(scope, receive, send)
+
+
+async def health(request: Request) -> Response:
+    return with_cors(JSONResponse({
+        'status': 'healthy',
+        'version': '1.0.0',
+        'ready': True,
+        'solverWorkers': solver_pool.size if solver_pool else 0
+    }))
+
+
+async def game_state(request: Request) -> Response:
+    game = flask_app.active_games.get(request.path_params['game_id'])
+    if game is None:
+        # Return a special response indicating game ended
+        return with_cors(JSONResponse({'status': 'ended', 'message': 'Game has concluded'}))
+    return with_cors(JSONResponse(flask_app.game_snapshot(game)))
+
+
+async def game_event_stream(request: Request) -> Response:
+    """/api/multiplayer/events on the event loop (see app.game_event_stream)"""
+    game_id = request.path_params['game_id']
+    game = flask_app.active_games.get(game_id)
+    if game is None:
+        return with_cors(JSONResponse({'error': 'Game not found'}, status_code=404))
+    broker = flask_app.game_events
+    subscriber = broker.subscribe(game_id, flask_app.game_snapshot(game),
+                                  loop=asyncio.get_running_loop())
+    return with_cors(StreamingResponse(
+        broker.stream_async(game_id, subscriber), media_type='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}))
+
+
+@contextlib.asynccontextmanager
+async def lifespan(_):
+    global solver_pool
+    solver_pool = flask_app.get_job_manager().pool
+    try:
+        yield
+    finally:
+        solver_pool.shutdown()
+
+
+app = Starlette(
+    routes=[
+        Route('/api/health', health),
+        Route('/api/multiplayer/state/{game_id}', game_state),
+        Route('/api/multiplayer/events/{game_id}', game_event_stream),
+        Route('/api/solve/{algorithm}', SolveEndpoint()),
+        Mount('/', app=wsgi),
+    ],
+    lifespan=lifespan,
+)
+
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run(app, host='0.0.0.0', port=5000)
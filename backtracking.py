@@ -0,0 +1,88 @@
+from typing import Iterator, List, Optional, Tuple
+
+# Bitmask backtracking: bit c of `cols` is set when column c is taken, and
+# `ld` / `rd` hold the squares of the current row attacked along the two
+# diagonals (shifted by one column per row). Free squares of a row are
+# ~(cols | ld | rd) and are visited lowest set bit first, i.e. ascending
+# column order.
+
+
+def iter_nodes(n: int, first_row_mask: Optional[int] = None) -> Iterator[Tuple[int, List[int]]]:
+    """Depth-first search tree in pre-order, ascending columns.
+
+    Yields (depth, queens) for every node, starting with the empty board;
+    `queens` has the first `depth` rows placed and -1 elsewhere. The same
+    list object is reused and mutated between yields, so copy it to keep it.
+    `first_row_mask` restricts the columns tried in row 0.
+    """
+    queens = [-1] * n
+    yield 0, queens
+    if n == 0:
+        return
+    full = (1 << n) - 1
+    cols = [0] * n
+    ld = [0] * n
+    rd = [0] * n
+    avail = [0] * n
+    avail[0] = full if first_row_mask is None else full & first_row_mask
+    row = 0
+    while row >= 0:
+        free = avail[row]
+        if not free:
+            queens[row] = -1
+            row -= 1
+            continue
+        bit = free & -free
+        avail[row] = free ^ bit
+        queens[row] = bit.bit_length() - 1
+        yield row + 1, queens
+        if row + 1 < n:
+            c = cols[row] | bit
+            l = ((ld[row] | bit) << 1) & full
+            r = (rd[row] | bit) >> 1
+            cols[row + 1], ld[row + 1], rd[row + 1] = c, l, r
+            avail[row + 1] = full & ~(c | l | r)
+            row += 1
+
+
+def iter_solutions(n: int, first_row_mask: Optional[int] = None) -> Iterator[List[int]]:
+    """Stream every solution, in lexicographic order"""
+    for depth, queens in iter_nodes(n, first_row_mask):
+        if depth == n and n > 0:
+            yield queens.copy()
+
+
+def first_solution(n: int) -> Optional[List[int]]:
+    """Lexicographically first solution, or None if there is none"""
+    return next(iter_solutions(n), None)
+
+
+def _count(full: int, rows_left: int, cols: int, ld: int, rd: int) -> int:
+    free = full & ~(cols | ld | rd)
+    if rows_left == 1:
+        # Every free square of the last row completes a solution
+        return bin(free).count("1")
+    total = 0
+    while free:
+        bit = free & -free
+        free ^= bit
+        total += _count(full, rows_left - 1, cols | bit, ((ld | bit) << 1) & full, (rd | bit) >> 1)
+    return total
+
+
+def count_solutions(n: int) -> int:
+    """Number of solutions, exploiting the left/right mirror of the first row"""
+    if n <= 0:
+        return 0
+    if n == 1:
+        return 1
+    full = (1 << n) - 1
+    total = 0
+    for col in range(n // 2):
+        bit = 1 << col
+        total += _count(full, n - 1, bit, (bit << 1) & full, bit >> 1)
+    total *= 2
+    if n % 2:
+        bit = 1 << (n // 2)
+        total += _count(full, n - 1, bit, (bit << 1) & full, bit >> 1)
+    return total
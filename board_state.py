@@ -0,0 +1,137 @@
+from typing import List
+
+# Partially filled board for multiplayer games: queens[row] = column, or -1
+# for an empty row. Column and diagonal occupancy are kept both as counts
+# (for conflict deltas) and as bitmasks (for whole-row attack masks), using
+# the same layout as nqueens_env.attacked_row_masks: column c at bit c,
+# diagonal r-c at bit c-r+n-1 and anti-diagonal r+c at bit r+c. `key` has
+# bit r*n+c set for every queen, which identifies a placement-phase
+# position (see opening_book.py).
+
+
+class BoardState:
+    """Queens on a partially filled board with O(1) attack and conflict queries"""
+
+    def __init__(self, n: int):
+        self.n = n
+        self.queens: List[int] = [-1] * n
+        self.placed = 0
+        self.conflicts = 0
+        self.key = 0
+        self._col_counts = [0] * n
+        self._diag1_counts = [0] * (2 * n - 1)
+        self._diag2_counts = [0] * (2 * n - 1)
+        self._cols = self._diag1 = self._diag2 = 0
+
+    def copy(self) -> "BoardState":
+        board = BoardState.__new__(BoardState)
+        board.__dict__.update(self.__dict__)
+        for name in ('queens', '_col_counts', '_diag1_counts', '_diag2_counts'):
+            setattr(board, name, list(getattr(self, name)))
+        return board
+
+    def _update(self, row: int, col: int, step: int) -> None:
+        d1, d2 = col - row + self.n - 1, row + col
+        self._col_counts[col] += step
+        self._diag1_counts[d1] += step
+        self._diag2_counts[d2] += step
+        # Set the bit on 0 -> 1, clear it on 1 -> 0
+        if self._col_counts[col] == (step > 0):
+            self._cols ^= 1 << col
+        if self._diag1_counts[d1] == (step > 0):
+            self._diag1 ^= 1 << d1
+        if self._diag2_counts[d2] == (step > 0):
+            self._diag2 ^= 1 << d2
+
+    def attackers(self, row: int, col: int) -> int:
+        """Queens sharing a column or diagonal with (row, col); a queen on
+        that square counts itself three times"""
+        return (self._col_counts[col] + self._diag1_counts[col - row + self.n - 1] +
+                self._diag2_counts[row + col])
+
+    def is_attacked(self, row: int, col: int) -> bool:
+        """Whether a queen shares the square's row, column or a diagonal"""
+        return self.queens[row] != -1 or (
+            (self._cols >> col | self._diag1 >> (col - row + self.n - 1) |
+             self._diag2 >> (row + col)) & 1 == 1)
+
+    def safe_mask(self, row: int) -> int:
+        """Bitmask of the columns in `row` no queen attacks"""
+        if self.queens[row] != -1:
+            return 0
+        full = (1 << self.n) - 1
+        return ~(self._cols | self._diag1 >> (self.n - 1 - row) | self._diag2 >> row) & full
+
+    def place_delta(self, row: int, col: int) -> int:
+        """Change in conflicts if a queen were added at (row, col) of an empty row"""
+        return self.attackers(row, col)
+
+    def move_delta(self, from_row: int, to_row: int, to_col: int) -> int:
+        """Change in conflicts if the queen in `from_row` moved to (to_row, to_col)"""
+        from_col = self.queens[from_row]
+        removed = self.attackers(from_row, from_col) - 3
+        # Don't count the lifted queen against its own destination
+        added = (self.attackers(to_row, to_col) - (from_col == to_col) -
+                 (from_col - from_row == to_col - to_row) -
+                 (from_row + from_col == to_row + to_col))
+        return added - removed
+
+    def place(self, row: int, col: int) -> None:
+        self.conflicts += self.place_delta(row, col)
+        self._update(row, col, 1)
+        self.queens[row] = col
+        self.placed += 1
+        self.key |= 1 << (row * self.n + col)
+
+    def remove(self, row: int) -> None:
+        col = self.queens[row]
+        self._update(row, col, -1)
+        self.conflicts -= self.attackers(row, col)
+        self.queens[row] = -1
+        self.placed -= 1
+        self.key &= ~(1 << (row * self.n + col))
+
+    def move(self, from_row: int, to_row: int, to_col: int) -> None:
+        self.remove(from_row)
+        self.place(to_row, to_col)
+
+    def safe_after_place(self, row: int, col: int) -> int:
+        """Safe squares left in the other empty rows after placing at (row, col)"""
+        total = 0
+        for r in range(self.n):
+            if r == row or self.queens[r] != -1:
+                continue
+            d = r - row
+            # The new queen's column and diagonals as seen from row r
+            hits = 1 << col
+            if 0 <= col + d < self.n:
+                hits |= 1 << (col + d)
+            if 0 <= col - d < self.n:
+                hits |= 1 << (col - d)
+            total += bin(self.safe_mask(r) & ~hits).count('1')
+        return total
+
+    def safe_squares(self) -> int:
+        """Squares in empty rows that no queen attacks"""
+        return sum(bin(self.safe_mask(r)).count('1') for r in range(self.n))
+
+    def viable(self, depth: int) -> bool:
+        """Whether every empty row keeps a safe square for `depth` more
+        placements, branching on the most constrained row first. With depth
+        >= the number of empty rows this is exact solvability."""
+        masks = [(bin(self.safe_mask(r)).count('1'), r)
+                 for r in range(self.n) if self.queens[r] == -1]
+        if any(count == 0 for count, _ in masks):
+            return False
+        if depth <= 0 or not masks:
+            return True
+        _, row = min(masks)
+        safe = self.safe_mask(row)
+        for col in range(self.n):
+            if safe >> col & 1:
+                self.place(row, col)
+                found = self.viable(depth - 1)
+                self.remove(row)
+                if found:
+                    return True
+        return False
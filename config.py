@@ -5,4 +5,74 @@ DISCOUNT_FACTOR = 0.9
 EXPLORATION_RATE = 0.3
 EXPLORATION_DECAY = 0.995
 MIN_EXPLORATION_RATE = 0.01
-MAX_Q_TABLE_SIZE = 10000
\ No newline at end of file
+MAX_Q_TABLE_SIZE = 10000
+Q_TABLE_BACKEND = "dict"  # "dict" or "dense"
+DENSE_Q_CHUNK_STATES = 4096
+Q_TABLE_EVICTION_POLICY = "lru"  # "lru", "lfu" or "lowest_abs_q"
+QLEARNING_BACKEND = "python"  # "python" or "jax" for /api/solve/qlearning
+QLEARNING_SOLVE_MAX_STEPS = 1000  # rollout budget of /api/solve/qlearning
+JAX_TABULAR_MAX_STATES = 100000  # n <= 6 (a 6.7 MB table); larger boards use the MLP Q-network
+JAX_HIDDEN_SIZE = 128
+JAX_MLP_LEARNING_RATE = 1e-3
+JAX_NUM_ENVS = 256
+JAX_MAX_EPISODE_STEPS = 200
+JAX_PRETRAIN_STEPS = 500
+PARALLEL_WORKERS = 0  # 0 = one per CPU core
+PARALLEL_SHM_MAX_BYTES = 6 * 1024 ** 3
+PARALLEL_START_METHOD = None  # multiprocessing default
+Q_SNAPSHOT_DIR = "models"  # qtable_<n>.npq files loaded at startup
+BACKTRACKING_SIZE_MAX = 14  # count/all modes of /api/solve/backtracking; a first n=14 count takes seconds
+BACKTRACKING_SOLUTIONS_LIMIT = 1000  # default and maximum ?limit for mode=all/canonical
+SOLUTION_CACHE_MAX_N = 13  # larger n falls back to plain bitmask search
+MIN_CONFLICTS_SIZE_MIN = 4
+MIN_CONFLICTS_SIZE_MAX = 1000000  # /api/solve/minconflicts is not bound by BOARD_SIZE_MAX
+MIN_CONFLICTS_MAX_STEPS = 10000000
+MIN_CONFLICTS_MAX_RESTARTS = 100
+MIN_CONFLICTS_TAIL_ROWS = 32  # rows left to the repair phase after greedy placement
+MIN_CONFLICTS_GREEDY_TRIES = 64
+MIN_CONFLICTS_SWAP_TRIES = 64
+MIN_CONFLICTS_SOLUTION_MAX = 10000  # larger solutions are only returned on request
+GA_POPULATION_SIZE = 100
+GA_MAX_GENERATIONS = 1000
+GA_MUTATION_RATE = 0.1
+GA_SELECTION = "tournament"  # or "roulette"
+GA_TOURNAMENT_SIZE = 3
+GA_ELITE = 1
+GA_POPULATION_MAX = 100000  # caps the population query parameter
+GA_POPULATION_CELLS_MAX = 10_000_000  # caps population x n (x islands), i.e. genes held per generation
+GA_GENERATIONS_MAX = 10000
+GA_SIZE_MAX = 1000
+GA_ISLANDS = 4
+GA_ISLANDS_MAX = 32
+GA_MIGRATION_INTERVAL = 20  # generations between migrations
+GA_MIGRANTS = 2
+GA_TOPOLOGY = "ring"  # "ring", "all" or "random"
+GA_INBOX_SIZE = 64
+GA_ISLANDS_START_METHOD = "spawn"  # island processes outside the solver pool
+RESULT_CACHE_MAX_ENTRIES = 256
+RESULT_CACHE_MAX_COST = 20_000_000  # total history cells (boards x n) kept in memory
+RESULT_CACHE_PATH = None  # e.g. "models/results.json" to persist across restarts
+SESSION_MAX = 1000
+SESSION_TTL_SECONDS = 1800  # idle time before a simulation session is dropped
+SESSION_COOKIE = "nqueens_session"
+SESSION_HEADER = "X-Session-ID"
+STEPS_BATCH_DEFAULT = 50
+STEPS_BATCH_MAX = 10000  # steps per POST /api/steps
+STEPS_TIME_BUDGET_MAX_MS = 5000
+GAME_EVENTS_QUEUE_SIZE = 64  # pending messages per subscriber before it is dropped
+GAME_EVENTS_HEARTBEAT_SECONDS = 15
+SOLVER_POOL_WORKERS = 2  # solver processes for /api/jobs and ASGI-mode solves
+SOLVER_POOL_START_METHOD = "spawn"  # avoids forking a parent that has started threads
+SOLVER_POOL_POLL_SECONDS = 0.5
+SOLVER_POOL_MAX_PER_OWNER = 1  # running solves per job owner (session/client)
+SOLVER_POOL_PROGRESS_SECONDS = 0.2  # min interval between worker progress reports
+SOLVE_TIMEOUT_SECONDS = 30
+SOLVE_TIMEOUT_MAX_SECONDS = 120
+JOBS_MAX_STORED = 500  # finished jobs kept for GET /api/jobs/<id>
+JOBS_MAX_STORED_COST = 20_000_000  # total result cells (boards x n) of those jobs
+JOBS_MAX_QUEUED_PER_OWNER = 10
+JOBS_MAX_QUEUED = 200  # queued jobs across all owners
+JOBS_PRIORITY_MAX = 10
+OPENING_BOOK_DIR = "models"  # book_<n>.nqb files written by opening_book.py
+OPENING_BOOK_MAX_SIZE = 8
+OPENING_BOOK_MIN_DEPTH = 3  # AI search_depth from which placements come from the book
\ No newline at end of file
@@ -0,0 +1,152 @@
+import asyncio
+import json
+import queue
+import threading
+from typing import AsyncIterator, Dict, Iterator, List, Optional
+
+import config
+
+# Push channel for multiplayer games. Every subscriber gets a bounded queue
+# of messages shaped like the ones useWebSocket.js handles:
+#   {'type': 'game_state', 'state': {...changed keys...}, 'version': v, 'full': bool}
+#   {'type': 'game_over', 'state': {...}, 'winner': w}
+# A subscriber that falls behind is dropped; EventSource reconnects and the
+# new subscription starts from a full snapshot.
+
+
+class AsyncSubscriber(queue.Queue):
+    """Subscriber queue an event loop can await without a blocked thread:
+    every put, from whichever thread publishes, wakes the loop"""
+
+    def __init__(self, maxsize: int, loop: asyncio.AbstractEventLoop):
+        super().__init__(maxsize)
+        self._loop = loop
+        self._ready = asyncio.Event()
+
+    def _put(self, item) -> None:
+        super()._put(item)
+        self._loop.call_soon_threadsafe(self._ready.set)
+
+    async def get_async(self, timeout: float):
+        """Next message; raises asyncio.TimeoutError after `timeout` seconds"""
+        while True:
+            try:
+                return self.get_nowait()
+            except queue.Empty:
+                pass
+            self._ready.clear()
+            # A put between the first check and clear() would be missed
+            try:
+                return self.get_nowait()
+            except queue.Empty:
+                pass
+            await asyncio.wait_for(self._ready.wait(), timeout)
+
+
+def state_diff(old: Optional[Dict], new: Dict) -> Dict:
+    if old is None:
+        return dict(new)
+    return {key: value for key, value in new.items() if old.get(key) != value}
+
+
+class GameEventBroker:
+    """Fan-out of per-game state changes to subscribed clients"""
+
+    def __init__(self, queue_size: int = config.GAME_EVENTS_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, List[queue.Queue]] = {}
+        self._states: Dict[str, Dict] = {}
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, game_id: str, state: Optional[Dict] = None,
+                  loop: Optional[asyncio.AbstractEventLoop] = None) -> queue.Queue:
+        """New subscription, primed with a full snapshot when `state` is given.
+        Pass the running `loop` to read it with stream_async."""
+        subscriber = (queue.Queue(self.queue_size) if loop is None
+                      else AsyncSubscriber(self.queue_size, loop))
+        with self._lock:
+            self._subscribers.setdefault(game_id, []).append(subscriber)
+            if state is not None:
+                self._states[game_id] = dict(state)
+                subscriber.put_nowait({'type': 'game_state', 'state': dict(state),
+                                       'version': self._versions.get(game_id, 0), 'full': True})
+        return subscriber
+
+    def unsubscribe(self, game_id: str, subscriber: queue.Queue) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(game_id, [])
+            if subscriber in subscribers:
+                subscribers.remove(subscriber)
+            if not subscribers:
+                self._subscribers.pop(game_id, None)
+
+    def subscriber_count(self, game_id: str) -> int:
+        return len(self._subscribers.get(game_id, ()))
+
+    def publish(self, game_id: str, state: Dict) -> None:
+        """Broadcast the keys of `state` that changed since the last publish"""
+        with self._lock:
+            diff = state_diff(self._states.get(game_id), state)
+            self._states[game_id] = dict(state)
+            if not diff:
+                return
+            version = self._versions.get(game_id, 0) + 1
+            self._versions[game_id] = version
+            self._broadcast(game_id, {'type': 'game_state', 'state': diff,
+                                      'version': version, 'full': False})
+
+    def finish(self, game_id: str, state: Dict, winner: Optional[int]) -> None:
+        """Send game_over with the final state and forget the game"""
+        with self._lock:
+            self._broadcast(game_id, {'type': 'game_over', 'state': dict(state), 'winner': winner})
+            self._broadcast(game_id, None)  # end of stream
+            self._states.pop(game_id, None)
+            self._versions.pop(game_id, None)
+
+    def _broadcast(self, game_id: str, message: Optional[Dict]) -> None:
+        subscribers = self._subscribers.get(game_id, [])
+        for subscriber in list(subscribers):
+            try:
+                subscriber.put_nowait(message)
+            except queue.Full:
+                subscribers.remove(subscriber)
+                try:
+                    # Wake the reader so its stream closes and the client reconnects
+                    subscriber.get_nowait()
+                    subscriber.put_nowait(None)
+                except (queue.Empty, queue.Full):
+                    pass
+
+    def stream(self, game_id: str, subscriber: queue.Queue,
+               heartbeat: float = config.GAME_EVENTS_HEARTBEAT_SECONDS) -> Iterator[str]:
+        """Server-sent events for one subscriber, with keep-alive comments"""
+        try:
+            while True:
+                try:
+                    message = subscriber.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                if message is None:
+                    return
+                yield f"data: {json.dumps(message)}\n\n"
+        finally:
+            self.unsubscribe(game_id, subscriber)
+
+    async def stream_async(self, game_id: str, subscriber: AsyncSubscriber,
+                           heartbeat: float = config.GAME_EVENTS_HEARTBEAT_SECONDS) -> AsyncIterator[str]:
+        """stream() for an event loop; the subscription must come from
+        subscribe(..., loop=...)"""
+        try:
+            while True:
+                try:
+                    message = await subscriber.get_async(heartbeat)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if message is None:
+                    return
+                yield f"data: {json.dumps(message)}\n\n"
+        finally:
+            self.unsubscribe(game_id, subscriber)
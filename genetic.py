@@ -0,0 +1,163 @@
+from typing import Callable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import config
+from vec_env import batch_conflicts
+
+# The population is a [P, n] matrix of permutations (one row per
+# individual, queens[row] = column), so only diagonal conflicts can occur
+# and every genetic operator below works on whole generations at once.
+
+
+def population_conflicts(population: np.ndarray) -> np.ndarray:
+    """Attacking pairs of every individual, via per-row diagonal bincounts"""
+    return batch_conflicts(population)
+
+
+def tournament_select(conflicts: np.ndarray, count: int, size: int,
+                      rng: np.random.Generator) -> np.ndarray:
+    """Indices of `count` winners of `size`-way tournaments (fewest conflicts wins)"""
+    entrants = rng.integers(0, len(conflicts), size=(count, size))
+    winners = np.argmin(conflicts[entrants], axis=1)
+    return entrants[np.arange(count), winners]
+
+
+def roulette_select(conflicts: np.ndarray, n: int, count: int,
+                    rng: np.random.Generator) -> np.ndarray:
+    """Fitness-proportional selection with fitness = n - conflicts (floored at 1)"""
+    fitness = np.maximum(n - conflicts, 1).astype(float)
+    return rng.choice(len(conflicts), size=count, p=fitness / fitness.sum())
+
+
+def order_crossover(parents1: np.ndarray, parents2: np.ndarray,
+                    rng: np.random.Generator) -> np.ndarray:
+    """OX crossover: keep a random slice of parent 1 and fill the other
+    positions with parent 2's remaining genes in their original order"""
+    count, n = parents1.shape
+    rows = np.arange(count)[:, None]
+    cuts = np.sort(rng.integers(0, n + 1, size=(count, 2)), axis=1)
+    positions = np.arange(n)[None, :]
+    in_slice = (positions >= cuts[:, :1]) & (positions < cuts[:, 1:])
+
+    # Which genes parent 1 contributes, looked up for every gene of parent 2
+    taken = np.zeros((count, n), dtype=bool)
+    taken[np.broadcast_to(rows, (count, n))[in_slice], parents1[in_slice]] = True
+    keep = ~taken[rows, parents2]
+
+    # Stable sorts put kept parent-2 genes first, in order, and free
+    # positions first, in order; the tail lands on the slice and is
+    # overwritten by parent 1 below.
+    genes = np.take_along_axis(parents2, np.argsort(~keep, axis=1, kind='stable'), axis=1)
+    slots = np.argsort(in_slice, axis=1, kind='stable')
+    children = np.empty_like(parents1)
+    children[rows, slots] = genes
+    children[in_slice] = parents1[in_slice]
+    return children
+
+
+def swap_mutation(population: np.ndarray, rate: float,
+                  rng: np.random.Generator) -> np.ndarray:
+    """Swap two random genes in each individual with probability `rate`"""
+    count, n = population.shape
+    mutate = np.flatnonzero(rng.random(count) < rate)
+    i = rng.integers(0, n, size=len(mutate))
+    j = rng.integers(0, n, size=len(mutate))
+    population[mutate, i], population[mutate, j] = population[mutate, j], population[mutate, i]
+    return population
+
+
+class GeneticSolver:
+    """Generational GA over permutations with elitism"""
+
+    def __init__(self, n: int, population_size: int = config.GA_POPULATION_SIZE,
+                 mutation_rate: float = config.GA_MUTATION_RATE,
+                 selection: str = config.GA_SELECTION,
+                 tournament_size: int = config.GA_TOURNAMENT_SIZE,
+                 elite: int = config.GA_ELITE, seed: Optional[int] = None):
+        if n < 1:
+            raise ValueError(f"Board size must be positive, got {n}")
+        if selection not in ('tournament', 'roulette'):
+            raise ValueError(f"Unknown selection method: {selection}")
+        self.n = n
+        self.population_size = population_size
+        self.mutation_rate = mutation_rate
+        self.selection = selection
+        self.tournament_size = tournament_size
+        self.elite = min(elite, population_size)
+        self.rng = np.random.default_rng(seed)
+        self.population = self.random_population(population_size)
+        self.conflicts = population_conflicts(self.population)
+        self.generation = 0
+
+    def random_population(self, size: int) -> np.ndarray:
+        return np.argsort(self.rng.random((size, self.n)), axis=1).astype(np.int32)
+
+    def best(self) -> Tuple[List[int], int]:
+        index = int(np.argmin(self.conflicts))
+        return self.population[index].tolist(), int(self.conflicts[index])
+
+    def _select(self, count: int) -> np.ndarray:
+        if self.selection == 'tournament':
+            return tournament_select(self.conflicts, count, self.tournament_size, self.rng)
+        return roulette_select(self.conflicts, self.n, count, self.rng)
+
+    def evolve(self) -> None:
+        """Replace the population with the next generation"""
+        children_count = self.population_size - self.elite
+        parents1 = self.population[self._select(children_count)]
+        parents2 = self.population[self._select(children_count)]
+        children = swap_mutation(order_crossover(parents1, parents2, self.rng),
+                                 self.mutation_rate, self.rng)
+
+        elite = self.population[np.argsort(self.conflicts, kind='stable')[:self.elite]]
+        self.population = np.concatenate([elite, children])
+        self.conflicts = population_conflicts(self.population)
+        self.generation += 1
+
+    def top(self, count: int) -> np.ndarray:
+        """Copies of the `count` fittest individuals"""
+        return self.population[np.argsort(self.conflicts, kind='stable')[:count]].copy()
+
+    def immigrate(self, migrants: np.ndarray) -> None:
+        """Replace the least fit individuals with incoming migrants"""
+        migrants = migrants[:self.population_size]
+        if not len(migrants):
+            return
+        worst = np.argsort(self.conflicts, kind='stable')[len(self.conflicts) - len(migrants):]
+        self.population[worst] = migrants
+        self.conflicts[worst] = population_conflicts(migrants)
+
+    def iter_generations(self, max_generations: int = config.GA_MAX_GENERATIONS
+                         ) -> Iterator[Tuple[int, List[int], int]]:
+        """Yield (generation, best individual, its conflicts) until solved"""
+        for generation in range(max_generations):
+            best, conflicts = self.best()
+            yield generation + 1, best, conflicts
+            if conflicts == 0:
+                return
+            self.evolve()
+
+    def run(self, max_generations: int = config.GA_MAX_GENERATIONS,
+            record_history: bool = True,
+            progress: Optional[Callable[..., None]] = None) -> Tuple[List[int], int, List[List[int]]]:
+        """Evolve until a zero-conflict board appears, calling
+        progress(steps=generation, conflicts=best conflicts) each generation.
+
+        Returns (best individual, generations used, best-per-generation history).
+        """
+        history = []
+        for generation, best, conflicts in self.iter_generations(max_generations):
+            if record_history:
+                history.append(best)
+            if progress:
+                progress(steps=generation, conflicts=conflicts)
+            if conflicts == 0:
+                return best, generation, history
+        return self.best()[0], max_generations, history
+
+
+def genetic_solve(n: int, population_size: int = config.GA_POPULATION_SIZE,
+                  max_generations: int = config.GA_MAX_GENERATIONS,
+                  seed: Optional[int] = None, **params) -> Tuple[List[int], int, List[List[int]]]:
+    solver = GeneticSolver(n, population_size, seed=seed, **params)
+    return solver.run(max_generations)
@@ -0,0 +1,66 @@
+import base64
+import sys
+from array import array
+from typing import Dict, List
+
+# Compact replay format for solution histories: the first board in full,
+# then for every following board the rows that changed, as a flat integer
+# stream  k, row_1, col_1, ..., row_k, col_k  packed into a little-endian
+# signed array ('b' while values fit in a byte, 'h' beyond) and base64'd.
+# Q-learning and backtracking change one row per step, so a step costs
+# three bytes instead of a full board.
+
+COMPACT_FORMAT = 'compact'
+
+
+def _typecode(n: int) -> str:
+    # Deltas hold row/column indices, -1 for empty rows and counts up to n
+    return 'b' if n <= 127 else 'h'
+
+
+def encode_history(history: List[List[int]]) -> Dict:
+    """Delta-encode a list of boards (all of the same size)"""
+    if not history:
+        return {'format': COMPACT_FORMAT, 'n': 0, 'length': 0, 'initial': [],
+                'typecode': 'b', 'deltas': ''}
+    initial = list(history[0])
+    n = len(initial)
+    values = array(_typecode(n))
+    previous = initial
+    for board in history[1:]:
+        changed = [row for row in range(n) if board[row] != previous[row]]
+        values.append(len(changed))
+        for row in changed:
+            values.append(row)
+            values.append(board[row])
+        previous = board
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return {
+        'format': COMPACT_FORMAT,
+        'n': n,
+        'length': len(history),
+        'initial': initial,
+        'typecode': values.typecode,
+        'deltas': base64.b64encode(values.tobytes()).decode('ascii')
+    }
+
+
+def decode_history(payload: Dict) -> List[List[int]]:
+    """Inverse of encode_history()"""
+    if not payload['length']:
+        return []
+    values = array(payload['typecode'])
+    values.frombytes(base64.b64decode(payload['deltas']))
+    if sys.byteorder == 'big':
+        values.byteswap()
+    board = list(payload['initial'])
+    history = [board.copy()]
+    i = 0
+    while i < len(values):
+        count = values[i]
+        for k in range(count):
+            board[values[i + 1 + 2 * k]] = values[i + 2 + 2 * k]
+        i += 1 + 2 * count
+        history.append(board.copy())
+    return history
@@ -0,0 +1,175 @@
+import multiprocessing as mp
+import queue
+import random
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import config
+from genetic import GeneticSolver
+
+TOPOLOGIES = ('ring', 'all', 'random')
+
+
+def _targets(island: int, islands: int, topology: str, rng: random.Random) -> List[int]:
+    """Islands that receive migrants from `island` this round"""
+    if islands < 2:
+        return []
+    if topology == 'ring':
+        return [(island + 1) % islands]
+    if topology == 'all':
+        return [i for i in range(islands) if i != island]
+    return [rng.choice([i for i in range(islands) if i != island])]
+
+
+def _island_worker(island: int, islands: int, n: int, max_generations: int,
+                   migration_interval: int, migrants: int, topology: str,
+                   seed: int, solver_params: Dict, inboxes, results, stop) -> None:
+    """Evolve one sub-population, trading its best individuals with neighbours"""
+    solver = GeneticSolver(n, seed=seed, **solver_params)
+    rng = random.Random(seed)
+    inbox = inboxes[island]
+    # Migrants left unread in a neighbour's inbox must not block this exit
+    for q in inboxes:
+        q.cancel_join_thread()
+
+    for _ in range(max_generations):
+        if stop.is_set():
+            break
+        best, conflicts = solver.best()
+        if conflicts == 0:
+            stop.set()
+            break
+        solver.evolve()
+
+        if migration_interval and solver.generation % migration_interval == 0:
+            emigrants = solver.top(migrants)
+            for target in _targets(island, islands, topology, rng):
+                try:
+                    inboxes[target].put_nowait(emigrants)
+                except queue.Full:
+                    pass  # a slow neighbour just misses this round
+            arrivals = []
+            while True:
+                try:
+                    arrivals.append(inbox.get_nowait())
+                except queue.Empty:
+                    break
+            if arrivals:
+                solver.immigrate(np.concatenate(arrivals))
+
+    best, conflicts = solver.best()
+    results.put({'island': island, 'solution': best, 'conflicts': conflicts,
+                 'generations': solver.generation})
+
+
+def _serial_islands(islands: int, n: int, max_generations: int, migration_interval: int,
+                    migrants: int, topology: str, base_seed: int, solver_params: Dict,
+                    progress: Optional[Callable[..., None]]) -> List[Dict]:
+    """The island model in one process: islands evolve in lock-step and
+    migrants are delivered at the end of each generation"""
+    solvers = [GeneticSolver(n, seed=base_seed + i, **solver_params) for i in range(islands)]
+    rngs = [random.Random(base_seed + i) for i in range(islands)]
+    for _ in range(max_generations):
+        best = min(solver.best()[1] for solver in solvers)
+        if progress:
+            progress(steps=solvers[0].generation, conflicts=best)
+        if best == 0:
+            break
+        inboxes: List[List[np.ndarray]] = [[] for _ in range(islands)]
+        for island, solver in enumerate(solvers):
+            solver.evolve()
+            if migration_interval and solver.generation % migration_interval == 0:
+                emigrants = solver.top(migrants)
+                for target in _targets(island, islands, topology, rngs[island]):
+                    inboxes[target].append(emigrants)
+        for solver, arrivals in zip(solvers, inboxes):
+            if arrivals:
+                solver.immigrate(np.concatenate(arrivals[:config.GA_INBOX_SIZE]))
+    reports = []
+    for island, solver in enumerate(solvers):
+        best, conflicts = solver.best()
+        reports.append({'island': island, 'solution': best, 'conflicts': conflicts,
+                        'generations': solver.generation})
+    return reports
+
+
+def island_genetic_solve(n: int, islands: int = config.GA_ISLANDS,
+                         population_size: int = config.GA_POPULATION_SIZE,
+                         max_generations: int = config.GA_MAX_GENERATIONS,
+                         migration_interval: int = config.GA_MIGRATION_INTERVAL,
+                         migrants: int = config.GA_MIGRANTS,
+                         topology: str = config.GA_TOPOLOGY,
+                         seed: Optional[int] = None,
+                         processes: Optional[bool] = None,
+                         progress: Optional[Callable[..., None]] = None,
+                         **solver_params) -> Tuple[List[int], int, Dict]:
+    """Island-model GA: `islands` worker processes, each evolving
+    `population_size` individuals, exchanging their `migrants` best every
+    `migration_interval` generations. All islands stop as soon as one finds
+    a zero-conflict board.
+
+    processes=False evolves the islands in this process instead; that is
+    the default inside daemonic processes (solver pool workers), which may
+    not start children. Only the in-process mode reports `progress`. The
+    web servers only run island solves in the pool; worker processes are
+    spawned (GA_ISLANDS_START_METHOD), never forked from a threaded parent.
+
+    Returns (best solution, generations of the finishing island, stats).
+    """
+    if islands < 1:
+        raise ValueError(f"islands must be positive, got {islands}")
+    if topology not in TOPOLOGIES:
+        raise ValueError(f"Unknown migration topology: {topology}")
+    base_seed = seed if seed is not None else random.randrange(2 ** 31)
+    solver_params = dict(solver_params, population_size=population_size)
+    if processes is None:
+        processes = not mp.current_process().daemon
+    if not processes:
+        start_time = time.time()
+        reports = _serial_islands(islands, n, max_generations, migration_interval, migrants,
+                                  topology, base_seed, solver_params, progress)
+        return _island_result(reports, islands, topology, start_time)
+    ctx = mp.get_context(config.GA_ISLANDS_START_METHOD)
+    inboxes = [ctx.Queue(maxsize=config.GA_INBOX_SIZE) for _ in range(islands)]
+    results = ctx.Queue()
+    stop = ctx.Event()
+    workers = [
+        ctx.Process(target=_island_worker,
+                    args=(i, islands, n, max_generations, migration_interval, migrants,
+                          topology, base_seed + i, solver_params, inboxes, results, stop))
+        for i in range(islands)
+    ]
+
+    start_time = time.time()
+    for worker in workers:
+        worker.start()
+    reports = []
+    while len(reports) < islands:
+        try:
+            reports.append(results.get(timeout=1.0))
+        except queue.Empty:
+            if all(not w.is_alive() for w in workers):
+                break
+    stop.set()
+    for worker in workers:
+        worker.join(timeout=5.0)
+        if worker.is_alive():
+            worker.terminate()
+
+    if not reports:
+        raise RuntimeError("No island reported a result")
+    return _island_result(reports, islands, topology, start_time)
+
+
+def _island_result(reports: List[Dict], islands: int, topology: str,
+                   start_time: float) -> Tuple[List[int], int, Dict]:
+    best = min(reports, key=lambda r: (r['conflicts'], r['generations']))
+    return best['solution'], best['generations'], {
+        'islands': islands,
+        'topology': topology,
+        'winner': best['island'],
+        'conflicts': best['conflicts'],
+        'island_conflicts': [r['conflicts'] for r in sorted(reports, key=lambda r: r['island'])],
+        'time': time.time() - start_time,
+    }
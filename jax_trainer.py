@@ -0,0 +1,261 @@
+from functools import partial
+from typing import Dict, List, Tuple
+import time
+
+import jax
+import jax.numpy as jnp
+import numpy as np
+import flax.linen as nn
+import optax
+import config
+
+
+def _conflicts(board: jnp.ndarray) -> jnp.ndarray:
+    """Attacking pairs on one board (pairwise, fine for n <= 8)"""
+    n = board.shape[0]
+    rows = jnp.arange(n)
+    col_dist = jnp.abs(board[:, None] - board[None, :])
+    row_dist = jnp.abs(rows[:, None] - rows[None, :])
+    attacks = (col_dist == 0) | (col_dist == row_dist)
+    return jnp.sum(jnp.triu(attacks, k=1))
+
+
+def _row_conflicts(board: jnp.ndarray, row: jnp.ndarray) -> jnp.ndarray:
+    """Conflicts after moving the queen in `row` to each column -> [n]"""
+    n = board.shape[0]
+    return jax.vmap(lambda c: _conflicts(board.at[row].set(c)))(jnp.arange(n))
+
+
+def _move_mask(board: jnp.ndarray) -> jnp.ndarray:
+    """Flat [n*n] mask of actions that actually move a queen"""
+    n = board.shape[0]
+    return (jnp.arange(n)[None, :] != board[:, None]).ravel()
+
+
+def _transition(board: jnp.ndarray, action: jnp.ndarray):
+    """NQueensEnv.step() for one board: returns (new_board, reward, done)"""
+    old_conflicts = _conflicts(board)
+    new_board = board.at[action[0]].set(action[1])
+    new_conflicts = _conflicts(new_board)
+    delta = new_conflicts - old_conflicts
+    done = new_conflicts == 0
+    reward = jnp.where(done, 10.0, jnp.where(delta == 0, -0.5, -1.0 * delta))
+    return new_board, reward, done
+
+
+def _epsilon_greedy(key, board, q_values, epsilon):
+    """Explore with the lowest-conflict column of a random row, else argmax Q"""
+    n = board.shape[0]
+    k_explore, k_row, k_tie = jax.random.split(key, 3)
+    row = jax.random.randint(k_row, (), 0, n)
+    scores = jnp.where(jnp.arange(n) == board[row], jnp.inf, _row_conflicts(board, row))
+    explore_action = jnp.stack([row, jnp.argmin(scores)])
+
+    # Small noise breaks ties between equal Q-values at random
+    noise = jax.random.uniform(k_tie, q_values.shape, maxval=1e-6)
+    masked = jnp.where(_move_mask(board), q_values + noise, -jnp.inf)
+    best = jnp.argmax(masked)
+    exploit_action = jnp.stack([best // n, best % n])
+
+    explore = jax.random.uniform(k_explore) < epsilon
+    return jnp.where(explore, explore_action, exploit_action)
+
+
+class QNetwork(nn.Module):
+    """Small MLP mapping a one-hot board to n*n action values"""
+    board_size: int
+    hidden_size: int = config.JAX_HIDDEN_SIZE
+
+    @nn.compact
+    def __call__(self, boards):
+        x = jax.nn.one_hot(boards, self.board_size).reshape(boards.shape[:-1] + (-1,))
+        x = nn.relu(nn.Dense(self.hidden_size)(x))
+        x = nn.relu(nn.Dense(self.hidden_size)(x))
+        return nn.Dense(self.board_size * self.board_size)(x)
+
+
+class JaxQLearningAgent:
+    """Q-learning agent whose training loop is a jitted lax.scan over steps
+    and vmap over environments.
+
+    Boards with n**n <= config.JAX_TABULAR_MAX_STATES use a dense tabular
+    Q array; larger ones use a Flax MLP trained with optax. The public
+    methods mirror QLearningAgent so it can be swapped in by callers.
+    """
+
+    def __init__(self, state_space_size: int, action_space_size: int,
+                 learning_rate: float = config.LEARNING_RATE,
+                 discount_factor: float = config.DISCOUNT_FACTOR,
+                 exploration_rate: float = config.EXPLORATION_RATE,
+                 exploration_decay: float = config.EXPLORATION_DECAY,
+                 seed: int = 0, tabular: bool = None):
+        if state_space_size != action_space_size:
+            raise ValueError("JaxQLearningAgent needs a square board")
+        self.state_space_size = state_space_size
+        self.action_space_size = action_space_size
+        self.learning_rate = learning_rate
+        self.discount_factor = discount_factor
+        self.exploration_rate = exploration_rate
+        self.base_exploration_rate = exploration_rate
+        self.exploration_decay = exploration_decay
+        self.visited_states = set()
+
+        n = state_space_size
+        self.num_actions = n * n
+        self.tabular = (n ** n <= config.JAX_TABULAR_MAX_STATES) if tabular is None else tabular
+        self._radix = jnp.asarray([n ** r for r in range(n)], dtype=jnp.int32)
+        self._key = jax.random.PRNGKey(seed)
+
+        if self.tabular:
+            self.params = jnp.zeros((n ** n, self.num_actions), dtype=jnp.float32)
+            self.opt_state = None
+        else:
+            self.network = QNetwork(n)
+            self._key, init_key = jax.random.split(self._key)
+            self.params = self.network.init(init_key, jnp.zeros((1, n), dtype=jnp.int32))
+            self.optimizer = optax.adam(config.JAX_MLP_LEARNING_RATE)
+            self.opt_state = self.optimizer.init(self.params)
+
+    # Jitted methods take `self` as a static argument; agents with the same
+    # hyperparameters compare equal so they share compiled code.
+    def _static_key(self):
+        return (type(self), self.state_space_size, self.tabular, self.learning_rate,
+                self.discount_factor, self.exploration_decay)
+
+    def __hash__(self):
+        return hash(self._static_key())
+
+    def __eq__(self, other):
+        return isinstance(other, JaxQLearningAgent) and self._static_key() == other._static_key()
+
+    # -- Q-value access -------------------------------------------------
+
+    def _q_values(self, params, boards):
+        """[B, n] boards -> [B, n*n] action values"""
+        if self.tabular:
+            return params[boards @ self._radix]
+        return self.network.apply(params, boards)
+
+    def _update(self, params, opt_state, boards, actions, rewards, new_boards, dones):
+        """One Q-learning update for a batch of transitions"""
+        masks = jax.vmap(_move_mask)(new_boards)
+        future = jnp.where(masks, self._q_values(params, new_boards), -jnp.inf).max(axis=1)
+        targets = rewards + self.discount_factor * jnp.where(dones, 0.0, future)
+        action_index = actions[:, 0] * self.state_space_size + actions[:, 1]
+
+        if self.tabular:
+            states = boards @ self._radix
+            current = params[states, action_index]
+            params = params.at[states, action_index].add(self.learning_rate * (targets - current))
+            return params, opt_state
+
+        targets = jax.lax.stop_gradient(targets)
+
+        def loss_fn(p):
+            q = self.network.apply(p, boards)
+            chosen = jnp.take_along_axis(q, action_index[:, None], axis=1)[:, 0]
+            return jnp.mean((targets - chosen) ** 2)
+
+        grads = jax.grad(loss_fn)(params)
+        updates, opt_state = self.optimizer.update(grads, opt_state, params)
+        return optax.apply_updates(params, updates), opt_state
+
+    def get_q_values(self, state: List[int]) -> np.ndarray:
+        board = jnp.asarray([state], dtype=jnp.int32)
+        return np.asarray(self._q_values(self.params, board)[0], dtype=float)
+
+    def get_q_value(self, state: List[int], action: Tuple[int, int]) -> float:
+        return float(self.get_q_values(state)[action[0] * self.state_space_size + action[1]])
+
+    # -- QLearningAgent interface ---------------------------------------
+
+    def choose_action(self, state: List[int]) -> Tuple[int, int]:
+        """Choose action using ε-greedy policy with decay"""
+        self.exploration_rate = max(
+            config.MIN_EXPLORATION_RATE,
+            self.exploration_rate * self.exploration_decay
+        )
+        self._key, key = jax.random.split(self._key)
+        action = self._choose(self.params, key, jnp.asarray(state, dtype=jnp.int32),
+                              self.exploration_rate)
+        return (int(action[0]), int(action[1]))
+
+    @partial(jax.jit, static_argnums=0)
+    def _choose(self, params, key, board, epsilon):
+        q_values = self._q_values(params, board[None, :])[0]
+        return _epsilon_greedy(key, board, q_values, epsilon)
+
+    def learn(self, state: List[int], action: Tuple[int, int],
+              reward: float, new_state: List[int], done: bool) -> None:
+        """Update Q-values using Bellman equation"""
+        self.visited_states.add(tuple(state))
+        self.params, self.opt_state = self._jit_update(
+            self.params, self.opt_state,
+            jnp.asarray([state], dtype=jnp.int32), jnp.asarray([action], dtype=jnp.int32),
+            jnp.asarray([reward], dtype=jnp.float32), jnp.asarray([new_state], dtype=jnp.int32),
+            jnp.asarray([done])
+        )
+
+    @partial(jax.jit, static_argnums=0)
+    def _jit_update(self, params, opt_state, boards, actions, rewards, new_boards, dones):
+        return self._update(params, opt_state, boards, actions, rewards, new_boards, dones)
+
+    # -- Compiled training loop -----------------------------------------
+
+    @partial(jax.jit, static_argnums=(0, 2, 3, 4))
+    def _train_scan(self, carry, num_envs: int, num_steps: int, max_episode_steps: int):
+        n = self.state_space_size
+
+        def random_boards(key):
+            return jax.random.randint(key, (num_envs, n), 0, n, dtype=jnp.int32)
+
+        def body(carry, _):
+            params, opt_state, boards, ep_steps, key, epsilon = carry
+            key, k_policy, k_reset = jax.random.split(key, 3)
+
+            q_values = self._q_values(params, boards)
+            actions = jax.vmap(_epsilon_greedy, in_axes=(0, 0, 0, None))(
+                jax.random.split(k_policy, num_envs), boards, q_values, epsilon)
+            new_boards, rewards, dones = jax.vmap(_transition)(boards, actions)
+            params, opt_state = self._update(params, opt_state, boards, actions,
+                                             rewards, new_boards, dones)
+
+            # Auto-reset solved or truncated boards
+            ep_steps = ep_steps + 1
+            finished = dones | (ep_steps >= max_episode_steps)
+            boards = jnp.where(finished[:, None], random_boards(k_reset), new_boards)
+            ep_steps = jnp.where(finished, 0, ep_steps)
+            epsilon = jnp.maximum(config.MIN_EXPLORATION_RATE, epsilon * self.exploration_decay)
+
+            stats = (jnp.sum(finished), jnp.sum(dones), jnp.sum(rewards))
+            return (params, opt_state, boards, ep_steps, key, epsilon), stats
+
+        carry, (episodes, solved, rewards) = jax.lax.scan(body, carry, None, length=num_steps)
+        return carry, jnp.sum(episodes), jnp.sum(solved), jnp.sum(rewards)
+
+    def train(self, num_steps: int, num_envs: int = config.JAX_NUM_ENVS,
+              max_episode_steps: int = config.JAX_MAX_EPISODE_STEPS) -> Dict[str, float]:
+        """Run `num_steps` compiled steps on `num_envs` boards in parallel"""
+        n = self.state_space_size
+        self._key, board_key, run_key = jax.random.split(self._key, 3)
+        boards = jax.random.randint(board_key, (num_envs, n), 0, n, dtype=jnp.int32)
+        carry = (self.params, self.opt_state, boards, jnp.zeros(num_envs, dtype=jnp.int32),
+                 run_key, jnp.float32(self.exploration_rate))
+
+        start_time = time.time()
+        carry, episodes, solved, rewards = self._train_scan(carry, num_envs, num_steps,
+                                                            max_episode_steps)
+        jax.block_until_ready(carry[0])
+        elapsed = max(time.time() - start_time, 1e-9)
+
+        self.params, self.opt_state = carry[0], carry[1]
+        self.exploration_rate = float(carry[5])
+        transitions = num_steps * num_envs
+        return {
+            'transitions': transitions,
+            'episodes': int(episodes),
+            'solved': int(solved),
+            'mean_reward': float(rewards) / transitions,
+            'time': elapsed,
+            'steps_per_second': transitions / elapsed,
+        }
@@ -0,0 +1,114 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Dict, Optional
+
+import config
+from solver_pool import SolverPool, SolverTask
+from solver_tasks import result_cost
+
+
+class JobLimitError(Exception):
+    """Raised when an owner, or the server as a whole, has too many jobs waiting"""
+
+
+class Job:
+    """A solve submitted through /api/jobs, tracked by a string ID"""
+
+    def __init__(self, task: SolverTask, owner: Optional[str]):
+        self.id = uuid.uuid4().hex
+        self.task = task
+        self.owner = owner
+        self._cost: Optional[int] = None
+
+    @property
+    def cost(self) -> int:
+        """Size of the stored result in board cells (see result_cost); 0 until done"""
+        if self._cost is None and self.task.done:
+            task = self.task
+            self._cost = (result_cost(task.future.result(), task.kwargs['n'])
+                          if task.state == 'done' else 0)
+        return self._cost or 0
+
+    def describe(self) -> Dict:
+        """Status without the result: state, progress and timings"""
+        task = self.task
+        now = time.time()
+        started = task.started
+        ended = task.finished or now
+        return {
+            'id': self.id,
+            'algorithm': task.algorithm,
+            'n': task.kwargs.get('n'),
+            'params': {k: v for k, v in task.kwargs.items() if k != 'n'},
+            'priority': task.priority,
+            'state': task.state,
+            'progress': task.progress,
+            'queuedFor': round((started or ended) - task.submitted, 3),
+            'elapsed': round(ended - started, 3) if started else 0.0,
+            'error': str(task.future.exception()) if task.state == 'failed' else None
+        }
+
+
+class JobManager:
+    """Job registry over a SolverPool.
+
+    Finished jobs are kept (earliest finished dropped first) up to
+    `max_stored` jobs and `max_cost` result cells in total, so a few large
+    histories or min-conflicts solutions cannot pin unbounded memory; the
+    latest finished job is always kept so its result can be fetched. Jobs
+    still queued or running are never dropped, but at most
+    `max_queued_total` may be waiting, so the registry stays bounded. Each
+    owner may have at most `max_queued` jobs waiting, and the pool limits
+    how many run at once.
+    """
+
+    def __init__(self, pool: SolverPool, max_stored: int = config.JOBS_MAX_STORED,
+                 max_queued: int = config.JOBS_MAX_QUEUED_PER_OWNER,
+                 max_queued_total: int = config.JOBS_MAX_QUEUED,
+                 max_cost: int = config.JOBS_MAX_STORED_COST):
+        self.pool = pool
+        self.max_stored = max_stored
+        self.max_cost = max_cost
+        self.max_queued = max_queued
+        self.max_queued_total = max_queued_total
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, algorithm: str, kwargs: Dict, priority: int = 0,
+               owner: Optional[str] = None) -> Job:
+        with self._lock:
+            if owner is not None and self.pool.queued(owner) >= self.max_queued:
+                raise JobLimitError(f"At most {self.max_queued} queued jobs per client")
+            if self.pool.queued() >= self.max_queued_total:
+                raise JobLimitError("Too many queued jobs, try again later")
+            job = Job(self.pool.submit(algorithm, kwargs, priority, owner), owner)
+            self._jobs[job.id] = job
+            self._prune()
+            return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            # Jobs finish in the background, so their results are costed here too
+            self._prune()
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        job = self._jobs.get(job_id)
+        if job is not None:
+            self.pool.cancel(job.task)
+        return job
+
+    def _prune(self) -> None:
+        # Caller holds self._lock
+        finished = sorted((job for job in self._jobs.values() if job.task.done),
+                          key=lambda job: job.task.finished)
+        excess = len(self._jobs) - self.max_stored
+        cost = sum(job.cost for job in finished)
+        for job in finished[:-1]:
+            if excess <= 0 and cost <= self.max_cost:
+                return
+            del self._jobs[job.id]
+            excess -= 1
+            cost -= job.cost
@@ -0,0 +1,145 @@
+import random
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import config
+
+# Queens are kept as a permutation (queens[row] = column), so columns never
+# conflict and only the two diagonal families need counters. Moves swap the
+# columns of two rows, which keeps the permutation and costs O(1) to score.
+
+
+class MinConflictsSolver:
+    """Min-conflicts local search for very large boards (Sosic & Gu style).
+
+    A greedy pass places rows on conflict-free diagonals while it can find
+    them cheaply; the last few rows are filled arbitrarily and then repaired
+    by swapping conflicted queens with random partners whenever the swap
+    lowers the conflict count.
+    """
+
+    def __init__(self, n: int, seed: Optional[int] = None):
+        if not (config.MIN_CONFLICTS_SIZE_MIN <= n <= config.MIN_CONFLICTS_SIZE_MAX):
+            raise ValueError(f"Board size must be between {config.MIN_CONFLICTS_SIZE_MIN} and "
+                             f"{config.MIN_CONFLICTS_SIZE_MAX}, got {n}")
+        self.n = n
+        self.rng = random.Random(seed)
+        self.queens: List[int] = []
+        self.conflicts = 0
+        self.steps = 0
+
+    def _place(self, row: int, col: int) -> None:
+        n = self.n
+        d1, d2 = self._diag1, self._diag2
+        self.conflicts += d1[row - col + n - 1] + d2[row + col]
+        d1[row - col + n - 1] += 1
+        d2[row + col] += 1
+
+    def _lift(self, row: int, col: int) -> None:
+        n = self.n
+        d1, d2 = self._diag1, self._diag2
+        d1[row - col + n - 1] -= 1
+        d2[row + col] -= 1
+        self.conflicts -= d1[row - col + n - 1] + d2[row + col]
+
+    def _attacked(self, row: int) -> bool:
+        col = self.queens[row]
+        return self._diag1[row - col + self.n - 1] > 1 or self._diag2[row + col] > 1
+
+    def _initial_placement(self) -> None:
+        """Greedy conflict-free placement for all but the last few rows"""
+        n = self.n
+        rng = self.rng
+        queens = np.random.default_rng(rng.getrandbits(64)).permutation(n).tolist()
+        self.queens = queens
+        self._diag1 = d1 = [0] * (2 * n - 1)
+        self._diag2 = d2 = [0] * (2 * n - 1)
+        self.conflicts = 0
+        rand = rng.random
+        tries = config.MIN_CONFLICTS_GREEDY_TRIES
+
+        # Hot loop for large n: _place() is inlined and randrange() avoided
+        greedy_rows = max(0, n - config.MIN_CONFLICTS_TAIL_ROWS)
+        conflicts = 0
+        offset = n - 1
+        for row in range(greedy_rows):
+            # Draw from the still-unused columns queens[row:] until one is free
+            remaining = n - row
+            for _ in range(tries):
+                pick = row + int(rand() * remaining)
+                col = queens[pick]
+                if not d1[row - col + offset] and not d2[row + col]:
+                    break
+            queens[row], queens[pick] = col, queens[row]
+            conflicts += d1[row - col + offset] + d2[row + col]
+            d1[row - col + offset] += 1
+            d2[row + col] += 1
+        self.conflicts = conflicts
+        for row in range(greedy_rows, n):
+            self._place(row, queens[row])
+
+    def _try_swap(self, i: int, j: int) -> bool:
+        """Swap the columns of rows i and j if that reduces conflicts"""
+        queens = self.queens
+        ci, cj = queens[i], queens[j]
+        before = self.conflicts
+        self._lift(i, ci)
+        self._lift(j, cj)
+        self._place(i, cj)
+        self._place(j, ci)
+        if self.conflicts < before:
+            queens[i], queens[j] = cj, ci
+            return True
+        self._lift(j, ci)
+        self._lift(i, cj)
+        self._place(i, ci)
+        self._place(j, cj)
+        return False
+
+    def solve(self, max_steps: int = config.MIN_CONFLICTS_MAX_STEPS,
+              max_restarts: int = config.MIN_CONFLICTS_MAX_RESTARTS,
+              progress: Optional[Callable[..., None]] = None) -> Optional[List[int]]:
+        """Return a solution, or None if the step/restart budget runs out.
+
+        `progress(steps=..., conflicts=...)` is called after every repair pass.
+        """
+        n = self.n
+        rng = self.rng
+        self.steps = 0
+        for _ in range(max_restarts + 1):
+            self._initial_placement()
+            while self.conflicts and self.steps < max_steps:
+                improved = False
+                d1, d2, queens, offset = self._diag1, self._diag2, self.queens, n - 1
+                attacked = [row for row, col in enumerate(queens)
+                            if d1[row - col + offset] > 1 or d2[row + col] > 1]
+                for row in attacked:
+                    if not self._attacked(row):
+                        continue
+                    # A handful of random partners per conflicted queen
+                    for _ in range(config.MIN_CONFLICTS_SWAP_TRIES):
+                        self.steps += 1
+                        other = rng.randrange(n)
+                        if other != row and self._try_swap(row, other):
+                            improved = True
+                            break
+                    if not self.conflicts:
+                        break
+                if progress:
+                    progress(steps=self.steps, conflicts=self.conflicts)
+                if not improved:
+                    break  # local minimum, restart
+            if not self.conflicts:
+                return self.queens.copy()
+            if self.steps >= max_steps:
+                break
+        return None
+
+
+def min_conflicts_solve(n: int, seed: Optional[int] = None,
+                        max_steps: int = config.MIN_CONFLICTS_MAX_STEPS,
+                        progress: Optional[Callable[..., None]] = None) -> Tuple[Optional[List[int]], Dict]:
+    """Solve an n-queens board; returns (solution or None, stats)"""
+    solver = MinConflictsSolver(n, seed)
+    solution = solver.solve(max_steps, progress=progress)
+    return solution, {'steps': solver.steps, 'conflicts': solver.conflicts}
@@ -1,5 +1,29 @@
 import numpy as np
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Union
+
+
+def attacked_row_masks(queens: List[int], n: int) -> List[int]:
+    """Per-row bitmasks of the squares attacked by `queens` (-1 = empty row).
+
+    Columns and both diagonals are folded into one int each; row r's
+    diagonal bits are then a shift away: r+c lives at bit r+c and c-r at
+    bit c-r+n-1. Queen squares are never marked.
+    """
+    full = (1 << n) - 1
+    cols = diag1 = diag2 = 0
+    for r, c in enumerate(queens):
+        if c >= 0:
+            cols |= 1 << c
+            diag1 |= 1 << (c - r + n - 1)
+            diag2 |= 1 << (r + c)
+    masks = []
+    for r, c in enumerate(queens):
+        if c >= 0:
+            masks.append(full & ~(1 << c))  # the rest of the queen's row
+        else:
+            masks.append((cols | diag1 >> (n - 1 - r) | diag2 >> r) & full)
+    return masks
+
 
 class NQueensEnv:
     def __init__(self, board_size: int = 8):
@@ -14,20 +38,66 @@ class NQueensEnv:
         if board_size is not None:
             self.board_size = board_size
         self.queens = np.random.randint(0, self.board_size, size=self.board_size).tolist()
+        self._rebuild_counters()
         return self.queens.copy()
     
+    def _rebuild_counters(self) -> None:
+        """Recount column and diagonal occupancy from scratch"""
+        n = self.board_size
+        queens = np.asarray(self.queens, dtype=np.int64)
+        rows = np.arange(n)
+        # Diagonal r-c is shifted by n-1 so indices start at 0
+        self._col_counts = np.bincount(queens, minlength=n)
+        self._diag1_counts = np.bincount(rows - queens + n - 1, minlength=2 * n - 1)
+        self._diag2_counts = np.bincount(rows + queens, minlength=2 * n - 1)
+        self._conflicts = int(
+            np.sum(self._col_counts * (self._col_counts - 1) // 2) +
+            np.sum(self._diag1_counts * (self._diag1_counts - 1) // 2) +
+            np.sum(self._diag2_counts * (self._diag2_counts - 1) // 2)
+        )
+    
+    def _conflicts_delta(self, row: int, new_col: int) -> int:
+        """Change in conflicts if the queen in `row` moved to `new_col` (O(1))"""
+        old_col = self.queens[row]
+        if new_col == old_col:
+            return 0
+        n = self.board_size
+        # Pairs lost by lifting the queen (it no longer attacks the others)
+        removed = (self._col_counts[old_col] - 1 +
+                   self._diag1_counts[row - old_col + n - 1] - 1 +
+                   self._diag2_counts[row + old_col] - 1)
+        # Pairs gained at the destination square
+        added = (self._col_counts[new_col] +
+                 self._diag1_counts[row - new_col + n - 1] +
+                 self._diag2_counts[row + new_col])
+        return int(added - removed)
+    
+    def _move_queen(self, row: int, new_col: int) -> None:
+        """Move the queen in `row` and update the occupancy counters in place"""
+        old_col = self.queens[row]
+        if new_col == old_col:
+            return
+        n = self.board_size
+        self._conflicts += self._conflicts_delta(row, new_col)
+        self._col_counts[old_col] -= 1
+        self._diag1_counts[row - old_col + n - 1] -= 1
+        self._diag2_counts[row + old_col] -= 1
+        self._col_counts[new_col] += 1
+        self._diag1_counts[row - new_col + n - 1] += 1
+        self._diag2_counts[row + new_col] += 1
+        self.queens[row] = new_col
+    
     def step(self, action: Tuple[int, int]) -> Tuple[List[int], float, bool]:
         """Execute an action (move a queen to a new column in a row)"""
         row, new_col = action
         if not (0 <= row < self.board_size and 0 <= new_col < self.board_size):
             raise ValueError(f"Invalid action: {action}")
         
-        old_col = self.queens[row]
-        old_conflicts = self.get_conflicts()
+        old_conflicts = self._conflicts
     
     # Make the move
-        self.queens[row] = new_col
-        new_conflicts = self.get_conflicts()
+        self._move_queen(row, new_col)
+        new_conflicts = self._conflicts
     
         done = new_conflicts == 0
     
@@ -44,29 +114,37 @@ class NQueensEnv:
         return self.queens.copy(), reward, done
     
     def get_conflicts(self) -> int:
-        """Optimized conflict calculation using numpy"""
-        queens = np.array(self.queens)
-        rows = np.arange(len(queens))
-
-        # Column conflicts
-        _, counts = np.unique(queens, return_counts=True)
-        col_conflicts = int(np.sum(counts * (counts - 1) // 2))
-
-        # Diagonal conflicts
-        diag1 = rows - queens
-        diag2 = rows + queens
-        _, counts1 = np.unique(diag1, return_counts=True)
-        _, counts2 = np.unique(diag2, return_counts=True)
-        diag_conflicts = int(np.sum(counts1 * (counts1 - 1) // 2) +
-                             np.sum(counts2 * (counts2 - 1) // 2))
-
-        return col_conflicts + diag_conflicts
+        """Current number of attacking pairs, maintained incrementally by step()"""
+        return self._conflicts
     
     def _count_conflicts_if_change(self, row: int, col: int) -> int:
         """Count conflicts if a queen were placed at (row, col)"""
-        temp = self.queens.copy()
-        temp[row] = col
-        return self._calculate_conflicts(temp)
+        return self._conflicts + self._conflicts_delta(row, col)
+    
+    def get_move_deltas(self) -> np.ndarray:
+        """Conflict delta for every (row, new_col) move as an n x n matrix.
+
+        Entry [r, c] is the change in get_conflicts() if the queen in row r
+        moved to column c; the current queen squares are 0.
+        """
+        n = self.board_size
+        queens = np.asarray(self.queens)
+        rows = np.arange(n)
+        cols = np.arange(n)
+
+        # Pairs each queen takes part in (removed when it is lifted)
+        removed = (self._col_counts[queens] +
+                   self._diag1_counts[rows - queens + n - 1] +
+                   self._diag2_counts[rows + queens] - 3)
+
+        # Pairs gained by landing on each square
+        added = (self._col_counts[None, :] +
+                 self._diag1_counts[rows[:, None] - cols[None, :] + n - 1] +
+                 self._diag2_counts[rows[:, None] + cols[None, :]])
+
+        deltas = added - removed[:, None]
+        deltas[rows, queens] = 0
+        return deltas
     
     def _calculate_conflicts(self, board: List[int]) -> int:
         queens = np.array(board)
@@ -84,28 +162,15 @@ class NQueensEnv:
 
         return col_conflicts + diag_conflicts
     
-    def get_attacked_squares(self) -> Dict[str, bool]:
-        """Get all attacked squares with conflict types"""
-        attacked = {}
-        queen_positions = {(r, c) for r, c in enumerate(self.queens)}
-        
-        for r, c in enumerate(self.queens):
-            # Mark row and column
-            for i in range(self.board_size):
-                if i != c:
-                    attacked[f"{r}-{i}"] = True  # row
-                if i != r:
-                    attacked[f"{i}-{c}"] = True  # column
-            
-            # Mark diagonals
-            for i in range(1, self.board_size):
-                for dr, dc in [(1, 1), (1, -1), (-1, 1), (-1, -1)]:
-                    nr, nc = r + i * dr, c + i * dc
-                    if 0 <= nr < self.board_size and 0 <= nc < self.board_size:
-                        attacked[f"{nr}-{nc}"] = True  # diagonal
-        
-        # Remove queen positions
-        for r, c in queen_positions:
-            attacked.pop(f"{r}-{c}", None)
-            
-        return attacked
+    def get_attacked_squares(self, compact: bool = False) -> Union[Dict[str, bool], List[int]]:
+        """Squares attacked by some queen, excluding the queen squares.
+
+        Returns {"r-c": True} per attacked square, or with compact=True one
+        n-bit int per row (bit c set when (r, c) is attacked).
+        """
+        rows = attacked_row_masks(self.queens, self.board_size)
+        if compact:
+            return rows
+        return {f"{r}-{c}": True
+                for r, mask in enumerate(rows)
+                for c in range(self.board_size) if mask >> c & 1}
@@ -0,0 +1,177 @@
+# opening_book.py
+"""Precomputed placement-phase tables for the multiplayer AI.
+
+Every position reachable in the placement phase (queens only ever land on
+unattacked squares) is enumerated once per board size and stored with its
+best placement, safe-square count and solvability, e.g.
+
+    python opening_book.py --sizes 4-8
+
+The server maps the files on first use (see OpeningBooks).
+"""
+import argparse
+import os
+import struct
+import threading
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import config
+from board_state import BoardState
+
+# Layout (little endian):
+#   header  magic "NQOB", version u16, board_size u16, num_states u64
+#           -> 16 bytes, padded to 64
+#   keys    uint64[num_states]   sorted BoardState.key of each position
+#   moves   uint8[num_states]    best placement as row * n + col, NO_MOVE if none
+#   safe    uint8[num_states]    safe squares left in the empty rows
+#   flags   uint8[num_states]    SOLVABLE if the position extends to a solution
+MAGIC = b"NQOB"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQ")
+HEADER_SIZE = 64
+NO_MOVE = 0xFF
+SOLVABLE = 0x01
+
+
+def book_path(board_size: int, directory: str = config.OPENING_BOOK_DIR) -> str:
+    return os.path.join(directory, f"book_{board_size}.nqb")
+
+
+def build_book(n: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Sorted keys and move/safe/flag columns for every reachable position.
+
+    The best placement keeps the position solvable if possible and then
+    leaves the most safe squares (the AI's existing heuristic), lowest
+    square first on ties.
+    """
+    if not (1 <= n <= config.OPENING_BOOK_MAX_SIZE):
+        raise ValueError(f"Opening books support n between 1 and "
+                         f"{config.OPENING_BOOK_MAX_SIZE}, got {n}")
+    board = BoardState(n)
+    # key -> (move, safe squares, solvable)
+    entries: Dict[int, Tuple[int, int, bool]] = {}
+
+    def visit() -> Tuple[bool, int]:
+        key = board.key
+        entry = entries.get(key)
+        if entry is None:
+            best, best_score = NO_MOVE, None
+            for row in range(n):
+                safe = board.safe_mask(row)
+                for col in range(n):
+                    if safe >> col & 1:
+                        board.place(row, col)
+                        score = visit()
+                        board.remove(row)
+                        if best_score is None or score > best_score:
+                            best, best_score = row * n + col, score
+            solvable = board.placed == n or (best_score is not None and best_score[0])
+            entry = entries[key] = (best, board.safe_squares(), solvable)
+        return entry[2], entry[1]
+
+    visit()
+    keys = np.fromiter(entries.keys(), dtype=np.uint64, count=len(entries))
+    order = np.argsort(keys, kind="stable")
+    values = np.array(list(entries.values()), dtype=np.uint8).reshape(-1, 3)[order]
+    return keys[order], values[:, 0].copy(), values[:, 1].copy(), values[:, 2] * SOLVABLE
+
+
+def save_book(path: str, n: int) -> int:
+    """Build the book for `n` and write it to `path` atomically; returns the state count"""
+    keys, moves, safe, flags = build_book(n)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, n, len(keys)).ljust(HEADER_SIZE, b"\0"))
+        for column in (keys, moves, safe, flags):
+            f.write(np.ascontiguousarray(column).tobytes())
+    os.replace(tmp_path, path)
+    return len(keys)
+
+
+class OpeningBook:
+    """Read-only, memory-mapped book for one board size; lookups binary-search the keys"""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            magic, version, board_size, num_states = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not an opening book")
+        if version != VERSION:
+            raise ValueError(f"Unsupported opening book version {version} in {path}")
+        self.path = path
+        self.board_size = board_size
+        self.keys = np.memmap(path, dtype=np.uint64, mode="r",
+                              offset=HEADER_SIZE, shape=(num_states,))
+        offset = HEADER_SIZE + num_states * 8
+        self.moves, self.safe, self.flags = (
+            np.memmap(path, dtype=np.uint8, mode="r",
+                      offset=offset + i * num_states, shape=(num_states,))
+            for i in range(3))
+
+    def lookup(self, board: BoardState) -> Optional[Dict]:
+        """{'move': (row, col) or None, 'safe': int, 'solvable': bool}, or
+        None for a position the placement phase cannot reach"""
+        key = np.uint64(board.key)
+        pos = int(np.searchsorted(self.keys, key))
+        if pos == len(self.keys) or self.keys[pos] != key:
+            return None
+        move = int(self.moves[pos])
+        return {
+            'move': None if move == NO_MOVE else divmod(move, self.board_size),
+            'safe': int(self.safe[pos]),
+            'solvable': bool(self.flags[pos] & SOLVABLE)
+        }
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+class OpeningBooks:
+    """Per-size books from `directory`, each mapped on first use"""
+
+    def __init__(self, directory: str = config.OPENING_BOOK_DIR):
+        self.directory = directory
+        self._books: Dict[int, Optional[OpeningBook]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, n: int) -> Optional[OpeningBook]:
+        """The book for `n`, or None if it has not been built"""
+        if n not in self._books:
+            with self._lock:
+                if n not in self._books:
+                    path = book_path(n, self.directory)
+                    self._books[n] = OpeningBook(path) if os.path.exists(path) else None
+        return self._books[n]
+
+
+def parse_sizes(value):
+    if '-' in value:
+        low, high = value.split('-', 1)
+        sizes = list(range(int(low), int(high) + 1))
+    else:
+        sizes = [int(s) for s in value.split(',')]
+    for n in sizes:
+        if not (1 <= n <= config.OPENING_BOOK_MAX_SIZE):
+            raise argparse.ArgumentTypeError(
+                f"board sizes must be between 1 and {config.OPENING_BOOK_MAX_SIZE}")
+    return sizes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build multiplayer AI opening books")
+    parser.add_argument('--sizes', type=parse_sizes,
+                        default=list(range(config.BOARD_SIZE_MIN, config.OPENING_BOOK_MAX_SIZE + 1)),
+                        help="board sizes, e.g. '8', '4,6' or '4-8'")
+    parser.add_argument('--output-dir', default=config.OPENING_BOOK_DIR)
+    args = parser.parse_args(argv)
+
+    for board_size in args.sizes:
+        path = book_path(board_size, args.output_dir)
+        count = save_book(path, board_size)
+        print(f"[n={board_size}] {count} positions -> {path}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
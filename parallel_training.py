@@ -0,0 +1,146 @@
+import multiprocessing as mp
+import os
+import queue
+import random
+import time
+from multiprocessing import shared_memory
+from typing import Dict, Optional
+
+import numpy as np
+import config
+from nqueens_env import NQueensEnv
+from qlearning import QLearningAgent
+from qtable import DirectQTable
+
+
+def _train_worker(shm_name: str, board_size: int, episodes: Optional[int], max_steps: int,
+                  seed: int, agent_kwargs: Dict, results,
+                  total_steps: Optional[int] = None) -> None:
+    """Run episodes against the shared table until either budget is spent
+    and report counters"""
+    random.seed(seed)
+    np.random.seed(seed)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        table = DirectQTable(board_size, buffer=shm.buf)
+        env = NQueensEnv(board_size)
+        agent = QLearningAgent(board_size, board_size, q_table=table, **agent_kwargs)
+        agent.env = env
+
+        steps = solved = done_episodes = 0
+        while ((episodes is None or done_episodes < episodes) and
+               (total_steps is None or steps < total_steps)):
+            done_episodes += 1
+            state = env.reset()
+            for _ in range(max_steps):
+                action = agent.choose_action(state)
+                new_state, reward, done = env.step(action)
+                agent.learn(state, action, reward, new_state, done)
+                state = new_state
+                steps += 1
+                if done:
+                    solved += 1
+                    break
+        results.put({'steps': steps, 'episodes': done_episodes, 'solved': solved})
+        # Drop views on the buffer before closing it
+        del agent, table
+    finally:
+        shm.close()
+
+
+class ParallelTrainer:
+    """Hogwild-style Q-learning over worker processes sharing one Q-table.
+
+    The DirectQTable lives in a multiprocessing.shared_memory block; every
+    worker runs its own NQueensEnv/QLearningAgent and writes updates into
+    it without locks. Occasional lost updates between workers are accepted
+    in exchange for near-linear scaling with cores.
+
+    Use as a context manager, or call close() to release the shared block.
+    """
+
+    def __init__(self, board_size: int, num_workers: int = config.PARALLEL_WORKERS,
+                 **agent_kwargs):
+        size = DirectQTable.required_bytes(board_size)
+        if size > config.PARALLEL_SHM_MAX_BYTES:
+            raise ValueError(f"Shared Q-table for n={board_size} needs {size} bytes, "
+                             f"over PARALLEL_SHM_MAX_BYTES={config.PARALLEL_SHM_MAX_BYTES}")
+        self.board_size = board_size
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.agent_kwargs = agent_kwargs
+        self._ctx = mp.get_context(config.PARALLEL_START_METHOD)
+        self._shm = shared_memory.SharedMemory(create=True, size=size)
+        self.table = DirectQTable(board_size, buffer=self._shm.buf)
+
+    def warm_start(self, snapshot) -> int:
+        """Copy a loaded snapshot's rows into the shared table; returns the row count"""
+        if snapshot.board_size != self.board_size:
+            raise ValueError(f"Snapshot is for n={snapshot.board_size}, not n={self.board_size}")
+        indices = np.asarray(snapshot.indices)
+        self.table.values[indices] = snapshot.values
+        self.table.visited[indices] = True
+        return len(indices)
+
+    def train(self, episodes_per_worker: Optional[int], max_steps: int = 1000,
+              seed: Optional[int] = None,
+              steps_per_worker: Optional[int] = None) -> Dict[str, float]:
+        """Run every worker until its episode or step budget is spent and
+        return aggregate throughput"""
+        if episodes_per_worker is None and steps_per_worker is None:
+            raise ValueError("Need an episode or step budget")
+        base_seed = seed if seed is not None else random.randrange(2 ** 31)
+        results = self._ctx.Queue()
+        workers = [
+            self._ctx.Process(
+                target=_train_worker,
+                args=(self._shm.name, self.board_size, episodes_per_worker, max_steps,
+                      base_seed + i, self.agent_kwargs, results, steps_per_worker)
+            )
+            for i in range(self.num_workers)
+        ]
+
+        start_time = time.time()
+        for worker in workers:
+            worker.start()
+        reports = []
+        while len(reports) < len(workers):
+            try:
+                reports.append(results.get(timeout=1.0))
+            except queue.Empty:
+                # A worker that died before reporting would block us forever
+                if all(not w.is_alive() for w in workers):
+                    break
+        for worker in workers:
+            worker.join()
+        elapsed = max(time.time() - start_time, 1e-9)
+
+        failed = [w.exitcode for w in workers if w.exitcode != 0]
+        if failed:
+            raise RuntimeError(f"{len(failed)} training worker(s) failed: exit codes {failed}")
+
+        steps = sum(r['steps'] for r in reports)
+        episodes = sum(r['episodes'] for r in reports)
+        return {
+            'workers': self.num_workers,
+            'steps': steps,
+            'episodes': episodes,
+            'solved': sum(r['solved'] for r in reports),
+            'states': len(self.table),
+            'time': elapsed,
+            'steps_per_second': steps / elapsed,
+            'episodes_per_second': episodes / elapsed,
+        }
+
+    def close(self) -> None:
+        if self._shm is None:
+            return
+        self.table = None
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,15 +1,21 @@
 import numpy as np
 import random
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Optional
 import math
 import config  # Make sure config.py defines the constants used below
+from qtable import BoundedQTable, DenseQTable
+from vec_env import row_move_deltas
 
 class QLearningAgent:
     def __init__(self, state_space_size: int, action_space_size: int,
                  learning_rate: float = config.LEARNING_RATE, 
                  discount_factor: float = config.DISCOUNT_FACTOR,
                  exploration_rate: float = config.EXPLORATION_RATE, 
-                 exploration_decay: float = config.EXPLORATION_DECAY):
+                 exploration_decay: float = config.EXPLORATION_DECAY,
+                 q_backend: str = config.Q_TABLE_BACKEND,
+                 max_q_table_size: Optional[int] = config.MAX_Q_TABLE_SIZE,
+                 eviction_policy: str = config.Q_TABLE_EVICTION_POLICY,
+                 q_table=None, warm_start=None):
         self.state_space_size = state_space_size
         self.action_space_size = action_space_size
         self.learning_rate = learning_rate
@@ -17,8 +23,26 @@ class QLearningAgent:
         self.exploration_rate = exploration_rate
         self.base_exploration_rate = exploration_rate
         self.exploration_decay = exploration_decay
-        self.q_table = {}
-        self.visited_states = set()
+        self.q_backend = q_backend
+        if q_table is not None:
+            # Pre-built array table (e.g. shared across processes)
+            self.q_backend = "dense"
+            self.q_table = q_table
+            self.visited_states = q_table.visited_states
+        elif q_backend == "dict" and max_q_table_size:
+            # A warm start is a read-only snapshot the bounded table reads through to
+            self.q_table = BoundedQTable(max_q_table_size, eviction_policy, base=warm_start)
+            self.visited_states = self.q_table.visited_states
+        elif q_backend == "dense" or warm_start is not None:
+            # ...or layered under a dense table (unbounded backends)
+            self.q_backend = "dense"
+            self.q_table = DenseQTable(state_space_size, base=warm_start)
+            self.visited_states = self.q_table.visited_states
+        elif q_backend == "dict":
+            self.q_table = {}
+            self.visited_states = set()
+        else:
+            raise ValueError(f"Unknown Q-table backend: {q_backend}")
     
     def get_state_key(self, state: List[int]) -> Tuple[int]:
         """Convert state to a hashable key"""
@@ -29,6 +53,22 @@ class QLearningAgent:
         state_key = self.get_state_key(state)
         return self.q_table.get((state_key, action), 0.0)
     
+    def get_q_values(self, state: List[int]) -> np.ndarray:
+        """Q-values of every (row, col) action as a flat row-major array"""
+        if self.q_backend == "dense":
+            values = self.q_table.peek_row(state)
+            if values is None:
+                return np.zeros(self.state_space_size * self.action_space_size)
+            return values.astype(float)
+        return np.array([self.get_q_value(state, (r, c))
+                         for r in range(self.state_space_size)
+                         for c in range(self.action_space_size)])
+    
+    def _move_mask(self, state: List[int]) -> np.ndarray:
+        """Flat mask of actions that actually move a queen"""
+        cols = np.arange(self.action_space_size)
+        return (cols[None, :] != np.asarray(state)[:, None]).ravel()
+    
     def choose_action(self, state: List[int]) -> Tuple[int, int]:
         """Choose action using ε-greedy policy with decay"""
         state_key = self.get_state_key(state)
@@ -47,64 +87,28 @@ class QLearningAgent:
             if not possible_cols:
                 return (0, 0)  # Fallback if no possible moves
         
-        # Score each possible move by potential conflict reduction
-            scored_cols = []
-            for col in possible_cols:
-                temp_state = list(state)
-                temp_state[row] = col
-            # Calculate conflicts using the environment's method
-                conflicts = self._count_conflicts_if_change(row, col)
-                scored_cols.append((col, conflicts))
-        
-        # Prefer moves with lower conflicts
-            scored_cols.sort(key=lambda x: x[1])
-            new_col = scored_cols[0][0] if scored_cols else state[row]
+        # Score each possible move by potential conflict reduction,
+        # preferring moves with lower conflicts (ties go to the lowest column)
+            deltas = self.env.get_move_deltas()[row].astype(float)
+            deltas[state[row]] = math.inf
+            new_col = int(np.argmin(deltas))
         
             return (row, new_col)
         else:
-        # Exploitation: best known action
-            best_value = -math.inf
-            best_actions = []
+        # Exploitation: best known action, ties broken at random
+            values = self.get_q_values(state)
+            values[~self._move_mask(state)] = -math.inf
+            best_value = values.max()
+            if best_value == -math.inf:
+                return (0, 0)
+            best_actions = np.flatnonzero(values == best_value)
         
-        # Evaluate all possible actions
-            for row in range(self.state_space_size):
-                current_col = state[row]
-                for new_col in range(self.action_space_size):
-                    if new_col != current_col:  # Only consider moves
-                        action = (row, new_col)
-                        value = self.get_q_value(state, action)
-                    
-                        if value > best_value:
-                            best_value = value
-                            best_actions = [action]
-                        elif value == best_value:
-                            best_actions.append(action)
-        
-            return random.choice(best_actions) if best_actions else (0, 0)
+            row, new_col = divmod(int(random.choice(best_actions)), self.action_space_size)
+            return (row, new_col)
 
     def _count_conflicts_if_change(self, row: int, col: int) -> int:
         """Count conflicts if a queen were placed at (row, col)"""
-    # Create a temporary state with the proposed move
-        temp_state = list(self.env.queens)
-        temp_state[row] = col
-    
-    # Calculate conflicts using the same method as the environment
-        queens = np.array(temp_state)
-        rows = np.arange(len(queens))
-
-    # Column conflicts
-        _, counts = np.unique(queens, return_counts=True)
-        col_conflicts = int(np.sum(counts * (counts - 1) // 2))
-
-    # Diagonal conflicts
-        diag1 = rows - queens
-        diag2 = rows + queens
-        _, counts1 = np.unique(diag1, return_counts=True)
-        _, counts2 = np.unique(diag2, return_counts=True)
-        diag_conflicts = int(np.sum(counts1 * (counts1 - 1) // 2) +
-                         np.sum(counts2 * (counts2 - 1) // 2))
-
-        return col_conflicts + diag_conflicts
+        return self.env._count_conflicts_if_change(row, col)
 
     def learn(self, state: List[int], action: Tuple[int, int],
               reward: float, new_state: List[int], done: bool) -> None:
@@ -117,13 +121,8 @@ class QLearningAgent:
         if done:
             max_future_q = 0
         else:
-            max_future_q = max(
-                [self.get_q_value(new_state, (r, c))
-                 for r in range(self.state_space_size)
-                 for c in range(self.action_space_size)
-                 if new_state[r] != c],
-                default=0
-            )
+            future_q = self.get_q_values(new_state)[self._move_mask(new_state)]
+            max_future_q = future_q.max() if future_q.size else 0
         
         # Bellman equation with learning rate
         new_q = current_q + self.learning_rate * (
@@ -132,3 +131,101 @@ class QLearningAgent:
         
         # Update Q-table
         self.q_table[(state_key, action)] = new_q
+    
+    def choose_actions(self, states: np.ndarray) -> np.ndarray:
+        """Batched ε-greedy policy over a [B, n] array of boards.
+
+        Returns a [B, 2] array of (row, new_col) actions. The exploration
+        rate decays once per call, i.e. once per vectorized step.
+        """
+        states = np.asarray(states)
+        batch, n = states.shape
+        self.exploration_rate = max(
+            config.MIN_EXPLORATION_RATE,
+            self.exploration_rate * self.exploration_decay
+        )
+        
+        explore = np.random.random(batch) < self.exploration_rate
+        if self.q_backend == "dense":
+            explore |= ~self.q_table.visited_mask(states)
+        else:
+            explore |= np.array([self.get_state_key(s) not in self.visited_states
+                                 for s in states.tolist()])
+        actions = np.zeros((batch, 2), dtype=np.int64)
+        
+        if explore.any():
+            # Lowest-conflict column for a random row, as in choose_action()
+            boards = states[explore]
+            rows = np.random.randint(0, n, size=len(boards))
+            deltas = row_move_deltas(boards, rows).astype(float)
+            deltas[np.arange(len(boards)), boards[np.arange(len(boards)), rows]] = math.inf
+            actions[explore, 0] = rows
+            actions[explore, 1] = np.argmin(deltas, axis=1)
+        
+        exploit = ~explore
+        if exploit.any():
+            values = self._q_matrix(states[exploit])
+            values[~self._move_masks(states[exploit])] = -math.inf
+            # Random tie-break: argmax of random noise over the best actions
+            best = values == values.max(axis=1, keepdims=True)
+            choice = np.argmax(best * np.random.random(best.shape), axis=1)
+            actions[exploit, 0], actions[exploit, 1] = np.divmod(choice, self.action_space_size)
+        
+        return actions
+    
+    def _q_matrix(self, states: np.ndarray) -> np.ndarray:
+        if self.q_backend == "dense":
+            # One gather for the whole batch instead of a row lookup per board
+            return self.q_table.peek_rows(states).astype(float)
+        return np.stack([self.get_q_values(s) for s in states.tolist()])
+    
+    def _move_masks(self, states: np.ndarray) -> np.ndarray:
+        cols = np.arange(self.action_space_size)
+        return (cols[None, None, :] != states[:, :, None]).reshape(len(states), -1)
+    
+    def _learn_dense(self, states: np.ndarray, actions: np.ndarray, rewards: np.ndarray,
+                     max_future_q: np.ndarray) -> None:
+        """Vectorized learn_batch() for array tables. A (state, action) pair
+        repeated in the batch is applied in rounds, each reading the value
+        the previous round wrote, so the result matches one-by-one updates."""
+        action_index = actions[:, 0] * self.action_space_size + actions[:, 1]
+        pairs = self.q_table.state_indices(states) * self.action_space_size ** 2 + action_index
+        order = np.argsort(pairs, kind="stable")
+        first = np.r_[True, pairs[order][1:] != pairs[order][:-1]]
+        starts = np.flatnonzero(first)
+        rounds = np.empty(len(pairs), dtype=np.int64)
+        rounds[order] = np.arange(len(pairs)) - np.repeat(starts, np.diff(np.r_[starts, len(pairs)]))
+        for r in range(int(rounds.max()) + 1 if len(pairs) else 0):
+            batch = np.flatnonzero(rounds == r)
+            boards, moves = states[batch], action_index[batch]
+            current_q = self._q_matrix(boards)[np.arange(len(batch)), moves]
+            new_q = current_q + self.learning_rate * (
+                rewards[batch] + self.discount_factor * max_future_q[batch] - current_q
+            )
+            self.q_table.update_rows(boards, moves, new_q)
+    
+    def learn_batch(self, states: np.ndarray, actions: np.ndarray, rewards: np.ndarray,
+                    new_states: np.ndarray, dones: np.ndarray) -> None:
+        """Bellman update for a batch of transitions from VecNQueensEnv.step()"""
+        states = np.asarray(states)
+        new_states = np.asarray(new_states)
+        actions = np.asarray(actions)
+        
+        future_q = self._q_matrix(new_states)
+        future_q[~self._move_masks(new_states)] = -math.inf
+        max_future_q = np.where(dones, 0.0, future_q.max(axis=1))
+        
+        if self.q_backend == "dense":
+            self._learn_dense(states, actions, np.asarray(rewards, dtype=float), max_future_q)
+            return
+        
+        for state, action, reward, future in zip(states.tolist(), actions.tolist(),
+                                                  np.asarray(rewards).tolist(),
+                                                  max_future_q.tolist()):
+            state_key = self.get_state_key(state)
+            self.visited_states.add(state_key)
+            action = tuple(action)
+            current_q = self.get_q_value(state, action)
+            self.q_table[(state_key, action)] = current_q + self.learning_rate * (
+                reward + self.discount_factor * future - current_q
+            )
@@ -0,0 +1,503 @@
+import heapq
+import itertools
+from collections import OrderedDict
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+import config
+
+
+class DenseQTable:
+    """Q-values stored in float32 arrays indexed by an integer state code.
+
+    A board state (one column per row) is encoded as a mixed-radix number
+    sum(queens[r] * n**r), which gives n**n distinct indices. Each state
+    seen gets a slot holding its n*n action values; slots are allocated
+    lazily, `chunk_states` rows at a time, so memory grows with the
+    visited states only (4 bytes per Q-value plus one int->int dict
+    entry per state).
+
+    The table also accepts the ((state), (row, col)) keys used by the
+    dict backend, so `agent.q_table.get(key, 0.0)` keeps working.
+
+    `base` is an optional read-only table (a loaded snapshot) used as a
+    warm start: its rows are read through until a state is first written,
+    at which point the row is copied into this table.
+    """
+
+    def __init__(self, board_size: int, chunk_states: int = config.DENSE_Q_CHUNK_STATES,
+                 base=None):
+        if not (config.BOARD_SIZE_MIN <= board_size <= config.BOARD_SIZE_MAX):
+            raise ValueError(f"Dense Q-table supports board sizes "
+                             f"{config.BOARD_SIZE_MIN}-{config.BOARD_SIZE_MAX}, got {board_size}")
+        self.board_size = board_size
+        self.num_actions = board_size * board_size
+        self.num_states = board_size ** board_size
+        self.chunk_states = chunk_states
+        self.base = base
+        self._radix = [board_size ** r for r in range(board_size)]
+        self._slots: Dict[int, int] = {}
+        self._chunks: List[np.ndarray] = []
+        self._visited: List[np.ndarray] = []
+        self.visited_states = _VisitedView(self)
+
+    def state_index(self, state: List[int]) -> int:
+        """Mixed-radix index of a board state"""
+        return sum(c * r for c, r in zip(state, self._radix))
+
+    def state_indices(self, states: np.ndarray) -> np.ndarray:
+        """state_index() of every board in a [B, n] batch"""
+        return np.asarray(states, dtype=np.int64) @ np.array(self._radix, dtype=np.int64)
+
+    def index_to_state(self, index: int) -> Tuple[int, ...]:
+        """Inverse of state_index()"""
+        return tuple(index // r % self.board_size for r in self._radix)
+
+    def action_index(self, action: Tuple[int, int]) -> int:
+        row, col = action
+        return row * self.board_size + col
+
+    def _slot(self, state: List[int], create: bool) -> Optional[int]:
+        return self._slot_at(self.state_index(state), create)
+
+    def _slot_at(self, index: int, create: bool) -> Optional[int]:
+        slot = self._slots.get(index)
+        if slot is None and create:
+            slot = len(self._slots)
+            if slot == len(self._chunks) * self.chunk_states:
+                self._chunks.append(np.zeros((self.chunk_states, self.num_actions), dtype=np.float32))
+                self._visited.append(np.zeros(self.chunk_states, dtype=bool))
+            self._slots[index] = slot
+            if self.base is not None:
+                base_row = self.base.peek_index(index)
+                if base_row is not None:
+                    chunk_id, offset = divmod(slot, self.chunk_states)
+                    self._chunks[chunk_id][offset] = base_row
+                    self._visited[chunk_id][offset] = True
+        return slot
+
+    def row(self, state: List[int]) -> np.ndarray:
+        """Writable view of all action values for `state` (allocates if needed)"""
+        chunk_id, offset = divmod(self._slot(state, create=True), self.chunk_states)
+        return self._chunks[chunk_id][offset]
+
+    def peek_row(self, state: List[int]) -> Optional[np.ndarray]:
+        """Lookup that never allocates; None for states without a slot"""
+        slot = self._slot(state, create=False)
+        if slot is None:
+            return None if self.base is None else self.base.peek_row(state)
+        chunk_id, offset = divmod(slot, self.chunk_states)
+        return self._chunks[chunk_id][offset]
+
+    def _slots_for(self, indices: np.ndarray, create: bool) -> np.ndarray:
+        """Slot of each state index, -1 for states without one"""
+        if create:
+            return np.array([self._slot_at(i, True) for i in indices.tolist()], dtype=np.int64)
+        slots = self._slots
+        return np.array([slots.get(i, -1) for i in indices.tolist()], dtype=np.int64)
+
+    def _by_chunk(self, slots: np.ndarray):
+        """(chunk id, batch mask, offsets) for each chunk the allocated slots fall in"""
+        chunk_ids, offsets = np.divmod(slots, self.chunk_states)
+        for chunk_id in np.unique(chunk_ids[slots >= 0]).tolist():
+            hit = chunk_ids == chunk_id
+            yield chunk_id, hit, offsets[hit]
+
+    def peek_rows(self, states: np.ndarray) -> np.ndarray:
+        """peek_row() for a [B, n] batch as one [B, n*n] array; states
+        without a slot read from the base, or are zeros"""
+        indices = self.state_indices(states)
+        slots = self._slots_for(indices, create=False)
+        values = np.zeros((len(slots), self.num_actions), dtype=np.float32)
+        for chunk_id, hit, offsets in self._by_chunk(slots):
+            values[hit] = self._chunks[chunk_id][offsets]
+        missing = slots < 0
+        if self.base is not None and missing.any():
+            found, rows = self.base.peek_indices(indices[missing])
+            values[np.flatnonzero(missing)[found]] = rows[found]
+        return values
+
+    def visited_mask(self, states: np.ndarray) -> np.ndarray:
+        """Whether each board of a [B, n] batch is in visited_states"""
+        indices = self.state_indices(states)
+        slots = self._slots_for(indices, create=False)
+        visited = np.zeros(len(slots), dtype=bool)
+        for chunk_id, hit, offsets in self._by_chunk(slots):
+            visited[hit] = self._visited[chunk_id][offsets]
+        missing = slots < 0
+        if self.base is not None and missing.any():
+            visited[missing] = self.base.peek_indices(indices[missing])[0]
+        return visited
+
+    def update_rows(self, states: np.ndarray, actions: np.ndarray, values: np.ndarray) -> None:
+        """Set one action value per board of a [B, n] batch (`actions` are
+        flat action indices) and mark those states visited. A state that
+        appears twice keeps the last write."""
+        slots = self._slots_for(self.state_indices(states), create=True)
+        for chunk_id, hit, offsets in self._by_chunk(slots):
+            self._chunks[chunk_id][offsets, actions[hit]] = values[hit]
+            self._visited[chunk_id][offsets] = True
+
+    def get(self, key, default: float = 0.0) -> float:
+        state, action = key
+        values = self.peek_row(state)
+        if values is None:
+            return default
+        return float(values[self.action_index(action)])
+
+    def __getitem__(self, key) -> float:
+        return self.get(key)
+
+    def __setitem__(self, key, value: float) -> None:
+        state, action = key
+        self.row(state)[self.action_index(action)] = value
+
+    def __contains__(self, key) -> bool:
+        """True once the key's state has a slot (or is in the warm-start base)"""
+        state, _ = key
+        return self.state_index(state) in self._slots or (self.base is not None and key in self.base)
+
+    def __len__(self) -> int:
+        """Number of states that hold Q-values"""
+        return len(self._slots)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(c.nbytes for c in self._chunks)
+
+
+class DirectQTable:
+    """Q-values for every one of the n**n states in one flat float32 array.
+
+    Unlike DenseQTable there is no slot map: a state's row lives at its
+    mixed-radix index, which lets several processes share the table
+    through a `buffer` (e.g. multiprocessing.shared_memory) without any
+    coordination. Untouched pages of a shared-memory buffer are never
+    materialised by the OS, so sparse use stays cheap.
+    """
+
+    def __init__(self, board_size: int, buffer=None):
+        self.board_size = board_size
+        self.num_actions = board_size * board_size
+        self.num_states = board_size ** board_size
+        self._radix = [board_size ** r for r in range(board_size)]
+        if buffer is None:
+            buffer = bytearray(self.required_bytes(board_size))
+        values_bytes = self.num_states * self.num_actions * 4
+        self.values = np.ndarray((self.num_states, self.num_actions), dtype=np.float32,
+                                 buffer=buffer)
+        self.visited = np.ndarray((self.num_states,), dtype=bool,
+                                  buffer=buffer, offset=values_bytes)
+        self.visited_states = _DirectVisitedView(self)
+
+    @staticmethod
+    def required_bytes(board_size: int) -> int:
+        """Buffer size for a board: float32 values plus one visited flag per state"""
+        num_states = board_size ** board_size
+        return num_states * board_size * board_size * 4 + num_states
+
+    def state_index(self, state: List[int]) -> int:
+        """Mixed-radix index of a board state"""
+        return sum(c * r for c, r in zip(state, self._radix))
+
+    def state_indices(self, states: np.ndarray) -> np.ndarray:
+        """state_index() of every board in a [B, n] batch"""
+        return np.asarray(states, dtype=np.int64) @ np.array(self._radix, dtype=np.int64)
+
+    def action_index(self, action: Tuple[int, int]) -> int:
+        row, col = action
+        return row * self.board_size + col
+
+    def row(self, state: List[int]) -> np.ndarray:
+        return self.values[self.state_index(state)]
+
+    def peek_row(self, state: List[int]) -> np.ndarray:
+        return self.values[self.state_index(state)]
+
+    def peek_rows(self, states: np.ndarray) -> np.ndarray:
+        return self.values[self.state_indices(states)]
+
+    def visited_mask(self, states: np.ndarray) -> np.ndarray:
+        return self.visited[self.state_indices(states)]
+
+    def update_rows(self, states: np.ndarray, actions: np.ndarray, values: np.ndarray) -> None:
+        """See DenseQTable.update_rows()"""
+        indices = self.state_indices(states)
+        self.values[indices, actions] = values
+        self.visited[indices] = True
+
+    def get(self, key, default: float = 0.0) -> float:
+        state, action = key
+        return float(self.values[self.state_index(state), self.action_index(action)])
+
+    def __getitem__(self, key) -> float:
+        return self.get(key)
+
+    def __setitem__(self, key, value: float) -> None:
+        state, action = key
+        self.values[self.state_index(state), self.action_index(action)] = value
+
+    def __contains__(self, key) -> bool:
+        state, _ = key
+        return bool(self.visited[self.state_index(state)])
+
+    def __len__(self) -> int:
+        """Number of visited states"""
+        return int(np.count_nonzero(self.visited))
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes + self.visited.nbytes
+
+
+class _DirectVisitedView:
+    """Set-like view over DirectQTable.visited.
+
+    Holds the flag array rather than the table so no reference cycle keeps
+    a shared-memory buffer exported after the table is dropped.
+    """
+
+    def __init__(self, table: DirectQTable):
+        self._visited = table.visited
+        self._radix = table._radix
+
+    def _state_index(self, state_key) -> int:
+        return sum(c * r for c, r in zip(state_key, self._radix))
+
+    def add(self, state_key: Tuple[int, ...]) -> None:
+        self._visited[self._state_index(state_key)] = True
+
+    def discard(self, state_key: Tuple[int, ...]) -> None:
+        self._visited[self._state_index(state_key)] = False
+
+    def __contains__(self, state_key) -> bool:
+        return bool(self._visited[self._state_index(state_key)])
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._visited))
+
+
+class _VisitedView:
+    """Set-like view over the dense table's visited flags"""
+
+    def __init__(self, table: DenseQTable):
+        self._table = table
+
+    def _locate(self, state_key) -> Optional[Tuple[int, int]]:
+        slot = self._table._slot(state_key, create=False)
+        return None if slot is None else divmod(slot, self._table.chunk_states)
+
+    def add(self, state_key: Tuple[int, ...]) -> None:
+        chunk_id, offset = divmod(self._table._slot(state_key, create=True),
+                                  self._table.chunk_states)
+        self._table._visited[chunk_id][offset] = True
+
+    def discard(self, state_key: Tuple[int, ...]) -> None:
+        location = self._locate(state_key)
+        if location is not None:
+            self._table._visited[location[0]][location[1]] = False
+
+    def __contains__(self, state_key) -> bool:
+        location = self._locate(state_key)
+        if location is None:
+            base = self._table.base
+            return base is not None and state_key in base.visited_states
+        return bool(self._table._visited[location[0]][location[1]])
+
+    def __len__(self) -> int:
+        return int(sum(v.sum() for v in self._table._visited))
+
+
+class EvictionPolicy:
+    """Decides which Q-table entry to drop when a BoundedQTable is full"""
+
+    def on_insert(self, key, value: float) -> None:
+        pass
+
+    def on_access(self, key, value: float) -> None:
+        pass
+
+    def on_update(self, key, value: float) -> None:
+        self.on_access(key, value)
+
+    def on_remove(self, key) -> None:
+        pass
+
+    def victim(self, table: Dict):
+        raise NotImplementedError
+
+
+class LRUEviction(EvictionPolicy):
+    """Evict the least recently read or written entry"""
+
+    def __init__(self):
+        self._order: "OrderedDict" = OrderedDict()
+
+    def on_insert(self, key, value: float) -> None:
+        self._order[key] = None
+
+    def on_access(self, key, value: float) -> None:
+        self._order.move_to_end(key)
+
+    def on_remove(self, key) -> None:
+        self._order.pop(key, None)
+
+    def victim(self, table: Dict):
+        return next(iter(self._order))
+
+
+class _HeapEviction(EvictionPolicy):
+    """Min-heap of (priority, key) with lazy invalidation of stale entries"""
+
+    def __init__(self):
+        self._heap: List = []
+        self._priority: Dict = {}
+        self._counter = itertools.count()
+
+    def _push(self, key, priority: float) -> None:
+        self._priority[key] = priority
+        heapq.heappush(self._heap, (priority, next(self._counter), key))
+        if len(self._heap) > 2 * len(self._priority) + 64:
+            self._heap = [(p, next(self._counter), k) for k, p in self._priority.items()]
+            heapq.heapify(self._heap)
+
+    def on_remove(self, key) -> None:
+        self._priority.pop(key, None)
+
+    def victim(self, table: Dict):
+        while True:
+            priority, _, key = self._heap[0]
+            if self._priority.get(key) == priority:
+                return key
+            heapq.heappop(self._heap)
+
+
+class LFUEviction(_HeapEviction):
+    """Evict the least frequently used entry"""
+
+    def on_insert(self, key, value: float) -> None:
+        self._push(key, 1)
+
+    def on_access(self, key, value: float) -> None:
+        self._push(key, self._priority.get(key, 0) + 1)
+
+
+class LowestAbsQEviction(_HeapEviction):
+    """Evict the entry whose |Q| is smallest, i.e. the least informative one"""
+
+    def on_insert(self, key, value: float) -> None:
+        self._push(key, abs(value))
+
+    def on_update(self, key, value: float) -> None:
+        self._push(key, abs(value))
+
+
+EVICTION_POLICIES = {
+    "lru": LRUEviction,
+    "lfu": LFUEviction,
+    "lowest_abs_q": LowestAbsQEviction,
+}
+
+
+class BoundedQTable:
+    """Dict-style Q-table capped at `max_size` (state, action) entries.
+
+    Once full, every new entry evicts one chosen by the eviction policy.
+    A state is dropped from `visited_states` when its last entry goes, so
+    both structures stay bounded in a long-running server process.
+
+    `base` is an optional read-only table (a loaded snapshot) consulted on
+    local misses. Its values are read through, not copied in, so they do
+    not count towards `max_size`.
+    """
+
+    def __init__(self, max_size: int = config.MAX_Q_TABLE_SIZE,
+                 policy: str = config.Q_TABLE_EVICTION_POLICY, base=None):
+        if max_size < 1:
+            raise ValueError(f"max_size must be positive, got {max_size}")
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy: {policy}")
+        self.max_size = max_size
+        self.policy_name = policy
+        self._policy = EVICTION_POLICIES[policy]()
+        self._data: Dict = {}
+        self._state_entries: Dict[Tuple[int, ...], int] = {}
+        self.base = base
+        self.visited_states = set() if base is None else _LayeredVisitedView(base)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default: float = 0.0) -> float:
+        value = self._data.get(key)
+        if value is None:
+            self.misses += 1
+            if self.base is not None and key in self.base:
+                return self.base.get(key, default)
+            return default
+        self.hits += 1
+        self._policy.on_access(key, value)
+        return value
+
+    def __getitem__(self, key) -> float:
+        value = self.get(key, None)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value: float) -> None:
+        if key in self._data:
+            self._data[key] = value
+            self._policy.on_update(key, value)
+            return
+        state_key = key[0]
+        if len(self._data) >= self.max_size:
+            self._evict(keep_visited=state_key)
+        self._data[key] = value
+        self._state_entries[state_key] = self._state_entries.get(state_key, 0) + 1
+        self._policy.on_insert(key, value)
+
+    def _evict(self, keep_visited=None) -> None:
+        """Drop the policy's victim; `keep_visited` is the state about to get
+        a new entry, which stays in visited_states even if this was its last"""
+        key = self._policy.victim(self._data)
+        del self._data[key]
+        self._policy.on_remove(key)
+        self.evictions += 1
+        state_key = key[0]
+        remaining = self._state_entries[state_key] - 1
+        if remaining:
+            self._state_entries[state_key] = remaining
+        else:
+            del self._state_entries[state_key]
+            if state_key != keep_visited:
+                self.visited_states.discard(state_key)
+
+    def __contains__(self, key) -> bool:
+        return key in self._data or (self.base is not None and key in self.base)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def items(self):
+        return self._data.items()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "policy": self.policy_name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class _LayeredVisitedView(set):
+    """Locally visited states plus every state stored in a warm-start base"""
+
+    def __init__(self, base):
+        super().__init__()
+        self._base = base
+
+    def __contains__(self, state_key) -> bool:
+        return super().__contains__(state_key) or state_key in self._base.visited_states
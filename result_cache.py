@@ -0,0 +1,103 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import config
+
+
+def result_key(algorithm: str, n: int, seed: Optional[int], params: Dict[str, Any]) -> str:
+    """Stable string key; params are sorted so query order does not matter"""
+    return json.dumps([algorithm, n, seed, sorted(params.items())])
+
+
+class ResultCache:
+    """LRU cache of solver results, bounded by entry count and total cost.
+
+    Costs are caller-supplied (the solve endpoints use history cells, i.e.
+    boards × n) so a few large histories cannot pin unbounded memory. With
+    a `path`, the cache is loaded from and rewritten to a JSON file so
+    results survive restarts.
+    """
+
+    def __init__(self, max_entries: int = config.RESULT_CACHE_MAX_ENTRIES,
+                 max_cost: int = config.RESULT_CACHE_MAX_COST,
+                 path: Optional[str] = config.RESULT_CACHE_PATH):
+        self.max_entries = max_entries
+        self.max_cost = max_cost
+        self.path = path
+        self._entries: "OrderedDict[str, Tuple[Dict, int]]" = OrderedDict()
+        self._cost = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+        if path and os.path.exists(path):
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, result: Dict, cost: int = 1) -> None:
+        if cost > self.max_cost:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._cost -= old[1]
+            self._entries[key] = (result, cost)
+            self._cost += cost
+            while len(self._entries) > self.max_entries or self._cost > self.max_cost:
+                _, (_, evicted_cost) = self._entries.popitem(last=False)
+                self._cost -= evicted_cost
+                self.evictions += 1
+            if self.path:
+                self._save()
+
+    def get_or_compute(self, key: str, compute: Callable[[], Dict],
+                       cost: Callable[[Dict], int] = lambda result: 1) -> Tuple[Dict, bool]:
+        """(result, cached?) — concurrent misses on one key may both compute"""
+        result = self.get(key)
+        if result is not None:
+            return result, True
+        result = compute()
+        self.put(key, result, cost(result))
+        return result, False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._cost = 0
+            if self.path:
+                self._save()
+
+    def stats(self) -> Dict[str, int]:
+        return {'entries': len(self._entries), 'cost': self._cost, 'hits': self.hits,
+                'misses': self.misses, 'evictions': self.evictions}
+
+    def _save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump([[key, result, cost] for key, (result, cost) in self._entries.items()], f)
+        os.replace(tmp, self.path)
+
+    def _load(self) -> None:
+        with open(self.path) as f:
+            for key, result, cost in json.load(f)[-self.max_entries:]:
+                self._entries[key] = (result, cost)
+                self._cost += cost
+        while self._cost > self.max_cost:
+            _, (_, evicted_cost) = self._entries.popitem(last=False)
+            self._cost -= evicted_cost
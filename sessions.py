@@ -0,0 +1,110 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import List, Optional
+
+import config
+
+
+class SessionLimitError(Exception):
+    """Raised when the registry is full of sessions that are still active"""
+
+
+class Session:
+    """One user's simulation: an environment/agent pair and its step history.
+
+    Hold `lock` while touching any of the attributes; requests for the same
+    session are serialised, different sessions run concurrently.
+    """
+
+    def __init__(self, session_id: str):
+        self.id = session_id
+        self.lock = threading.Lock()
+        self.env = None
+        self.agent = None
+        self.current_state: Optional[List[int]] = None
+        self.history: List[dict] = []
+        self.action_log: List[str] = []
+        self.start_time: Optional[float] = None
+        self.last_used = time.monotonic()
+
+    def start(self, env, agent) -> List[int]:
+        """Install a fresh env/agent pair and reset the board"""
+        self.env = env
+        self.agent = agent
+        self.current_state = env.reset()
+        self.history = []
+        self.action_log = []
+        self.start_time = time.time()
+        return self.current_state
+
+    @property
+    def initialized(self) -> bool:
+        return self.env is not None and self.agent is not None
+
+
+class SessionRegistry:
+    """In-process session store with idle-TTL eviction and a size cap.
+
+    Sessions live in this process only, so multi-worker deployments need
+    sticky routing on the session cookie/header.
+    """
+
+    def __init__(self, max_sessions: int = config.SESSION_MAX,
+                 ttl: float = config.SESSION_TTL_SECONDS):
+        self.max_sessions = max_sessions
+        self.ttl = ttl
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, session_id: Optional[str]) -> Optional[Session]:
+        """Live session for `session_id`, refreshing its idle timer"""
+        if not session_id:
+            return None
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                return None
+            now = time.monotonic()
+            if now - session.last_used > self.ttl:
+                del self._sessions[session_id]
+                return None
+            session.last_used = now
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def get_or_create(self, session_id: Optional[str]) -> Session:
+        session = self.get(session_id)
+        if session is not None:
+            return session
+        with self._lock:
+            self._evict_idle()
+            if len(self._sessions) >= self.max_sessions:
+                raise SessionLimitError(f"Too many active sessions ({self.max_sessions})")
+            session = Session(uuid.uuid4().hex)
+            self._sessions[session.id] = session
+            return session
+
+    def remove(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def evict_idle(self) -> int:
+        with self._lock:
+            return self._evict_idle()
+
+    def _evict_idle(self) -> int:
+        # Sessions are kept in last-used order, so expired ones are at the front
+        cutoff = time.monotonic() - self.ttl
+        evicted = 0
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session.last_used > cutoff:
+                break
+            del self._sessions[session_id]
+            evicted += 1
+        return evicted
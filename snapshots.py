@@ -0,0 +1,180 @@
+import os
+import struct
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import config
+from qtable import BoundedQTable, DenseQTable, DirectQTable
+
+# Layout (little endian):
+#   header  magic "NQQT", version u16, board_size u16, num_actions u32,
+#           num_states u64, 16 reserved bytes -> 36 bytes, padded to 64
+#   indices int64[num_states]              sorted mixed-radix state indices
+#   values  float32[num_states, num_actions]
+MAGIC = b"NQQT"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIQ16x")
+HEADER_SIZE = 64
+
+
+def snapshot_path(board_size: int, directory: str = config.Q_SNAPSHOT_DIR) -> str:
+    return os.path.join(directory, f"qtable_{board_size}.npq")
+
+
+def _table_rows(table, board_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Sorted state indices and their action-value rows for any Q-table backend"""
+    num_actions = board_size * board_size
+    radix = [board_size ** r for r in range(board_size)]
+
+    if isinstance(table, DenseQTable):
+        indices = np.fromiter(table._slots.keys(), dtype=np.int64, count=len(table._slots))
+        slots = np.fromiter(table._slots.values(), dtype=np.int64, count=len(table._slots))
+        if slots.size:
+            values = np.concatenate(table._chunks)[slots]
+        else:
+            values = np.zeros((0, num_actions), dtype=np.float32)
+        if table.base is not None:
+            # Carry over warm-start rows that were never rewritten locally
+            base_only = np.setdiff1d(np.asarray(table.base.indices), indices)
+            indices = np.concatenate([indices, base_only])
+            values = np.concatenate([values, table.base.rows_for(base_only)])
+    elif isinstance(table, DirectQTable):
+        # Every write marks its state visited, so the flags alone locate the rows
+        indices = np.flatnonzero(table.visited).astype(np.int64)
+        values = table.values[indices]
+    elif isinstance(table, (dict, BoundedQTable)):
+        base = getattr(table, "base", None)
+        rows: Dict[int, np.ndarray] = {}
+        for (state, (row, col)), value in table.items():
+            index = sum(c * r for c, r in zip(state, radix))
+            if index not in rows:
+                base_row = None if base is None else base.peek_index(index)
+                rows[index] = (np.zeros(num_actions, dtype=np.float32) if base_row is None
+                               else np.array(base_row, dtype=np.float32))
+            rows[index][row * board_size + col] = value
+        indices = np.fromiter(rows.keys(), dtype=np.int64, count=len(rows))
+        values = np.array(list(rows.values()), dtype=np.float32).reshape(-1, num_actions)
+        if base is not None:
+            # Carry over warm-start rows the bounded table never wrote
+            base_only = np.setdiff1d(np.asarray(base.indices), indices)
+            indices = np.concatenate([indices, base_only])
+            values = np.concatenate([values, base.rows_for(base_only)])
+    else:
+        raise TypeError(f"Cannot snapshot Q-table of type {type(table).__name__}")
+
+    order = np.argsort(indices, kind="stable")
+    return indices[order], values[order].astype(np.float32, copy=False)
+
+
+def save_snapshot(path: str, table, board_size: int) -> int:
+    """Write `table` to `path` atomically; returns the number of states stored"""
+    indices, values = _table_rows(table, board_size)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        header = HEADER.pack(MAGIC, VERSION, board_size, board_size * board_size, len(indices))
+        f.write(header.ljust(HEADER_SIZE, b"\0"))
+        f.write(indices.tobytes())
+        f.write(np.ascontiguousarray(values).tobytes())
+    os.replace(tmp_path, path)
+    return len(indices)
+
+
+class SnapshotQTable:
+    """Read-only, memory-mapped view of a saved Q-table.
+
+    Pages are shared through the OS page cache, so every server worker
+    mapping the same file pays for it once. Lookups binary-search the
+    sorted state indices.
+    """
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            magic, version, board_size, num_actions, num_states = HEADER.unpack(
+                f.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a Q-table snapshot")
+        if version != VERSION:
+            raise ValueError(f"Unsupported snapshot version {version} in {path}")
+        self.path = path
+        self.board_size = board_size
+        self.num_actions = num_actions
+        self._radix = [board_size ** r for r in range(board_size)]
+        if num_states:
+            self.indices = np.memmap(path, dtype=np.int64, mode="r",
+                                     offset=HEADER_SIZE, shape=(num_states,))
+            self.values = np.memmap(path, dtype=np.float32, mode="r",
+                                    offset=HEADER_SIZE + num_states * 8,
+                                    shape=(num_states, num_actions))
+        else:
+            self.indices = np.zeros(0, dtype=np.int64)
+            self.values = np.zeros((0, num_actions), dtype=np.float32)
+        self.visited_states = _SnapshotVisitedView(self)
+
+    def state_index(self, state: List[int]) -> int:
+        return sum(c * r for c, r in zip(state, self._radix))
+
+    def _position(self, index: int) -> Optional[int]:
+        pos = int(np.searchsorted(self.indices, index))
+        if pos < len(self.indices) and self.indices[pos] == index:
+            return pos
+        return None
+
+    def peek_index(self, index: int) -> Optional[np.ndarray]:
+        pos = self._position(index)
+        return None if pos is None else self.values[pos]
+
+    def peek_row(self, state: List[int]) -> Optional[np.ndarray]:
+        return self.peek_index(self.state_index(state))
+
+    def rows_for(self, indices: np.ndarray) -> np.ndarray:
+        """Rows for indices known to be present"""
+        return np.asarray(self.values[np.searchsorted(self.indices, indices)])
+
+    def peek_indices(self, indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """(found mask, rows) for a batch of indices; rows of missing ones are zeros"""
+        if not len(self.indices):
+            return (np.zeros(len(indices), dtype=bool),
+                    np.zeros((len(indices), self.num_actions), dtype=np.float32))
+        pos = np.minimum(np.searchsorted(self.indices, indices), len(self.indices) - 1)
+        found = self.indices[pos] == indices
+        return found, np.where(found[:, None], self.values[pos], 0).astype(np.float32)
+
+    def get(self, key, default: float = 0.0) -> float:
+        state, (row, col) = key
+        values = self.peek_row(state)
+        return default if values is None else float(values[row * self.board_size + col])
+
+    def __contains__(self, key) -> bool:
+        state, _ = key
+        return self._position(self.state_index(state)) is not None
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+
+class _SnapshotVisitedView:
+    """Every stored state counts as visited"""
+
+    def __init__(self, table: SnapshotQTable):
+        self._table = table
+
+    def __contains__(self, state_key) -> bool:
+        return self._table._position(self._table.state_index(state_key)) is not None
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+
+def load_snapshot(path: str) -> SnapshotQTable:
+    return SnapshotQTable(path)
+
+
+def load_snapshots(directory: str = config.Q_SNAPSHOT_DIR) -> Dict[int, SnapshotQTable]:
+    """Map every board size with a snapshot in `directory` to its memmapped table"""
+    snapshots = {}
+    for board_size in range(config.BOARD_SIZE_MIN, config.BOARD_SIZE_MAX + 1):
+        path = snapshot_path(board_size, directory)
+        if os.path.exists(path):
+            snapshots[board_size] = SnapshotQTable(path)
+    return snapshots
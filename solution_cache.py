@@ -0,0 +1,118 @@
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import config
+import backtracking
+
+
+def symmetries(queens: List[int]) -> List[Tuple[int, ...]]:
+    """The 8 images of a solution under the board's dihedral group"""
+    n = len(queens)
+    inverse = [0] * n
+    for row, col in enumerate(queens):
+        inverse[col] = row
+    images = []
+    # The transpose (inverse permutation) plus row/column mirrors span D4
+    for base in (tuple(queens), tuple(inverse)):
+        mirrored = tuple(n - 1 - c for c in base)
+        images.extend([base, mirrored, base[::-1], mirrored[::-1]])
+    return images
+
+
+def canonical_form(queens: List[int]) -> Tuple[Tuple[int, ...], int]:
+    """Lexicographically smallest symmetric image and the orbit size"""
+    images = set(symmetries(queens))
+    return min(images), len(images)
+
+
+class CanonicalSolutions:
+    """Canonical solutions of one board size, packed as uint8 rows"""
+
+    def __init__(self, n: int, packed: np.ndarray, orbit_sizes: np.ndarray):
+        self.n = n
+        self.packed = packed
+        self.orbit_sizes = orbit_sizes
+        self.count = int(orbit_sizes.sum())
+
+    @classmethod
+    def enumerate(cls, n: int) -> "CanonicalSolutions":
+        """Search only first-row columns in the left half (plus the middle one).
+
+        Every orbit has a member there because the left/right mirror maps
+        the right half onto it; duplicates within the half are folded by
+        canonical form.
+        """
+        half_mask = (1 << ((n + 1) // 2)) - 1
+        canonical: Dict[Tuple[int, ...], int] = {}
+        for queens in backtracking.iter_solutions(n, first_row_mask=half_mask):
+            form, size = canonical_form(queens)
+            canonical[form] = size
+        forms = sorted(canonical)
+        packed = np.array(forms, dtype=np.uint8).reshape(len(forms), n)
+        sizes = np.array([canonical[f] for f in forms], dtype=np.uint8)
+        return cls(n, packed, sizes)
+
+    def __len__(self) -> int:
+        return len(self.packed)
+
+    def first(self) -> Optional[List[int]]:
+        return self.packed[0].tolist() if len(self.packed) else None
+
+    def canonical(self) -> Iterator[List[int]]:
+        for row in self.packed:
+            yield row.tolist()
+
+    def expand(self) -> Iterator[List[int]]:
+        """Every solution, orbit by orbit"""
+        for row in self.packed:
+            for image in sorted(set(symmetries(row.tolist()))):
+                yield list(image)
+
+
+class SolutionCache:
+    """Per-n cache of canonical solution sets, filled on first use"""
+
+    def __init__(self, max_n: int = config.SOLUTION_CACHE_MAX_N):
+        self.max_n = max_n
+        self._sets: Dict[int, CanonicalSolutions] = {}
+        # Counts for n > max_n, where no solution set is kept
+        self._counts: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, n: int) -> CanonicalSolutions:
+        if not (1 <= n <= self.max_n):
+            raise ValueError(f"Solution cache supports n between 1 and {self.max_n}, got {n}")
+        solutions = self._sets.get(n)
+        if solutions is None:
+            with self._lock:
+                solutions = self._sets.get(n)
+                if solutions is None:
+                    solutions = CanonicalSolutions.enumerate(n)
+                    self._sets[n] = solutions
+        return solutions
+
+    def count(self, n: int) -> int:
+        if n > self.max_n:
+            count = self._counts.get(n)
+            if count is None:
+                count = self._counts[n] = backtracking.count_solutions(n)
+            return count
+        return self.get(n).count
+
+    def solution(self, n: int) -> Optional[List[int]]:
+        if n > self.max_n:
+            return backtracking.first_solution(n)
+        return self.get(n).first()
+
+    def solutions(self, n: int) -> Iterator[List[int]]:
+        if n > self.max_n:
+            return backtracking.iter_solutions(n)
+        return self.get(n).expand()
+
+    @property
+    def nbytes(self) -> int:
+        return sum(s.packed.nbytes + s.orbit_sizes.nbytes for s in self._sets.values())
+
+
+solution_cache = SolutionCache()
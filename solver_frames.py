@@ -0,0 +1,74 @@
+from typing import Callable, Dict, Iterator, Optional
+
+import backtracking
+from genetic import GeneticSolver
+
+# Solvers as generators of frames ({'step', 'queens', 'conflicts', ...}
+# dicts) produced one at a time, so callers can stream or sample them
+# instead of holding a full solution history in memory.
+
+Frame = Dict
+
+
+def backtracking_frames(n: int) -> Iterator[Frame]:
+    """Every node of the bitmask DFS, stopping at the first solution"""
+    for step, (depth, queens) in enumerate(backtracking.iter_nodes(n)):
+        yield {'step': step, 'queens': queens.copy(), 'depth': depth, 'conflicts': 0}
+        if depth == n:
+            return
+
+
+def genetic_frames(solver: GeneticSolver, max_generations: int) -> Iterator[Frame]:
+    """Best individual of each generation"""
+    for generation, best, conflicts in solver.iter_generations(max_generations):
+        yield {'step': generation, 'queens': best, 'conflicts': conflicts}
+
+
+def qlearning_frames(env, agent, max_steps: int) -> Iterator[Frame]:
+    """Board after every learning step, starting from a fresh reset"""
+    state = env.reset()
+    yield {'step': 0, 'queens': state, 'conflicts': env.get_conflicts()}
+    for step in range(1, max_steps + 1):
+        action = agent.choose_action(state)
+        new_state, reward, done = env.step(action)
+        agent.learn(state, action, reward, new_state, done)
+        state = new_state
+        conflicts = env.get_conflicts()
+        yield {'step': step, 'queens': state, 'conflicts': conflicts, 'reward': reward}
+        if done or conflicts == 0:
+            return
+
+
+def frame_score(frame: Frame, n: int) -> int:
+    """Lower is better: conflicts, or unplaced rows for backtracking frames"""
+    if 'depth' in frame:
+        return n - frame['depth']
+    return frame['conflicts']
+
+
+def frame_solved(frame: Frame, n: int) -> bool:
+    return frame_score(frame, n) == 0
+
+
+def sample_frames(frames: Iterator[Frame], every: int = 1, only_improvements: bool = False,
+                  score: Optional[Callable[[Frame], int]] = None) -> Iterator[Frame]:
+    """Keep every `every`-th frame, or only frames that beat the best score
+    so far (`score` is required then). The last frame is always kept so
+    consumers see the final board."""
+    every = max(1, every)
+    best = None
+    last = None
+    last_sent = True
+    for index, frame in enumerate(frames):
+        if only_improvements:
+            value = score(frame)
+            send = best is None or value < best
+            if send:
+                best = value
+        else:
+            send = index % every == 0
+        if send:
+            yield frame
+        last, last_sent = frame, send
+    if not last_sent:
+        yield last
@@ -0,0 +1,276 @@
+import itertools
+import logging
+import multiprocessing as mp
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing.connection import wait
+from typing import Dict, List, Optional
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# Each worker process talks to the parent over its own pair of pipes, so a
+# worker can be terminated mid-solve (cancellation, timeout) without
+# corrupting a queue shared with the others; the slot is then refilled with
+# a fresh process. Workers also stream throttled progress reports, which
+# the parent keeps on the task. Workers are daemonic, so solvers must not
+# start processes of their own (island GA runs its islands in-process).
+
+
+class SolverError(Exception):
+    """A solve failed in its worker process"""
+
+
+class SolverCancelled(SolverError):
+    """The solve was cancelled before it finished"""
+
+
+def _worker_main(tasks, results) -> None:
+    # Imported in the child so the parent does not need the solver modules
+    from solver_tasks import TASKS
+
+    while True:
+        item = tasks.recv()
+        if item is None:
+            return
+        task_id, algorithm, kwargs = item
+        last_report = 0.0
+
+        def progress(**report):
+            nonlocal last_report
+            now = time.monotonic()
+            if now - last_report >= config.SOLVER_POOL_PROGRESS_SECONDS:
+                last_report = now
+                results.send(('progress', task_id, report))
+
+        try:
+            results.send(('done', task_id, TASKS[algorithm](**kwargs, progress=progress)))
+        except Exception as e:
+            results.send(('error', task_id, f"{type(e).__name__}: {e}"))
+
+
+class SolverTask:
+    """Handle for one submitted solve; `future` resolves to the result dict"""
+
+    def __init__(self, task_id: int, algorithm: str, kwargs: Dict,
+                 priority: int = 0, owner: Optional[str] = None):
+        self.id = task_id
+        self.algorithm = algorithm
+        self.kwargs = kwargs
+        self.priority = priority
+        self.owner = owner
+        self.state = 'queued'
+        self.progress: Dict = {}
+        self.future: Future = Future()
+        self.submitted = time.time()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+
+    @property
+    def done(self) -> bool:
+        return self.state in ('done', 'failed', 'cancelled')
+
+    def wait(self, timeout: Optional[float] = None) -> Dict:
+        return self.future.result(timeout)
+
+
+class _Worker:
+    def __init__(self, ctx):
+        task_reader, self.tasks = ctx.Pipe(duplex=False)
+        self.results, result_writer = ctx.Pipe(duplex=False)
+        self.process = ctx.Process(target=_worker_main, args=(task_reader, result_writer),
+                                   daemon=True)
+        self.process.start()
+        # Drop the parent's copies of the child ends so a dead worker reads as EOF
+        task_reader.close()
+        result_writer.close()
+        self.task: Optional[SolverTask] = None
+
+    def stop(self, terminate: bool = False) -> None:
+        if terminate:
+            self.process.terminate()
+        else:
+            try:
+                self.tasks.send(None)
+            except (BrokenPipeError, OSError):
+                pass
+        self.process.join(timeout=5)
+        self.tasks.close()
+        self.results.close()
+
+
+class SolverPool:
+    """Fixed-size pool of solver processes with hard cancellation.
+
+    Queued tasks start highest priority first, FIFO within a priority,
+    skipping tasks whose owner already has `max_per_owner` running so one
+    client cannot occupy every worker. cancel() drops a queued task or
+    terminates and replaces the worker running it.
+    """
+
+    def __init__(self, workers: int = config.SOLVER_POOL_WORKERS,
+                 start_method: Optional[str] = config.SOLVER_POOL_START_METHOD,
+                 max_per_owner: int = config.SOLVER_POOL_MAX_PER_OWNER):
+        self._ctx = mp.get_context(start_method)
+        self._workers = [_Worker(self._ctx) for _ in range(max(1, workers))]
+        self.max_per_owner = max_per_owner
+        self._queue: List[SolverTask] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._closed = False
+        self._collector = threading.Thread(target=self._collect, daemon=True)
+        self._collector.start()
+
+    @property
+    def size(self) -> int:
+        return len(self._workers)
+
+    def submit(self, algorithm: str, kwargs: Dict, priority: int = 0,
+               owner: Optional[str] = None) -> SolverTask:
+        """Queue a solve; tasks without an owner are not subject to the per-owner cap"""
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Solver pool is shut down")
+            task = SolverTask(next(self._ids), algorithm, kwargs, priority, owner)
+            self._queue.append(task)
+            self._dispatch()
+        return task
+
+    def cancel(self, task: SolverTask) -> bool:
+        """Cancel a queued or running task; False if it had already finished"""
+        with self._lock:
+            if task.done:
+                return False
+            if task.state == 'queued':
+                self._queue.remove(task)
+            else:
+                index = next(i for i, w in enumerate(self._workers) if w.task is task)
+                self._workers[index].stop(terminate=True)
+                self._workers[index] = _Worker(self._ctx)
+            self._finish(task, 'cancelled', error=SolverCancelled(f"Task {task.id} cancelled"))
+            self._dispatch()
+            return True
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._closed = True
+            for task in list(self._queue):
+                self._finish(task, 'cancelled', error=SolverCancelled("Solver pool shut down"))
+            self._queue.clear()
+            for worker in self._workers:
+                if worker.task is not None:
+                    self._finish(worker.task, 'cancelled',
+                                 error=SolverCancelled("Solver pool shut down"))
+                worker.stop(terminate=worker.task is not None)
+        self._collector.join(timeout=5)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+
+    def queued(self, owner: Optional[str] = None) -> int:
+        with self._lock:
+            return sum(1 for task in self._queue if owner is None or task.owner == owner)
+
+    def _next_task(self) -> Optional[SolverTask]:
+        running: Dict[str, int] = {}
+        for worker in self._workers:
+            if worker.task is not None and worker.task.owner is not None:
+                running[worker.task.owner] = running.get(worker.task.owner, 0) + 1
+        # Queue order is submission order, so min() keeps FIFO within a priority
+        eligible = [task for task in self._queue
+                    if task.owner is None or running.get(task.owner, 0) < self.max_per_owner]
+        return min(eligible, key=lambda task: -task.priority, default=None)
+
+    def _dispatch(self) -> None:
+        # Caller holds self._lock
+        for worker in self._workers:
+            if worker.task is None:
+                task = self._next_task()
+                if task is None:
+                    return
+                self._queue.remove(task)
+                worker.task = task
+                task.state = 'running'
+                task.started = time.time()
+                worker.tasks.send((task.id, task.algorithm, task.kwargs))
+
+    def _finish(self, task: SolverTask, state: str, result: Optional[Dict] = None,
+                error: Optional[Exception] = None) -> None:
+        task.state = state
+        task.finished = time.time()
+        for worker in self._workers:
+            if worker.task is task:
+                worker.task = None
+        if error is not None:
+            task.future.set_exception(error)
+        else:
+            task.future.set_result(result)
+
+    def _collect(self) -> None:
+        while not self._closed:
+            with self._lock:
+                connections = {w.results: w for w in self._workers}
+            try:
+                ready = wait(list(connections), timeout=config.SOLVER_POOL_POLL_SECONDS)
+            except (OSError, ValueError):
+                ready = []  # a connection was closed by cancel(); re-read the workers
+            for conn in ready:
+                try:
+                    kind, task_id, payload = conn.recv()
+                except (EOFError, OSError):
+                    continue  # worker terminated; handled below or by cancel()
+                with self._lock:
+                    worker = connections[conn]
+                    task = worker.task
+                    if worker not in self._workers or task is None or task.id != task_id:
+                        continue  # stale message from a cancelled task
+                    if kind == 'progress':
+                        task.progress = payload
+                        continue
+                    if kind == 'done':
+                        # Reports are throttled, so record the final counts
+                        task.progress = {'steps': payload.get('steps'),
+                                         'conflicts': payload.get('conflicts')}
+                        self._finish(task, 'done', result=payload)
+                    else:
+                        self._finish(task, 'failed', error=SolverError(payload))
+                    self._dispatch()
+            self._reap()
+
+    def _reap(self) -> None:
+        """Replace workers that died on their own, failing their task"""
+        with self._lock:
+            if self._closed:
+                return
+            for index, worker in enumerate(self._workers):
+                if worker.process.is_alive():
+                    continue
+                logger.error(f"Solver worker exited with code {worker.process.exitcode}")
+                task = worker.task
+                worker.stop(terminate=True)
+                self._workers[index] = _Worker(self._ctx)
+                if task is not None:
+                    self._finish(task, 'failed', error=SolverError("Solver worker died"))
+            self._dispatch()
+
+
+if __name__ == '__main__':
+    # Smoke check: one solve of each kind through a real pool
+    with SolverPool(workers=2) as pool:
+        checks = {
+            'backtracking': {'n': 8},
+            'minconflicts': {'n': 100, 'seed': 0},
+            'genetic': {'n': 8, 'seed': 0, 'islands': 2, 'population_size': 50,
+                        'max_generations': 200},
+            'backtracking_enumerate': {'n': 10, 'mode': 'count'},
+        }
+        tasks = {name: pool.submit(name, kwargs) for name, kwargs in checks.items()}
+        for name, task in tasks.items():
+            result = task.wait(timeout=60)
+            print(f"{name}: {task.state}, progress={task.progress}, "
+                  f"success={result.get('success')}, count={result.get('count')}")
@@ -0,0 +1,372 @@
+import itertools
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Mapping, Optional
+
+import numpy as np
+import config
+from nqueens_env import NQueensEnv
+from qlearning import QLearningAgent
+from snapshots import load_snapshots
+from genetic import GeneticSolver, population_conflicts
+from island_ga import TOPOLOGIES, island_genetic_solve
+from min_conflicts import min_conflicts_solve
+from solver_frames import backtracking_frames, qlearning_frames
+from history_codec import COMPACT_FORMAT, encode_history
+from result_cache import result_key
+from solution_cache import solution_cache
+
+# Solver runs as plain functions of their parameters, independent of any
+# HTTP request, so the Flask endpoints can call them inline and the ASGI
+# server can ship them to worker processes (see solver_pool.py). Each takes
+# an optional `progress(steps=..., ...)` callback reporting the work done so
+# far and the best conflict count seen (placed depth for backtracking).
+
+Progress = Optional[Callable[..., None]]
+
+# Memory-mapped Q-table snapshots (per board size) used to warm-start agents
+q_snapshots = load_snapshots(config.Q_SNAPSHOT_DIR)
+
+
+def create_agent(board_size, env, **params):
+    """Build a QLearningAgent for `env`, warm-started from a snapshot if one exists"""
+    agent = QLearningAgent(
+        state_space_size=board_size,
+        action_space_size=board_size,
+        warm_start=q_snapshots.get(board_size),
+        **params
+    )
+    agent.env = env
+    return agent
+
+
+def qlearning_solver(n, backend):
+    """Environment and agent for a one-off Q-learning solve"""
+    env = NQueensEnv(n)
+    params = {
+        'learning_rate': config.LEARNING_RATE,
+        'discount_factor': config.DISCOUNT_FACTOR,
+        'exploration_rate': config.EXPLORATION_RATE
+    }
+    if backend == 'jax':
+        # Imported on demand so solver workers only pay for JAX when asked to
+        from jax_trainer import JaxQLearningAgent
+        agent = JaxQLearningAgent(state_space_size=n, action_space_size=n, **params)
+        # Compiled batched pre-training before the visible rollout
+        agent.train(config.JAX_PRETRAIN_STEPS)
+    else:
+        agent = create_agent(n, env, **params)
+
+    # Add environment to agent if needed
+    if not hasattr(agent, 'env'):
+        agent.env = env
+    return env, agent
+
+
+def backtracking_solve(n, progress: Progress = None):
+    """First solution by bitmask DFS, recording every visited partial board"""
+    history = []
+    for frame in backtracking_frames(n):
+        history.append(frame['queens'])
+        if progress:
+            progress(steps=frame['step'], depth=frame['depth'])
+    if history and -1 not in history[-1]:
+        return history[-1], n, history
+
+    return None, len(history), history
+
+
+def run_qlearning(n: int, backend: str = config.QLEARNING_BACKEND,
+                  progress: Progress = None) -> Dict:
+    tracemalloc.start()
+    start_time = time.time()
+
+    env, agent = qlearning_solver(n, backend)
+
+    # max_steps prevents infinite loops
+    frames = []
+    best = None
+    for frame in qlearning_frames(env, agent, config.QLEARNING_SOLVE_MAX_STEPS):
+        frames.append(frame)
+        if progress:
+            best = frame['conflicts'] if best is None else min(best, frame['conflicts'])
+            progress(steps=frame['step'], conflicts=best)
+    solution_history = [frame['queens'] for frame in frames]
+
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'solution': env.queens,
+        'solutionHistory': solution_history,
+        'steps': frames[-1]['step'],
+        'time': round((time.time() - start_time) * 1000, 2),
+        'memory': round(peak / 1024, 2),
+        'conflicts': env.get_conflicts(),
+        'algorithm': 'Q-Learning',
+        'success': env.get_conflicts() == 0
+    }
+
+
+def run_genetic(n: int, population_size: int = config.GA_POPULATION_SIZE,
+                max_generations: int = config.GA_MAX_GENERATIONS,
+                selection: str = config.GA_SELECTION, seed: Optional[int] = None,
+                islands: int = 1, migration_interval: int = config.GA_MIGRATION_INTERVAL,
+                topology: str = config.GA_TOPOLOGY, progress: Progress = None) -> Dict:
+    tracemalloc.start()
+    start_time = time.time()
+
+    if islands > 1:
+        # Island model: per-generation history stays inside the workers
+        solution, steps, _ = island_genetic_solve(
+            n, islands, population_size, max_generations,
+            migration_interval=migration_interval, topology=topology,
+            seed=seed, selection=selection, progress=progress)
+        history = [solution]
+    else:
+        solver = GeneticSolver(n, population_size, selection=selection, seed=seed)
+        solution, steps, history = solver.run(max_generations, progress=progress)
+    conflicts = int(population_conflicts(np.array([solution]))[0]) if solution else n*n
+
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'solution': solution,
+        'solutionHistory': history,
+        'steps': steps,
+        'time': round((time.time() - start_time) * 1000, 2),
+        'memory': peak / 1024,
+        'conflicts': conflicts,
+        'algorithm': 'Genetic',
+        'success': conflicts == 0
+    }
+
+
+def run_backtracking(n: int, progress: Progress = None) -> Dict:
+    tracemalloc.start()
+    start_time = time.time()
+
+    solution, steps, history = backtracking_solve(n, progress)
+    conflicts = 0 if solution else n*n
+
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'solution': solution if solution else [-1]*n,
+        'solutionHistory': history,
+        'steps': steps,
+        'time': round((time.time() - start_time) * 1000, 2),
+        'memory': peak / 1024,
+        'conflicts': conflicts,
+        'algorithm': 'Backtracking',
+        'success': conflicts == 0
+    }
+
+
+def run_minconflicts(n: int, seed: Optional[int] = None,
+                     max_steps: int = config.MIN_CONFLICTS_MAX_STEPS,
+                     progress: Progress = None) -> Dict:
+    start_time = time.time()
+
+    solution, stats = min_conflicts_solve(n, seed=seed, max_steps=max_steps, progress=progress)
+
+    return {
+        'n': n,
+        'solution': solution,
+        'steps': stats['steps'],
+        'time': round((time.time() - start_time) * 1000, 2),
+        'conflicts': stats['conflicts'],
+        'algorithm': 'Min-Conflicts',
+        'success': solution is not None
+    }
+
+
+def run_backtracking_enumerate(n: int, mode: str, limit: int = config.BACKTRACKING_SOLUTIONS_LIMIT,
+                               progress: Progress = None) -> Dict:
+    """solution/count/all/canonical answers from the symmetry-reduced cache"""
+    start_time = time.time()
+    result = {'n': n, 'algorithm': 'Backtracking', 'mode': mode}
+
+    if mode == 'solution':
+        solution = solution_cache.solution(n)
+        result.update({'solution': solution, 'success': solution is not None})
+    elif mode == 'count':
+        result['count'] = solution_cache.count(n)
+    else:
+        if mode == 'canonical':
+            source = solution_cache.get(n).canonical()
+        else:
+            source = solution_cache.solutions(n)
+        # One extra solution tells a full page apart from a truncated one
+        solutions = list(itertools.islice(source, limit + 1))
+        result.update({
+            'solutions': solutions[:limit],
+            'count': min(len(solutions), limit),
+            'truncated': len(solutions) > limit
+        })
+
+    result['time'] = round((time.time() - start_time) * 1000, 2)
+    return result
+
+
+SOLVERS: Dict[str, Callable[..., Dict]] = {
+    'qlearning': run_qlearning,
+    'genetic': run_genetic,
+    'backtracking': run_backtracking,
+    'minconflicts': run_minconflicts,
+}
+
+# Everything a solver pool worker can run; only SOLVERS is exposed as jobs
+TASKS: Dict[str, Callable[..., Dict]] = dict(SOLVERS, backtracking_enumerate=run_backtracking_enumerate)
+
+ENUMERATE_MODES = ('solution', 'count', 'all', 'canonical')
+QLEARNING_BACKENDS = ('python', 'jax')
+
+
+def _arg(args: Mapping[str, Any], name: str, default: Any, type: Callable = str) -> Any:
+    """Like Flask's args.get(name, default, type): unparsable values give the default"""
+    value = args.get(name)
+    if value is None:
+        return default
+    try:
+        return type(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _int_arg(args: Mapping[str, Any], name: str, default: int) -> int:
+    """Integer query parameter; unlike _arg, an unparsable value raises ValueError"""
+    value = args.get(name)
+    if value is None:
+        return default
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'{name} must be an integer') from None
+
+
+def _backtracking_size(args: Mapping[str, Any]) -> int:
+    """Board size for the bitmask search: below 1 is rejected, above
+    BACKTRACKING_SIZE_MAX is clamped"""
+    n = _arg(args, 'n', 8, int)
+    if n < 1:
+        raise ValueError('n must be at least 1')
+    return min(n, config.BACKTRACKING_SIZE_MAX)
+
+
+def solve_args(algorithm: str, args: Mapping[str, Any]) -> Dict:
+    """Clamped keyword arguments for SOLVERS[algorithm] from query parameters.
+
+    Raises ValueError for an unknown algorithm or an out-of-range board.
+    """
+    n = _arg(args, 'n', 8, int)
+    if algorithm == 'qlearning':
+        backend = _arg(args, 'backend', config.QLEARNING_BACKEND)
+        if backend not in QLEARNING_BACKENDS:
+            raise ValueError(f'Unknown Q-learning backend: {backend}')
+        return {'n': max(config.BOARD_SIZE_MIN, min(n, config.BOARD_SIZE_MAX)),
+                'backend': backend}
+    if algorithm == 'genetic':
+        selection = _arg(args, 'selection', config.GA_SELECTION)
+        if selection not in ('tournament', 'roulette'):
+            raise ValueError(f'Unknown selection method: {selection}')
+        topology = _arg(args, 'topology', config.GA_TOPOLOGY)
+        if topology not in TOPOLOGIES:
+            raise ValueError(f'Unknown migration topology: {topology}')
+        n = max(1, min(n, config.GA_SIZE_MAX))
+        islands = max(1, min(_arg(args, 'islands', 1, int), config.GA_ISLANDS_MAX))
+        # Bound the genes held per generation, not just the population
+        population_max = min(config.GA_POPULATION_MAX,
+                             config.GA_POPULATION_CELLS_MAX // (n * islands))
+        population_size = _arg(args, 'population', config.GA_POPULATION_SIZE, int)
+        generations = _arg(args, 'generations', config.GA_MAX_GENERATIONS, int)
+        migration_interval = _arg(args, 'migration_interval', config.GA_MIGRATION_INTERVAL, int)
+        return {
+            'n': n,
+            'population_size': max(2, min(population_size, population_max)),
+            'max_generations': max(1, min(generations, config.GA_GENERATIONS_MAX)),
+            'selection': selection,
+            'seed': _arg(args, 'seed', None, int),
+            'islands': islands,
+            # 0 turns migration off
+            'migration_interval': max(0, min(migration_interval, config.GA_GENERATIONS_MAX)),
+            'topology': topology
+        }
+    if algorithm == 'backtracking':
+        return {'n': _backtracking_size(args)}
+    if algorithm == 'minconflicts':
+        if not (config.MIN_CONFLICTS_SIZE_MIN <= n <= config.MIN_CONFLICTS_SIZE_MAX):
+            raise ValueError(f'n must be between {config.MIN_CONFLICTS_SIZE_MIN} and '
+                             f'{config.MIN_CONFLICTS_SIZE_MAX}')
+        max_steps = _int_arg(args, 'max_steps', config.MIN_CONFLICTS_MAX_STEPS)
+        return {'n': n, 'seed': _arg(args, 'seed', None, int),
+                'max_steps': max(1, min(max_steps, config.MIN_CONFLICTS_MAX_STEPS))}
+    raise ValueError(f'Unknown algorithm: {algorithm}')
+
+
+def enumerate_args(args: Mapping[str, Any]) -> Dict:
+    """Clamped keyword arguments for run_backtracking_enumerate.
+
+    Raises ValueError for n < 1, limit < 1, an unknown mode or
+    mode=canonical beyond the solution cache.
+    """
+    n = _backtracking_size(args)
+    mode = _arg(args, 'mode', 'solution')
+    if mode not in ENUMERATE_MODES:
+        raise ValueError(f'Unknown mode: {mode}')
+    if mode == 'canonical' and n > solution_cache.max_n:
+        raise ValueError(f'mode=canonical supports n up to {solution_cache.max_n}')
+    limit = _arg(args, 'limit', config.BACKTRACKING_SOLUTIONS_LIMIT, int)
+    if limit < 1:
+        raise ValueError('limit must be at least 1')
+    return {'n': n, 'mode': mode, 'limit': min(limit, config.BACKTRACKING_SOLUTIONS_LIMIT)}
+
+
+def cache_key(algorithm: str, kwargs: Dict) -> Optional[str]:
+    """Result-cache key, or None when the run is not reproducible.
+
+    Backtracking is deterministic; genetic and min-conflicts runs are
+    reproducible given a seed, except island GA runs, whose migrants are
+    exchanged asynchronously. Q-learning takes no seed.
+    """
+    n = kwargs['n']
+    if algorithm == 'backtracking':
+        return result_key(algorithm, n, None, {})
+    if algorithm == 'backtracking_enumerate':
+        return result_key(algorithm, n, None, {'mode': kwargs['mode'], 'limit': kwargs['limit']})
+    seed = kwargs.get('seed')
+    if seed is None:
+        return None
+    if algorithm == 'genetic' and kwargs['islands'] == 1:
+        return result_key(algorithm, n, seed, {'population': kwargs['population_size'],
+                                               'generations': kwargs['max_generations'],
+                                               'selection': kwargs['selection']})
+    if algorithm == 'minconflicts':
+        return result_key(algorithm, n, seed, {'max_steps': kwargs['max_steps']})
+    return None
+
+
+def result_cost(result: Dict, n: int) -> int:
+    """Cache cost of a result: board cells held in its history, solutions and solution"""
+    return n * (len(result.get('solutionHistory') or ()) + len(result.get('solutions') or ()) + 1)
+
+
+def _flag(value: str) -> bool:
+    return value.lower() in ('1', 'true', 'yes')
+
+
+def format_result(algorithm: str, result: Dict, cached: bool, args: Mapping[str, Any]) -> Dict:
+    """Response body for a solve result: ?format=compact delta-encodes the
+    history (see history_codec.py) and min-conflicts only includes the
+    solution for boards up to MIN_CONFLICTS_SOLUTION_MAX unless asked."""
+    response = dict(result, cached=cached)
+    if 'solutionHistory' in response and args.get('format') == COMPACT_FORMAT:
+        response['solutionHistory'] = encode_history(response['solutionHistory'])
+    if algorithm == 'minconflicts':
+        include = _arg(args, 'include_solution',
+                       result['n'] <= config.MIN_CONFLICTS_SOLUTION_MAX, _flag)
+        if not include:
+            response['solution'] = None
+    return response
@@ -11,6 +11,33 @@ const algorithms = [
   { name: 'Backtracking', endpoint: 'backtracking', color: '#FFD166' }
 ];
 
+// Decodes the `format=compact` solutionHistory sent by the solve endpoints:
+// the initial board, then per step a count k followed by k (row, col)
+// pairs, as little-endian int8 ('b') or int16 ('h') values in base64.
+export const decodeHistory = (history) => {
+  if (!history || Array.isArray(history)) return history;
+  if (!history.length) return [];
+  const bytes = Uint8Array.from(atob(history.deltas), c => c.charCodeAt(0));
+  const view = new DataView(bytes.buffer);
+  const width = history.typecode === 'h' ? 2 : 1;
+  const read = i => (width === 2 ? view.getInt16(i * 2, true) : view.getInt8(i));
+  const total = bytes.length / width;
+
+  let board = [...history.initial];
+  const boards = [board];
+  let i = 0;
+  while (i < total) {
+    const count = read(i);
+    board = [...board];
+    for (let k = 0; k < count; k++) {
+      board[read(i + 1 + 2 * k)] = read(i + 2 + 2 * k);
+    }
+    boards.push(board);
+    i += 1 + 2 * count;
+  }
+  return boards;
+};
+
 export const ComparisonPanel = ({ boardSize }) => {
   const [results, setResults] = useState(null);
   const [isLoading, setIsLoading] = useState(false);
@@ -28,14 +55,14 @@ export const ComparisonPanel = ({ boardSize }) => {
     try {
       const responses = await Promise.all(
         algorithms.map(algo =>
-          fetch(`/api/solve/${algo.endpoint}?n=${boardSize}`)
+          fetch(`/api/solve/${algo.endpoint}?n=${boardSize}&format=compact`)
             .then(async res => {
               const data = await res.json();
               if (!res.ok || !data) throw new Error(data.message || `${algo.name} failed`);
               return {
                 ...algo,
                 ...data,
-                solutionHistory: data.solutionHistory || [data.solution || Array(boardSize).fill(-1)]
+                solutionHistory: decodeHistory(data.solutionHistory) || [data.solution || Array(boardSize).fill(-1)]
               };
             })
             .catch(err => ({
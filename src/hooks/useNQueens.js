@@ -7,9 +7,42 @@ const FRONTEND_CONFIG = {
   BOARD_SIZE_MIN: 4,
   BOARD_SIZE_MAX: 8,
   STEP_INTERVAL_MS: 1500,
+  STEPS_PER_REQUEST: 20,
   MAX_LOG_ENTRIES: 100,
 };
 
+// Attacked squares are requested as one bitmask per row (bit c = column c)
+// and expanded here into the { "r-c": true } map the boards index.
+export const expandAttackedRows = (rows) => {
+  if (!Array.isArray(rows)) return rows || {};
+  const attacked = {};
+  rows.forEach((mask, row) => {
+    for (let col = 0; mask >> col; col++) {
+      if ((mask >> col) & 1) attacked[`${row}-${col}`] = true;
+    }
+  });
+  return attacked;
+};
+
+// Same masks as nqueens_env.attacked_row_masks, for boards replayed locally
+export const attackedRowMasks = (queens) => {
+  const n = queens.length;
+  const full = (1 << n) - 1;
+  let cols = 0;
+  let diag1 = 0;
+  let diag2 = 0;
+  queens.forEach((col, row) => {
+    if (col >= 0) {
+      cols |= 1 << col;
+      diag1 |= 1 << (col - row + n - 1);
+      diag2 |= 1 << (row + col);
+    }
+  });
+  return queens.map((col, row) => (col >= 0
+    ? full & ~(1 << col)
+    : (cols | (diag1 >> (n - 1 - row)) | (diag2 >> row)) & full));
+};
+
 export const useNQueens = (initialSize = FRONTEND_CONFIG.BOARD_SIZE_MIN) => {
   const [boardSize, setBoardSize] = useState(initialSize);
   const [queens, setQueens] = useState([]);
@@ -37,6 +70,11 @@ export const useNQueens = (initialSize = FRONTEND_CONFIG.BOARD_SIZE_MIN) => {
     isExploring: false
   });
   const startTimeRef = useRef(null);
+  const sessionIdRef = useRef(null);
+  // Steps fetched from POST /api/steps but not shown yet, and the board shown
+  const pendingStepsRef = useRef([]);
+  const shownRef = useRef({ queens: [], conflicts: 0 });
+  const stepBusyRef = useRef(false);
 
   // Refs to track latest values
   const isSolvingRef = useRef(isSolving);
@@ -59,6 +97,16 @@ export const useNQueens = (initialSize = FRONTEND_CONFIG.BOARD_SIZE_MIN) => {
     },
   });
 
+  // The backend keeps one simulation per session; echo its ID on every call
+  api.interceptors.request.use((config) => {
+    if (sessionIdRef.current) config.headers['X-Session-ID'] = sessionIdRef.current;
+    return config;
+  });
+  api.interceptors.response.use((response) => {
+    if (response.data?.sessionId) sessionIdRef.current = response.data.sessionId;
+    return response;
+  });
+
   // Helper functions for log formatting
   const formatTimestamp = () => {
     return new Date().toLocaleTimeString([], { hour: '2-digit', minute: '2-digit', second: '2-digit' });
@@ -76,11 +124,6 @@ export const useNQueens = (initialSize = FRONTEND_CONFIG.BOARD_SIZE_MIN) => {
     return formattedEntry;
   };
 
-  const parseMoveDetails = (message) => {
-    const moveMatch = message.match(/row (\d+) to column (\d+)/i);
-    return moveMatch ? { row: parseInt(moveMatch[1]), col: parseInt(moveMatch[2]) } : null;
-  };
-
   const handleMove = (action) => {
     setLastMove(action);
     setQLearningParams(prev => ({
@@ -89,6 +132,86 @@ export const useNQueens = (initialSize = FRONTEND_CONFIG.BOARD_SIZE_MIN) => {
     }));
   };
 
+  // The simulation advances STEPS_PER_REQUEST steps per POST /api/steps and
+  // the moves are replayed here one per tick, so the backend handles one
+  // request per batch instead of one per step. The batch stops early once
+  // the board is solved.
+  const showBoard = (queens, conflicts) => {
+    pendingStepsRef.current = [];
+    shownRef.current = { queens, conflicts };
+  };
+
+  const nextStep = async () => {
+    if (!pendingStepsRef.current.length) {
+      const { data } = await api.post('/api/steps', {
+        k: FRONTEND_CONFIG.STEPS_PER_REQUEST,
+        attackedSquares: 'none',
+      });
+      let { queens: board, conflicts: prevConflicts } = shownRef.current;
+      const firstStep = data.step - data.stepsTaken + 1;
+      pendingStepsRef.current = data.moves.map(([row, col], i) => {
+        board = board.map((c, r) => (r === row ? col : c));
+        const step = {
+          step: firstStep + i,
+          row,
+          col,
+          queens: board,
+          prevConflicts,
+          conflicts: data.conflicts[i],
+          reward: data.rewards[i],
+          done: data.done && i === data.moves.length - 1,
+        };
+        prevConflicts = step.conflicts;
+        return step;
+      });
+    }
+    return pendingStepsRef.current.shift();
+  };
+
+  const showStep = (step, label) => {
+    shownRef.current = { queens: step.queens, conflicts: step.conflicts };
+    setQueens(step.queens);
+    setConflicts(step.conflicts);
+    setAttackedSquares(expandAttackedRows(attackedRowMasks(step.queens)));
+    setStatusMessage(
+      `Étape ${step.step}: Déplacé reine rangée ${step.row} vers colonne ${step.col}. ` +
+      `Conflits: ${step.prevConflicts} → ${step.conflicts}. Récompense: ${step.reward.toFixed(2)}`
+    );
+    setStepCounter(step.step);
+    setConflictHistory(prev => [
+      ...prev.slice(-49),
+      { step: step.step, conflicts: step.conflicts },
+    ]);
+
+    handleMove({ row: step.row, col: step.col });
+    addLogEntry(
+      `♛ ${label} ${step.step}: Reine rangée ${step.row} → colonne ${step.col} | Conflits: ${step.prevConflicts} → ${step.conflicts}`,
+      'move'
+    );
+    addLogEntry(`💰 Récompense: ${step.reward.toFixed(2)}`, 'reward');
+    playSound(step.conflicts > 0 ? 'conflict' : 'move');
+  };
+
+  const finishSolve = (step) => {
+    playSound('success');
+    if (solverInterval.current) {
+      clearInterval(solverInterval.current);
+      solverInterval.current = null;
+    }
+    setIsSolving(false);
+    isSolvingRef.current = false;
+
+    const solvingTime = ((performance.now() - startTimeRef.current) / 1000).toFixed(2);
+    addLogEntry(
+      `🎉 Solution trouvée en ${step.step} étapes (${solvingTime}s)`,
+      'success'
+    );
+    toast({
+      title: '🎉 Solution trouvée !',
+      description: `Solution trouvée en ${step.step} étapes (${solvingTime}s)`,
+    });
+  };
+
   const checkConnection = useCallback(async () => {
     try {
       const response = await api.get('/api/health');
@@ -117,7 +240,7 @@ export const useNQueens = (initialSize = FRONTEND_CONFIG.BOARD_SIZE_MIN) => {
     setIsLoading(true);
     setStatusMessage('Réinitialisation du plateau...');
     try {
-      const response = await api.post('/api/reset', { size });
+      const response = await api.post('/api/reset', { size, attackedFormat: 'bitset' });
       const data = response.data;
 
       if (!data.queens || !Array.isArray(data.queens)) {
@@ -126,7 +249,8 @@ export const useNQueens = (initialSize = FRONTEND_CONFIG.BOARD_SIZE_MIN) => {
 
       setQueens(data.queens);
       setConflicts(data.conflicts);
-      setAttackedSquares(data.attackedSquares || {});
+      setAttackedSquares(expandAttackedRows(data.attackedSquares));
+      showBoard(data.queens, data.conflicts);
       setIsSolving(false);
       setIsPaused(false);
       setStatusMessage(data.message || 'Plateau réinitialisé');
@@ -182,17 +306,20 @@ export const useNQueens = (initialSize = FRONTEND_CONFIG.BOARD_SIZE_MIN) => {
     startTimeRef.current = performance.now();
 
     try {
-      const resetResponse = await api.post('/api/reset', { size: boardSize });
-      setQueens(resetResponse.data.queens);
-      setConflicts(resetResponse.data.conflicts);
-      setAttackedSquares(resetResponse.data.attackedSquares || {});
+      await api.post('/api/reset', { size: boardSize, attackedFormat: 'bitset' });
 
-      await api.post('/api/start', {
+      // /api/start deals a fresh board; batched steps are replayed from it
+      const { data: started } = await api.post('/api/start', {
         boardSize,
         learningRate: learningParams.learningRate,
         discountFactor: learningParams.discountFactor,
         explorationRate: learningParams.explorationRate,
+        attackedFormat: 'bitset',
       });
+      setQueens(started.queens);
+      setConflicts(started.conflicts);
+      setAttackedSquares(expandAttackedRows(started.attackedSquares));
+      showBoard(started.queens, started.conflicts);
 
       setIsSolving(true);
       isSolvingRef.current = true;
@@ -210,58 +337,15 @@ export const useNQueens = (initialSize = FRONTEND_CONFIG.BOARD_SIZE_MIN) => {
       }
 
       solverInterval.current = setInterval(async () => {
-        if (isPausedRef.current || !isSolvingRef.current) return;
+        // A batch request can outlast the interval; don't start a second one
+        if (isPausedRef.current || !isSolvingRef.current || stepBusyRef.current) return;
+        stepBusyRef.current = true;
 
         try {
-          const stepResponse = await api.post('/api/step');
-          const stepData = stepResponse.data;
-
-          setQueens(stepData.queens || []);
-          setConflicts(stepData.conflicts ?? 0);
-          setAttackedSquares(stepData.attackedSquares || {});
-          setStatusMessage(stepData.message || 'Étape exécutée');
-          setStepCounter(stepData.step || 0);
-
-          setConflictHistory(prev => [
-            ...prev.slice(-49),
-            { step: stepData.step, conflicts: stepData.conflicts },
-          ]);
-
-          // Parse and log move details
-          const moveDetails = parseMoveDetails(stepData.message);
-          if (moveDetails) {
-            handleMove(moveDetails);
-            addLogEntry(
-              `♛ Étape ${stepData.step}: Reine rangée ${moveDetails.row} → colonne ${moveDetails.col} | Conflits: ${stepData.prevConflicts || '?'} → ${stepData.conflicts}`,
-              'move'
-            );
-          } else {
-            addLogEntry(stepData.message, 'info');
-          }
-
-          if (stepData.reward !== undefined) {
-            addLogEntry(`💰 Récompense: ${stepData.reward.toFixed(2)}`, 'reward');
-          }
-
-          playSound(stepData.conflicts > 0 ? 'conflict' : 'move');
-
-          if (stepData.done) {
-            playSound('success');
-            clearInterval(solverInterval.current);
-            solverInterval.current = null;
-            setIsSolving(false);
-            isSolvingRef.current = false;
-            
-            const solvingTime = ((performance.now() - startTimeRef.current) / 1000).toFixed(2);
-            addLogEntry(
-              `🎉 Solution trouvée en ${stepData.step} étapes (${solvingTime}s)`,
-              'success'
-            );
-            
-            toast({
-              title: '🎉 Solution trouvée !',
-              description: `Solution trouvée en ${stepData.step} étapes (${solvingTime}s)`,
-            });
+          const step = await nextStep();
+          showStep(step, 'Étape');
+          if (step.done) {
+            finishSolve(step);
           }
         } catch (error) {
           playSound('error');
@@ -272,6 +356,8 @@ export const useNQueens = (initialSize = FRONTEND_CONFIG.BOARD_SIZE_MIN) => {
           solverInterval.current = null;
           setIsSolving(false);
           isSolvingRef.current = false;
+        } finally {
+          stepBusyRef.current = false;
         }
       }, FRONTEND_CONFIG.STEP_INTERVAL_MS);
 
@@ -307,48 +393,13 @@ export const useNQueens = (initialSize = FRONTEND_CONFIG.BOARD_SIZE_MIN) => {
     if (!isPaused) {
       handlePauseResume();
     } else {
+      if (stepBusyRef.current) return;
+      stepBusyRef.current = true;
       try {
-        const response = await api.post('/api/step');
-        const data = response.data;
-
-        setQueens(data.queens);
-        setConflicts(data.conflicts);
-        setAttackedSquares(data.attackedSquares || {});
-        setStatusMessage(data.message);
-        setStepCounter(data.step);
-
-        const moveDetails = parseMoveDetails(data.message);
-        if (moveDetails) {
-          handleMove(moveDetails);
-          addLogEntry(
-            `♛ Étape manuelle ${data.step}: Reine rangée ${moveDetails.row} → colonne ${moveDetails.col} | Conflits: ${data.prevConflicts || '?'} → ${data.conflicts}`,
-            'move'
-          );
-        }
-
-        if (data.reward !== undefined) {
-          addLogEntry(`💰 Récompense: ${data.reward.toFixed(2)}`, 'reward');
-        }
-
-        setConflictHistory(prev => [...prev, {
-          step: data.step,
-          conflicts: data.conflicts,
-        }]);
-
-        playSound(data.conflicts > 0 ? 'conflict' : 'move');
-
-        if (data.done) {
-          playSound('success');
-          setIsSolving(false);
-          const solvingTime = ((performance.now() - startTimeRef.current) / 1000).toFixed(2);
-          addLogEntry(
-            `🎉 Solution trouvée en ${data.step} étapes (${solvingTime}s)`,
-            'success'
-          );
-          toast({
-            title: '🎉 Solution trouvée !',
-            description: `Solution trouvée en ${data.step} étapes (${solvingTime}s)`,
-          });
+        const step = await nextStep();
+        showStep(step, 'Étape manuelle');
+        if (step.done) {
+          finishSolve(step);
         }
 
         toast({
@@ -363,6 +414,8 @@ export const useNQueens = (initialSize = FRONTEND_CONFIG.BOARD_SIZE_MIN) => {
           title: 'Erreur d\'étape',
           description: error.response?.data?.message || 'Échec de l\'exécution de l\'étape',
         });
+      } finally {
+        stepBusyRef.current = false;
       }
     }
   }, [isSolving, isPaused, handleStart, handlePauseResume, api, toast, playSound]);
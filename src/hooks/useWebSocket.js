@@ -1,34 +1,39 @@
 // src/hooks/useWebSocket.js
 import { useState, useEffect, useCallback } from 'react';
 
+const API_BASE = import.meta.env.VITE_API_BASE || '';
+
+// Game state push channel. The backend serves it as server-sent events at
+// /api/multiplayer/events/<gameId>: a full `game_state` snapshot, then
+// `game_state` messages carrying only the changed keys, then `game_over`.
 export const useWebSocket = (gameId) => {
-  const [socket, setSocket] = useState(null);
   const [boardState, setBoardState] = useState(null);
   const [error, setError] = useState(null);
 
-  const sendMessage = useCallback((message) => {
-    if (socket && socket.readyState === WebSocket.OPEN) {
-      socket.send(JSON.stringify({
-        ...message,
-        gameId,
-        timestamp: Date.now()
-      }));
-    }
-  }, [socket, gameId]);
+  // Moves go over plain HTTP; their effect comes back on the event stream
+  const sendMessage = useCallback(async (message) => {
+    if (!gameId) return null;
+    const response = await fetch(`${API_BASE}/api/multiplayer/move/${gameId}`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify(message)
+    });
+    return response.json();
+  }, [gameId]);
 
   useEffect(() => {
-    const ws = new WebSocket(`wss://your-backend/ws?gameId=${gameId}`);
-    
-    ws.onopen = () => {
-      console.log('WebSocket connected');
+    if (!gameId || gameId === 'undefined') return undefined;
+    const events = new EventSource(`${API_BASE}/api/multiplayer/events/${gameId}`);
+
+    events.onopen = () => {
       setError(null);
     };
 
-    ws.onmessage = (event) => {
+    events.onmessage = (event) => {
       const data = JSON.parse(event.data);
       switch(data.type) {
         case 'game_state':
-          setBoardState(data.state);
+          setBoardState(prev => (data.full ? data.state : { ...prev, ...data.state }));
           break;
         case 'game_over':
           setBoardState(prev => ({
@@ -36,6 +41,7 @@ export const useWebSocket = (gameId) => {
             ...data.state,
             winner: data.winner
           }));
+          events.close();
           break;
         case 'error':
           setError(data.message);
@@ -43,23 +49,16 @@ export const useWebSocket = (gameId) => {
       }
     };
 
-    ws.onerror = (error) => {
-      setError('WebSocket error');
-      console.error('WebSocket error:', error);
-    };
-
-    ws.onclose = () => {
-      console.log('WebSocket disconnected');
-    };
-
-    setSocket(ws);
-
-    return () => {
-      if (ws.readyState === WebSocket.OPEN) {
-        ws.close();
+    events.onerror = (error) => {
+      // EventSource reconnects on its own and resumes from a full snapshot
+      if (events.readyState === EventSource.CLOSED) {
+        setError('Event stream closed');
       }
+      console.error('Event stream error:', error);
     };
+
+    return () => events.close();
   }, [gameId]);
 
   return { sendMessage, boardState, error };
-};
\ No newline at end of file
+};
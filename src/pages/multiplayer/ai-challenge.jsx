@@ -1,9 +1,10 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import { Button } from '@/components/ui/button';
 import { MultiplayerBoard } from '@/components/nqueens/MultiplayerBoard';
 import { GameResults } from '@/components/nqueens/GameResults';
 import { Timer, Users, Trophy } from 'lucide-react';
+import { useWebSocket } from '@/hooks/useWebSocket';
 import { toast } from 'react-toastify';
 import 'react-toastify/dist/ReactToastify.css';
 
@@ -31,9 +32,17 @@ const AIChallengePage = () => {
     players: []
   });
 
+  // Latest merged state, readable before React re-renders (see pollForAIMove)
+  const latestState = useRef(boardState);
+  const aiMoveInFlight = useRef(false);
+
+  // Pushed game state replaces polling /api/multiplayer/state after moves
+  const { boardState: pushedState } = useWebSocket(gameId);
+
   const updateGameState = (data) => {
     console.log('Updating game state with:', data);
-    setBoardState(prev => ({
+    const prev = latestState.current;
+    const next = {
       ...prev,
       queens: data.queens || prev.queens,
       conflicts: data.conflicts ?? prev.conflicts,
@@ -43,7 +52,9 @@ const AIChallengePage = () => {
       moves: data.moves ?? prev.moves,
       winner: data.winner ?? data.winner_id ?? prev.winner,
       players: data.players || prev.players
-    }));
+    };
+    latestState.current = next;
+    setBoardState(next);
   };
 
   const setupGame = async () => {
@@ -167,6 +178,14 @@ const AIChallengePage = () => {
     };
   }, [gameId]);
 
+  useEffect(() => {
+    if (!pushedState) return;
+    updateGameState(pushedState);
+    if (pushedState.winner !== undefined) {
+      setGameState('finished');
+    }
+  }, [pushedState]);
+
   useEffect(() => {
     let interval;
     if (gameState === 'playing') {
@@ -230,22 +249,18 @@ const AIChallengePage = () => {
     }
   };
   const pollForAIMove = async () => {
+    // A request is already out; its response will update the board
+    if (aiMoveInFlight.current) return;
     try {
-    // First check if it's really AI's turn
-      const stateRes = await fetch(`${API_BASE}/api/multiplayer/state/${gameId}`);
-      if (!stateRes.ok) {
-        setLoading(false);
-        return;
-      }
-
-      const currentState = await stateRes.json();
-    
-    // Verify there is an AI player and it's their turn
-      const aiPlayer = currentState.players?.find(p => p.is_ai);
-      if (!aiPlayer || currentState.current_turn !== aiPlayer.id) {
+    // Verify there is an AI player and it's their turn. Read the ref, not
+    // boardState: a pushed event may have arrived since this render.
+      const current = latestState.current;
+      const aiPlayer = current.players?.find(p => p.is_ai);
+      if (!aiPlayer || current.current_turn !== aiPlayer.id) {
         setLoading(false);
         return;
       }
+      aiMoveInFlight.current = true;
 
     // Request AI to make a move
       const aiMoveRes = await fetch(`${API_BASE}/api/multiplayer/ai-move/${gameId}`, {
@@ -259,6 +274,7 @@ const AIChallengePage = () => {
       }
 
       const newState = await aiMoveRes.json();
+      aiMoveInFlight.current = false;
       updateGameState(newState);
       setLoading(false);
 
@@ -266,6 +282,7 @@ const AIChallengePage = () => {
         setGameState('finished');
       }
     } catch (err) {
+      aiMoveInFlight.current = false;
       console.error('AI move error:', err);
       setLoading(false);
     
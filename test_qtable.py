@@ -0,0 +1,32 @@
+from qlearning import QLearningAgent
+from qtable import BoundedQTable
+
+
+def test_bounded_eviction_keeps_state_being_written():
+    table = BoundedQTable(max_size=1)
+    state = (0, 1, 2, 3)
+    table.visited_states.add(state)
+    table[(state, (0, 1))] = 1.0
+    # Evicts the state's only entry, but the state gets a new one right away
+    table[(state, (0, 2))] = 2.0
+    assert state in table.visited_states
+    assert len(table) == 1
+    assert table.get((state, (0, 2))) == 2.0
+
+
+def test_bounded_eviction_forgets_other_states():
+    table = BoundedQTable(max_size=1)
+    table.visited_states.add((0, 1, 2, 3))
+    table[((0, 1, 2, 3), (0, 1))] = 1.0
+    table.visited_states.add((1, 1, 2, 3))
+    table[((1, 1, 2, 3), (0, 1))] = 1.0
+    assert (0, 1, 2, 3) not in table.visited_states
+    assert (1, 1, 2, 3) in table.visited_states
+
+
+def test_agent_learn_keeps_state_visited_with_one_entry():
+    agent = QLearningAgent(4, 4, q_backend="dict", max_q_table_size=1)
+    state, new_state = [0, 1, 2, 3], [1, 1, 2, 3]
+    agent.learn(state, (0, 1), -1.0, new_state, False)
+    agent.learn(state, (0, 2), -1.0, new_state, False)
+    assert tuple(state) in agent.visited_states
@@ -1,34 +1,195 @@
 # train.py
+"""Offline Q-learning training CLI.
+
+Trains one agent per board size and writes snapshots that the server
+warm-starts from (see snapshots.py), e.g.
+
+    python train.py --sizes 4-8 --episodes 5000 --seed 0
+    python train.py --sizes 8 --engine vector --num-envs 512 --steps 2000000
+"""
+import argparse
+import os
 import random
-from env import NQueensEnv
-from agent import SimpleAgent, save_agent_state
-
-def train_random_episodes(n=8, episodes=1000, save_path="models/agent.json"):
-    env = NQueensEnv(n=n)
-    agent = SimpleAgent(mode="random")
-    best = None
-    for ep in range(episodes):
-        env.reset()
-        done = False
-        steps = 0
-        while not done:
-            action = agent.act(env)
-            if action is None:
-                break
-            obs, done, info = env.step(action)
+import time
+
+import numpy as np
+import config
+from nqueens_env import NQueensEnv
+from qlearning import QLearningAgent
+from snapshots import load_snapshot, save_snapshot, snapshot_path
+from vec_env import VecNQueensEnv, train_batched
+
+
+class Progress:
+    """Periodic steps/s and episodes/s reporting"""
+
+    def __init__(self, board_size, every):
+        self.board_size = board_size
+        self.every = every
+        self.start = self.last = time.time()
+        self.steps = self.episodes = self.solved = 0
+
+    def update(self, steps=0, episodes=0, solved=0, force=False):
+        self.steps += steps
+        self.episodes += episodes
+        self.solved += solved
+        now = time.time()
+        if force or now - self.last >= self.every:
+            self.last = now
+            elapsed = max(now - self.start, 1e-9)
+            print(f"[n={self.board_size}] {self.episodes} episodes "
+                  f"({self.solved} solved), {self.steps} steps, "
+                  f"{self.steps / elapsed:,.0f} steps/s, "
+                  f"{self.episodes / elapsed:,.1f} episodes/s", flush=True)
+
+    def budget_left(self, episodes, steps):
+        return ((episodes is None or self.episodes < episodes) and
+                (steps is None or self.steps < steps))
+
+
+def build_agent(board_size, args):
+    warm_start = None
+    path = snapshot_path(board_size, args.output_dir)
+    if args.resume and os.path.exists(path):
+        warm_start = load_snapshot(path)
+        print(f"[n={board_size}] resuming from {path} ({len(warm_start)} states)")
+    return QLearningAgent(board_size, board_size,
+                          learning_rate=args.learning_rate,
+                          discount_factor=args.discount_factor,
+                          exploration_rate=args.exploration_rate,
+                          q_backend="dense", warm_start=warm_start)
+
+
+def checkpoint(table, board_size, args):
+    path = snapshot_path(board_size, args.output_dir)
+    states = save_snapshot(path, table, board_size)
+    print(f"[n={board_size}] saved {states} states to {path}", flush=True)
+
+
+def train_single(board_size, args):
+    env = NQueensEnv(board_size)
+    agent = build_agent(board_size, args)
+    agent.env = env
+    progress = Progress(board_size, args.report_every)
+
+    while progress.budget_left(args.episodes, args.steps):
+        state = env.reset()
+        steps = solved = 0
+        for _ in range(args.max_steps):
+            action = agent.choose_action(state)
+            new_state, reward, done = env.step(action)
+            agent.learn(state, action, reward, new_state, done)
+            state = new_state
             steps += 1
-            # si mouvement invalide, on arrête cet épisode
-            if "error" in info:
+            if done:
+                solved = 1
                 break
-        if done:
-            best = env.state
-            print(f"Episode {ep}: solved! solution={env.state}")
-            break
-    if best:
-        save_agent_state(save_path, {"n": n, "solution": best})
+        progress.update(steps, 1, solved)
+        if args.checkpoint_every and progress.episodes % args.checkpoint_every == 0:
+            checkpoint(agent.q_table, board_size, args)
+
+    progress.update(force=True)
+    checkpoint(agent.q_table, board_size, args)
+
+
+def train_vector(board_size, args):
+    venv = VecNQueensEnv(args.num_envs, board_size, max_episode_steps=args.max_steps)
+    agent = build_agent(board_size, args)
+    progress = Progress(board_size, args.report_every)
+    chunk = max(1, args.chunk_steps)
+    next_checkpoint = args.checkpoint_every
+
+    while progress.budget_left(args.episodes, args.steps):
+        episodes_before, solved_before = venv.episodes_completed, venv.solved_count
+        stats = train_batched(agent, venv, chunk)
+        progress.update(stats['transitions'], venv.episodes_completed - episodes_before,
+                        venv.solved_count - solved_before)
+        if next_checkpoint and progress.episodes >= next_checkpoint:
+            checkpoint(agent.q_table, board_size, args)
+            next_checkpoint += args.checkpoint_every
+
+    progress.update(force=True)
+    checkpoint(agent.q_table, board_size, args)
+
+
+def train_parallel(board_size, args):
+    # Imported here so the single-process engines do not pull in multiprocessing setup
+    from parallel_training import ParallelTrainer
+
+    with ParallelTrainer(board_size, args.workers,
+                         learning_rate=args.learning_rate,
+                         discount_factor=args.discount_factor,
+                         exploration_rate=args.exploration_rate) as trainer:
+        path = snapshot_path(board_size, args.output_dir)
+        if args.resume and os.path.exists(path):
+            states = trainer.warm_start(load_snapshot(path))
+            print(f"[n={board_size}] resuming from {path} ({states} states)")
+        # Budgets are split evenly across workers, rounded up
+        per_worker = None if args.episodes is None else -(-args.episodes // trainer.num_workers)
+        steps_per_worker = None if args.steps is None else -(-args.steps // trainer.num_workers)
+        stats = trainer.train(per_worker, args.max_steps, seed=args.seed,
+                              steps_per_worker=steps_per_worker)
+        print(f"[n={board_size}] {stats['workers']} workers, {stats['episodes']} episodes "
+              f"({stats['solved']} solved), {stats['steps_per_second']:,.0f} steps/s, "
+              f"{stats['episodes_per_second']:,.1f} episodes/s", flush=True)
+        checkpoint(trainer.table, board_size, args)
+
+
+ENGINES = {
+    'single': train_single,
+    'vector': train_vector,
+    'parallel': train_parallel,
+}
+
+
+def parse_sizes(value):
+    if '-' in value:
+        low, high = value.split('-', 1)
+        sizes = list(range(int(low), int(high) + 1))
     else:
-        print("No solution found during random training.")
-    return best
+        sizes = [int(s) for s in value.split(',')]
+    for n in sizes:
+        if not (config.BOARD_SIZE_MIN <= n <= config.BOARD_SIZE_MAX):
+            raise argparse.ArgumentTypeError(
+                f"board sizes must be between {config.BOARD_SIZE_MIN} and {config.BOARD_SIZE_MAX}")
+    return sizes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train N-Queens Q-learning agents offline")
+    parser.add_argument('--sizes', type=parse_sizes,
+                        default=list(range(config.BOARD_SIZE_MIN, config.BOARD_SIZE_MAX + 1)),
+                        help="board sizes, e.g. '8', '4,6' or '4-8' (default: all)")
+    parser.add_argument('--engine', choices=sorted(ENGINES), default='single')
+    parser.add_argument('--episodes', type=int, default=None, help="episode budget per size")
+    parser.add_argument('--steps', type=int, default=None, help="step budget per size")
+    parser.add_argument('--max-steps', type=int, default=1000, help="steps per episode")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--num-envs', type=int, default=256, help="boards per batch (vector)")
+    parser.add_argument('--chunk-steps', type=int, default=50,
+                        help="batched steps between progress checks (vector)")
+    parser.add_argument('--workers', type=int, default=config.PARALLEL_WORKERS,
+                        help="worker processes, 0 = one per core (parallel)")
+    parser.add_argument('--learning-rate', type=float, default=config.LEARNING_RATE)
+    parser.add_argument('--discount-factor', type=float, default=config.DISCOUNT_FACTOR)
+    parser.add_argument('--exploration-rate', type=float, default=config.EXPLORATION_RATE)
+    parser.add_argument('--output-dir', default=config.Q_SNAPSHOT_DIR)
+    parser.add_argument('--checkpoint-every', type=int, default=0,
+                        help="also checkpoint every N episodes (single/vector)")
+    parser.add_argument('--report-every', type=float, default=5.0, help="seconds between reports")
+    parser.add_argument('--resume', action='store_true',
+                        help="warm-start from existing snapshots in --output-dir")
+    args = parser.parse_args(argv)
+
+    if args.episodes is None and args.steps is None:
+        args.episodes = 1000
+
+    for board_size in args.sizes:
+        if args.seed is not None:
+            random.seed(args.seed + board_size)
+            np.random.seed(args.seed + board_size)
+        ENGINES[args.engine](board_size, args)
+
 
 if __name__ == "__main__":
-    train_random_episodes(n=8, episodes=2000)
+    main()
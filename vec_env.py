@@ -0,0 +1,158 @@
+import time
+import numpy as np
+from typing import Dict, Optional, Tuple
+import config
+
+
+def batch_conflicts(boards: np.ndarray) -> np.ndarray:
+    """Number of attacking pairs for each board of a [B, n] batch"""
+    batch, n = boards.shape
+    rows = np.arange(n)
+    queens = boards.astype(np.int64)
+    offsets = np.arange(batch)[:, None]
+
+    # One bincount per line family, offset so each board gets its own bins
+    cols = np.bincount((offsets * n + queens).ravel(), minlength=batch * n).reshape(batch, n)
+    width = 2 * n - 1
+    diag1 = np.bincount((offsets * width + rows - queens + n - 1).ravel(),
+                        minlength=batch * width).reshape(batch, width)
+    diag2 = np.bincount((offsets * width + rows + queens).ravel(),
+                        minlength=batch * width).reshape(batch, width)
+
+    return ((cols * (cols - 1) // 2).sum(axis=1) +
+            (diag1 * (diag1 - 1) // 2).sum(axis=1) +
+            (diag2 * (diag2 - 1) // 2).sum(axis=1))
+
+
+def row_move_deltas(boards: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """Conflict delta of moving the queen in `rows[b]` to every column.
+
+    Returns a [B, n] array; entry [b, c] is the change in conflicts of
+    board b if its queen in row rows[b] moved to column c.
+    """
+    batch, n = boards.shape
+    queens = boards.astype(np.int64)
+    index = np.arange(batch)
+    rows = rows.astype(np.int64)
+    current = queens[index, rows]
+    cols = np.arange(n)
+
+    other_rows = np.arange(n)[None, :]
+    row_dist = np.abs(other_rows - rows[:, None])           # [B, n]
+    others = rows[:, None] != other_rows                     # [B, n]
+
+    def attacks(col: np.ndarray) -> np.ndarray:
+        # col is [B, C]; compare against every other queen -> [B, C]
+        col_dist = np.abs(col[:, :, None] - queens[:, None, :])
+        hit = (col_dist == 0) | (col_dist == row_dist[:, None, :])
+        return (hit & others[:, None, :]).sum(axis=2)
+
+    before = attacks(current[:, None])
+    after = attacks(np.broadcast_to(cols, (batch, n)))
+    return after - before
+
+
+class VecNQueensEnv:
+    """B independent N-Queens boards stepped together as one [B, n] array.
+
+    Rewards follow NQueensEnv.step(). Boards that are solved, or that hit
+    `max_episode_steps`, are re-randomised automatically after the step
+    that finished them; step() returns the pre-reset boards so they can be
+    used as `new_state` for learning, and `boards` holds the next
+    observations.
+    """
+
+    def __init__(self, num_envs: int, board_size: int = 8,
+                 max_episode_steps: Optional[int] = None, auto_reset: bool = True):
+        if not (config.BOARD_SIZE_MIN <= board_size <= config.BOARD_SIZE_MAX):
+            raise ValueError(f"Board size must be between {config.BOARD_SIZE_MIN} and "
+                             f"{config.BOARD_SIZE_MAX}, got {board_size}")
+        if num_envs < 1:
+            raise ValueError(f"num_envs must be positive, got {num_envs}")
+        self.num_envs = num_envs
+        self.board_size = board_size
+        self.max_episode_steps = max_episode_steps
+        self.auto_reset = auto_reset
+        self.boards = np.zeros((num_envs, board_size), dtype=np.int8)
+        self.conflicts = np.zeros(num_envs, dtype=np.int64)
+        self.episode_steps = np.zeros(num_envs, dtype=np.int64)
+        self.last_truncated = np.zeros(num_envs, dtype=bool)
+        self.episodes_completed = 0
+        self.solved_count = 0
+        self.reset()
+
+    def reset(self) -> np.ndarray:
+        """Randomise every board"""
+        self._reset_boards(np.ones(self.num_envs, dtype=bool))
+        self.episodes_completed = 0
+        self.solved_count = 0
+        return self.boards.copy()
+
+    def _reset_boards(self, mask: np.ndarray) -> None:
+        count = int(mask.sum())
+        if count == 0:
+            return
+        self.boards[mask] = np.random.randint(0, self.board_size, size=(count, self.board_size))
+        self.conflicts[mask] = batch_conflicts(self.boards[mask])
+        self.episode_steps[mask] = 0
+
+    def step(self, actions: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Apply one (row, new_col) action per board.
+
+        Returns the boards after the move, the rewards and the done flags.
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        rows, new_cols = actions[:, 0], actions[:, 1]
+        n = self.board_size
+        if (rows < 0).any() or (rows >= n).any() or (new_cols < 0).any() or (new_cols >= n).any():
+            raise ValueError("Invalid action in batch")
+
+        index = np.arange(self.num_envs)
+        old_conflicts = self.conflicts
+        deltas = row_move_deltas(self.boards, rows)[index, new_cols]
+        self.boards[index, rows] = new_cols
+        new_conflicts = old_conflicts + deltas
+        self.conflicts = new_conflicts
+        self.episode_steps += 1
+
+        dones = new_conflicts == 0
+        # Same shaping as NQueensEnv.step(): +/-1 per conflict removed/added
+        rewards = np.where(dones, 10.0, np.where(deltas == 0, -0.5, -1.0 * deltas))
+
+        next_states = self.boards.copy()
+        truncated = ~dones
+        if self.max_episode_steps is not None:
+            truncated &= self.episode_steps >= self.max_episode_steps
+        else:
+            truncated[:] = False
+        self.last_truncated = truncated
+
+        finished = dones | truncated
+        self.episodes_completed += int(finished.sum())
+        self.solved_count += int(dones.sum())
+        if self.auto_reset:
+            self._reset_boards(finished)
+
+        return next_states, rewards, dones
+
+
+def train_batched(agent, venv: VecNQueensEnv, num_steps: int) -> Dict[str, float]:
+    """Run `num_steps` batched steps of Q-learning on `venv` with `agent`"""
+    start_time = time.time()
+    states = venv.boards.copy()
+    for _ in range(num_steps):
+        actions = agent.choose_actions(states)
+        next_states, rewards, dones = venv.step(actions)
+        agent.learn_batch(states, actions, rewards, next_states, dones)
+        states = venv.boards.copy()
+
+    elapsed = max(time.time() - start_time, 1e-9)
+    transitions = num_steps * venv.num_envs
+    return {
+        'transitions': transitions,
+        'episodes': venv.episodes_completed,
+        'solved': venv.solved_count,
+        'time': elapsed,
+        'steps_per_second': transitions / elapsed,
+        'episodes_per_second': venv.episodes_completed / elapsed,
+    }